@@ -1,7 +1,7 @@
 // Words will be loaded from JSON file (lazy loading)
-let wordsByLength = {};  // Play mode words - loaded per dialect
+let wordsByLength = {};  // Play mode words by effort tier - loaded per layout and dialect
 let learnWordsCache = {};  // Cache for learn mode words: key format "layout_dialect" or "layout_dialect_no_lig"
-let playWordsLoaded = false;  // Track if play mode words are loaded for current dialect
+let playWordsLoaded = false;  // Track if play mode words are loaded for current layout and dialect
 
 // Game state - encapsulates all session state and statistics
 let gameState = new GameState();
@@ -772,6 +772,8 @@ function onDialectChangeSettings() {
 async function onLayoutChangeSettings() {
     currentLayout = document.getElementById('layoutSelectSettings').value;
     localStorage.setItem('keyboardLayout', currentLayout);
+    // Play words are tiered per layout (will reload lazily on demand)
+    playWordsLoaded = false;
 
     // Preload the new keyboard layout
     await getKeyboardLayout(currentLayout);
@@ -857,6 +859,9 @@ async function updateLevelSelector() {
 }
 
 // Level configuration for different level counts
+// Typing-effort tiers of the play words, easiest first (see generate_play_words.py)
+const EFFORT_TIERS = ['easy', 'medium', 'hard'];
+
 const LEVEL_CONFIGS = {
     3: [
         { lengths: [1, 2, 3], titleKey: 'shortWords' },
@@ -900,10 +905,14 @@ function getPlayLevelData(levelNum) {
     const levelConfig = config[levelNum - 1];
     const pool = [];
 
+    // The first third of the levels only use the words that are easiest to
+    // type on the current layout, the next third add the medium ones
+    const tiers = EFFORT_TIERS.slice(0, Math.ceil(EFFORT_TIERS.length * levelNum / config.length));
+
     // Combine words from all specified lengths
     levelConfig.lengths.forEach(length => {
         if (wordsByLength[length]) {
-            pool.push(...wordsByLength[length]);
+            tiers.forEach(tier => pool.push(...(wordsByLength[length][tier] || [])));
         }
     });
 
@@ -946,12 +955,28 @@ async function getLearnLessonData(lessonIndex) {
     return null;
 }
 
-// Load play mode words from JSON (for current dialect only)
+// Load play mode words from JSON (for current layout and dialect only)
 async function loadPlayWords() {
     try {
-        // Load practice words for current dialect
-        const wordsResponse = await fetch(versionedUrl(`words_${currentDialect}.json`));
-        const wordsData = await wordsResponse.json();
+        // Load practice words tiered by typing effort on the current layout
+        // (inlined by deploy if small enough)
+        const tieredFile = `play_words_${currentLayout}_${currentDialect}.json`;
+        let wordsData = inlineResource(tieredFile);
+        if (wordsData === undefined) {
+            const wordsResponse = await fetch(versionedUrl(tieredFile));
+            if (wordsResponse.ok) {
+                wordsData = await wordsResponse.json();
+            }
+        }
+        if (wordsData === undefined) {
+            // No tiers for this layout: every word counts as easy
+            const wordsResponse = await fetch(versionedUrl(`words_${currentDialect}.json`));
+            const words = await wordsResponse.json();
+            wordsData = {};
+            Object.keys(words).forEach(key => {
+                wordsData[key] = { easy: words[key] };
+            });
+        }
         // Convert string keys to numbers
         wordsByLength = {};
         Object.keys(wordsData).forEach(key => {
@@ -2197,6 +2222,8 @@ function onDialectChangeSetup() {
 function onLayoutChangeSetup() {
     currentLayout = document.getElementById('layoutSelectSetup').value;
     localStorage.setItem('keyboardLayout', currentLayout);
+    // Play words are tiered per layout (will reload lazily on demand)
+    playWordsLoaded = false;
 }
 
 // Splash screen functions
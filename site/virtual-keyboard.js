@@ -3,12 +3,15 @@
 // Initialize virtual keyboard - loads HTML and sets up
 async function initVirtualKeyboard(containerElement, resourceVersion) {
     try {
-        const response = await fetch(`virtual-keyboard.html?v=${resourceVersion}`);
-        if (!response.ok) {
-            console.error('Failed to load virtual keyboard HTML');
-            return false;
+        let html = inlineResource('virtual-keyboard.html');
+        if (html === undefined) {
+            const response = await fetch(`virtual-keyboard.html?v=${resourceVersion}`);
+            if (!response.ok) {
+                console.error('Failed to load virtual keyboard HTML');
+                return false;
+            }
+            html = await response.text();
         }
-        const html = await response.text();
         containerElement.innerHTML = html;
 
         // Now that the HTML is loaded, make it draggable
@@ -32,6 +35,13 @@ async function loadKeyboardLayout(layoutName) {
         return KEYBOARD_MAPS[layoutName];
     }
 
+    // Inlined in the page by deploy (the default layout)
+    const inlined = inlineResource(`keyboard_layout_${layoutName}.json`);
+    if (inlined !== undefined) {
+        KEYBOARD_MAPS[layoutName] = inlined;
+        return inlined;
+    }
+
     // Load from server
     try {
         const response = await fetch(versionedUrl(`keyboard_layout_${layoutName}.json`));
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Shavian correction engine on large transliterated documents.
+
+Builds documents from the site's transliterated pages and translations, with
+every correction's wrong form sprinkled through them, then checks that the
+linear-time CorrectionMatcher produces byte-identical output to the original
+per-correction regex and reports the throughput of both.
+
+Usage:
+    python benchmark_corrections.py                # 1 and 4 MB documents
+    python benchmark_corrections.py -s 1 8 -r 5    # custom sizes and repeats
+    python benchmark_corrections.py -o bench.json  # also save the results as JSON
+
+See benchmark_transliteration.py for the rest of the transliteration pipeline.
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from output_writer import write_json
+
+from shavian_corrections import (
+    load_corrections, compile_corrections, apply_corrections_regex
+)
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SITE_DIR = PROJECT_DIR / 'site'
+CORRECTIONS_FILE = SCRIPT_DIR / 'shavian-corrections.txt'
+
+
+def load_sample_text():
+    """Collect transliterated text already produced for the site."""
+    parts = []
+    for path in sorted(SITE_DIR.glob('*_gb.html')) + sorted(SITE_DIR.glob('*_us.html')):
+        with open(path, 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+
+    for name in ['translations_british.json', 'translations_american.json']:
+        with open(SITE_DIR / name, 'r', encoding='utf-8') as f:
+            parts.append('\n'.join(json.load(f).values()))
+
+    return '\n'.join(parts)
+
+
+def build_document(sample, corrections, target_bytes, seed=0):
+    """
+    Build a document of roughly target_bytes by repeating sample lines and
+    injecting correction keys, including at line starts and next to punctuation.
+    """
+    rng = random.Random(seed)
+    lines = [line for line in sample.splitlines() if line.strip()]
+    keys = list(corrections.keys())
+    separators = [' ', ', ', '. ', ' (', ') ', '\n', '" ', '-']
+
+    out = []
+    size = 0
+    while size < target_bytes:
+        line = rng.choice(lines)
+        if keys and rng.random() < 0.5:
+            words = line.split(' ')
+            for _ in range(rng.randint(1, 3)):
+                pos = rng.randint(0, len(words))
+                words.insert(pos, rng.choice(keys) + rng.choice(separators).strip(' '))
+            line = ' '.join(words)
+        out.append(line)
+        size += len(line.encode('utf-8')) + 1
+
+    return '\n'.join(out) + '\n'
+
+
+def time_call(func, repeats):
+    """Return (best seconds, result) over repeats runs."""
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(sizes_mb, repeats, by_line=False):
+    corrections = load_corrections(CORRECTIONS_FILE)
+    sample = load_sample_text()
+
+    print(f"Loaded {len(corrections)} corrections")
+    print(f"Sample text: {len(sample):,} characters\n")
+
+    compile_time, matcher = time_call(lambda: compile_corrections(corrections), repeats)
+    print(f"Compile: {compile_time * 1000:.2f} ms\n")
+
+    print(f"{'Size':>8}  {'Regex':>10}  {'Matcher':>10}  {'Speedup':>8}  {'MB/s':>8}  Identical")
+    print(f"{'-' * 8}  {'-' * 10}  {'-' * 10}  {'-' * 8}  {'-' * 8}  {'-' * 9}")
+
+    results = []
+    all_identical = True
+    for size_mb in sizes_mb:
+        document = build_document(sample, corrections, int(size_mb * 1024 * 1024))
+
+        if by_line:
+            # Mirrors fix-shavian.py, which corrects stdin line by line
+            doc_lines = document.splitlines(keepends=True)
+            regex_fn = lambda: ''.join(apply_corrections_regex(l, corrections) for l in doc_lines)
+            matcher_fn = lambda: ''.join(matcher.apply(l) for l in doc_lines)
+        else:
+            regex_fn = lambda: apply_corrections_regex(document, corrections)
+            matcher_fn = lambda: matcher.apply(document)
+
+        regex_time, regex_out = time_call(regex_fn, repeats)
+        matcher_time, matcher_out = time_call(matcher_fn, repeats)
+
+        identical = regex_out == matcher_out
+        all_identical = all_identical and identical
+        speedup = regex_time / matcher_time if matcher_time else float('inf')
+        throughput = size_mb / matcher_time if matcher_time else float('inf')
+
+        print(f"{size_mb:>6g}MB  {regex_time * 1000:>8.1f}ms  {matcher_time * 1000:>8.1f}ms  "
+              f"{speedup:>7.1f}x  {throughput:>8.1f}  {'✓' if identical else '✗'}")
+
+        results.append({
+            'size_mb': size_mb,
+            'regex_s': regex_time,
+            'matcher_s': matcher_time,
+            'identical': identical,
+        })
+
+    print()
+    if all_identical:
+        print("✅ Matcher output is byte-identical to the regex implementation")
+    else:
+        print("❌ Matcher output differs from the regex implementation")
+
+    return all_identical, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Shavian correction engine')
+    parser.add_argument('-s', '--sizes', type=float, nargs='+', default=[1, 4],
+                        help='Document sizes in MB (default: 1 4)')
+    parser.add_argument('-r', '--repeats', type=int, default=3,
+                        help='Runs per measurement; the best is reported (default: 3)')
+    parser.add_argument('-l', '--by-line', action='store_true',
+                        help='Correct line by line, as fix-shavian.py does')
+    parser.add_argument('-o', '--output', type=Path, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    identical, results = run_benchmark(args.sizes, args.repeats, args.by_line)
+    if args.output:
+        write_json(args.output, {'by_line': args.by_line, 'repeats': args.repeats, 'results': results})
+        print(f"Results written to {args.output}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    exit(main())
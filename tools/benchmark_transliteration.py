@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Benchmark the transliteration and correction pipeline.
+
+Three groups of measurements, all on synthetic input, written to a JSON file:
+
+- corrections: load_corrections() and compile time for correction files of
+  increasing size (the real shavian-corrections.txt plus synthetic entries),
+  and apply_corrections() throughput on Shavian documents of increasing size,
+  with short lines and with long lines, applied to the whole document and
+  line by line (as fix-shavian.py does)
+- pipelines: the cost per request of each way of running the transliterator,
+  using a stub in place of shave that maps Latin letters to Shavian ones, so
+  only the process and framing overhead is measured: one shave process per
+  text (as generate_translations.py used to run it), shave piped into fix-shavian.py, the ShavePool
+  with long-lived processes, and the ShavePool fallback with one process per
+  request
+- end_to_end: transliterate_csv() and transliterate_html() on growing
+  synthetic CSV and HTML files through the stub pool: with a running pool and
+  no cache, with a cold cache (which includes starting the pool) and with a
+  warm cache (which never starts one)
+
+Usage:
+    python benchmark_transliteration.py               # results in build/benchmarks/transliteration.json
+    python benchmark_transliteration.py --quick       # smaller inputs, fewer requests
+    python benchmark_transliteration.py -o bench.json
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import generate_translations
+import shave_pool
+from benchmark_corrections import build_document, load_sample_text, time_call
+from output_writer import write_json
+from shave_pool import ShavePool
+from shavian_corrections import apply_corrections, compile_corrections, load_corrections
+from translation_cache import TranslationCache
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SITE_DIR = PROJECT_DIR / 'site'
+CORRECTIONS_FILE = SCRIPT_DIR / 'shavian-corrections.txt'
+CSV_FILE = SCRIPT_DIR / 'translations.csv'
+FIX_SHAVIAN = SCRIPT_DIR / 'fix-shavian.py'
+OUTPUT_FILE = PROJECT_DIR / 'build' / 'benchmarks' / 'transliteration.json'
+
+SHAVIAN_LETTERS = [chr(code) for code in range(0x10450, 0x10480)]
+
+# Stands in for shave: same command line, maps Latin letters to Shavian ones
+# line by line. With STUB_SHAVE_BUFFERED set it only writes at EOF, like a
+# shave build that doesn't stream.
+STUB_SOURCE = '''\
+import os
+import sys
+
+table = str.maketrans({chr(97 + i): chr(0x10450 + i) for i in range(26)})
+table.update({ord(chr(65 + i)): chr(0x10450 + i) for i in range(26)})
+if os.environ.get('STUB_SHAVE_BUFFERED'):
+    sys.stdout.write(sys.stdin.read().translate(table))
+else:
+    for line in sys.stdin:
+        sys.stdout.write(line.translate(table))
+        sys.stdout.flush()
+'''
+
+
+def make_stub(directory):
+    """Write the stub transliterator as an executable and return its path."""
+    stub = Path(directory) / 'stub-shave'
+    stub.write_text(f'#!{sys.executable}\n' + STUB_SOURCE, encoding='utf-8')
+    stub.chmod(0o755)
+    return str(stub)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Hide the generators' progress output while timing them."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def synthetic_corrections(base, count, seed=0):
+    """base plus count made-up corrections: namer dot fixes, respellings and a few phrases."""
+    rng = random.Random(seed)
+    corrections = dict(base)
+    while len(corrections) < len(base) + count:
+        word = ''.join(rng.choices(SHAVIAN_LETTERS, k=rng.randint(2, 9)))
+        kind = rng.random()
+        if kind < 0.4:
+            corrections['·' + word] = word
+        elif kind < 0.95:
+            corrections[word] = ''.join(rng.choices(SHAVIAN_LETTERS, k=len(word)))
+        else:
+            corrections[f'[{word} / {word[::-1]}]'] = word
+    return corrections
+
+
+def write_corrections(corrections, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('# Synthetic corrections for benchmarking\n')
+        for wrong, correct in corrections.items():
+            f.write(f'{wrong}, {correct}\n')
+
+
+def long_lines(document, line_bytes):
+    """Rejoin a document's lines into lines of about line_bytes each."""
+    out = []
+    current = []
+    size = 0
+    for line in document.splitlines():
+        current.append(line)
+        size += len(line.encode('utf-8')) + 1
+        if size >= line_bytes:
+            out.append(' '.join(current))
+            current = []
+            size = 0
+    if current:
+        out.append(' '.join(current))
+    return '\n'.join(out) + '\n'
+
+
+def bench_corrections(correction_counts, sizes_mb, repeats, long_line_bytes, work_dir):
+    base = load_corrections(CORRECTIONS_FILE)
+    sample = load_sample_text()
+    results = []
+
+    print("Corrections:")
+    print(f"  {'Entries':>8}  {'Load':>8}  {'Compile':>8}  {'Size':>6}  {'Lines':>6}  "
+          f"{'Whole MB/s':>10}  {'By line MB/s':>12}")
+    for count in correction_counts:
+        corrections = synthetic_corrections(base, count)
+        path = Path(work_dir) / f'corrections-{len(corrections)}.txt'
+        write_corrections(corrections, path)
+
+        load_time, loaded = time_call(lambda: load_corrections(path), repeats)
+        compile_time, matcher = time_call(lambda: compile_corrections(loaded), repeats)
+
+        for size_mb in sizes_mb:
+            short_document = build_document(sample, loaded, int(size_mb * 1024 * 1024))
+            for layout, document in (('short', short_document),
+                                     ('long', long_lines(short_document, long_line_bytes))):
+                lines = document.splitlines(keepends=True)
+                whole_time, _ = time_call(lambda: apply_corrections(document, matcher), repeats)
+                line_time, _ = time_call(lambda: ''.join(apply_corrections(line, matcher) for line in lines),
+                                         repeats)
+                print(f"  {len(loaded):>8}  {load_time * 1000:>6.1f}ms  {compile_time * 1000:>6.1f}ms  "
+                      f"{size_mb:>4g}MB  {layout:>6}  {size_mb / whole_time:>10.1f}  {size_mb / line_time:>12.1f}")
+                results.append({
+                    'corrections': len(loaded),
+                    'load_s': load_time,
+                    'compile_s': compile_time,
+                    'size_mb': size_mb,
+                    'lines': layout,
+                    'line_count': len(lines),
+                    'whole_s': whole_time,
+                    'by_line_s': line_time,
+                })
+    print()
+    return results
+
+
+def sample_texts(count, seed=0):
+    """Short Latin UI strings from translations.csv, repeated up to count."""
+    with open(CSV_FILE, 'r', encoding='utf-8') as f:
+        values = [row['value'] for row in csv.DictReader(f) if row['value'].strip()]
+    rng = random.Random(seed)
+    return [rng.choice(values) for _ in range(count)]
+
+
+def bench_pipelines(stub, requests):
+    """Seconds per single-text request for each way of running the transliterator."""
+    texts = sample_texts(requests)
+    dict_files = {'british': generate_translations.DICT_FILE_BRITISH,
+                  'american': generate_translations.DICT_FILE_AMERICAN}
+    results = []
+
+    def record(name, startup, elapsed, count):
+        per_request = elapsed / count
+        startup_text = f'{startup * 1000:.1f}ms' if startup is not None else '-'
+        print(f"  {name:<32}  {startup_text:>10}  {per_request * 1000:>8.2f}ms")
+        results.append({'pipeline': name, 'startup_s': startup, 'per_request_s': per_request,
+                        'requests': count})
+
+    print("Pipelines (stub transliterator):")
+    print(f"  {'Pipeline':<32}  {'Startup':>10}  {'Request':>10}")
+
+    # The original pipeline: a new shave process for every text
+    count = min(requests, 50)
+    start = time.perf_counter()
+    for text in texts[:count]:
+        subprocess.run([stub, shave_pool.DIALECT_FLAGS['british'], str(dict_files['british'])],
+                       input=text, capture_output=True, text=True, check=True)
+    record('process per text', None, time.perf_counter() - start, count)
+
+    # shave | fix-shavian.py, also once per text
+    start = time.perf_counter()
+    for text in texts[:count]:
+        shaved = subprocess.run([stub], input=text, capture_output=True, text=True, check=True).stdout
+        subprocess.run([sys.executable, str(FIX_SHAVIAN)], input=shaved, capture_output=True,
+                       text=True, check=True)
+    record('process per text + fix-shavian', None, time.perf_counter() - start, count)
+
+    # Long-lived framed processes
+    start = time.perf_counter()
+    pool = ShavePool(stub, dict_files)
+    startup = time.perf_counter() - start
+    with pool:
+        start = time.perf_counter()
+        for text in texts:
+            pool.transliterate([text], 'british')
+        record('pool, long-lived processes', startup, time.perf_counter() - start, len(texts))
+
+        start = time.perf_counter()
+        pool.transliterate(texts, 'british')
+        record('pool, one framed batch', None, time.perf_counter() - start, len(texts))
+
+    # Fallback when shave buffers its output: one framed process per request
+    saved_timeout = shave_pool.HANDSHAKE_TIMEOUT
+    shave_pool.HANDSHAKE_TIMEOUT = 0.2
+    os.environ['STUB_SHAVE_BUFFERED'] = '1'
+    try:
+        pool = ShavePool(stub, dict_files)
+        with pool:
+            if pool.streaming:
+                raise RuntimeError("the buffered stub should have disabled streaming")
+            start = time.perf_counter()
+            for text in texts[:count]:
+                pool.transliterate([text], 'british')
+            record('pool, process per request', None, time.perf_counter() - start, count)
+    finally:
+        del os.environ['STUB_SHAVE_BUFFERED']
+        shave_pool.HANDSHAKE_TIMEOUT = saved_timeout
+
+    print()
+    return results
+
+
+def synthetic_csv(path, rows):
+    """A translations.csv of the given number of rows, built from the real one."""
+    with open(CSV_FILE, 'r', encoding='utf-8') as f:
+        source = list(csv.DictReader(f))
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['key', 'value'])
+        writer.writeheader()
+        for i in range(rows):
+            row = source[i % len(source)]
+            writer.writerow({'key': f"{row['key']}_{i}", 'value': row['value']})
+
+
+def synthetic_html(path, target_bytes):
+    """An HTML page of about target_bytes, repeating the bodies of the Latin site pages."""
+    bodies = []
+    for page in sorted(SITE_DIR.glob('*_latin.html')):
+        content = page.read_text(encoding='utf-8')
+        start = content.find('<body')
+        end = content.rfind('</body>')
+        bodies.append(content[content.index('>', start) + 1:end] if start >= 0 and end > start else content)
+    body = '\n'.join(bodies)
+
+    parts = ['<!DOCTYPE html>\n<html>\n<head><title>Benchmark</title></head>\n<body>\n']
+    size = 0
+    while size < target_bytes:
+        parts.append(body)
+        size += len(body.encode('utf-8'))
+    parts.append('</body>\n</html>\n')
+    path.write_text(''.join(parts), encoding='utf-8')
+
+
+def bench_end_to_end(stub, csv_rows, html_sizes_kb, work_dir):
+    work_dir = Path(work_dir)
+    dict_files = {'british': generate_translations.DICT_FILE_BRITISH,
+                  'american': generate_translations.DICT_FILE_AMERICAN}
+    results = []
+
+    jobs = []
+    for rows in csv_rows:
+        source = work_dir / f'translations-{rows}.csv'
+        synthetic_csv(source, rows)
+        outputs = [work_dir / f'out-{rows}-{name}.json' for name in ('latin', 'british', 'american')]
+        jobs.append(('csv', f'{rows} rows', source.stat().st_size,
+                     lambda pool, source=source, outputs=outputs:
+                     generate_translations.transliterate_csv(source, *outputs, pool)))
+    for size_kb in html_sizes_kb:
+        source = work_dir / f'page-{size_kb}.html'
+        synthetic_html(source, size_kb * 1024)
+        outputs = [work_dir / f'page-{size_kb}_{dialect}.html' for dialect in ('gb', 'us')]
+        jobs.append(('html', f'{size_kb} KB', source.stat().st_size,
+                     lambda pool, source=source, outputs=outputs:
+                     generate_translations.transliterate_html(source, *outputs, pool)))
+
+    print("End to end (stub transliterator, both dialects):")
+    print(f"  {'Input':<6}  {'Size':>10}  {'No cache':>10}  {'Cold cache':>10}  {'Warm cache':>10}")
+    with ShavePool(stub, dict_files) as pool:
+        for kind, label, size, run in jobs:
+            timings = {}
+
+            start = time.perf_counter()
+            with quiet():
+                run(pool)
+            timings['no_cache_s'] = time.perf_counter() - start
+
+            cache_file = work_dir / f'cache-{kind}-{size}.json'
+            for state in ('cold', 'warm'):
+                start = time.perf_counter()
+                # The cache starts (and closes) its own pool on the first miss, as in a real run
+                with quiet(), TranslationCache(lambda: ShavePool(stub, dict_files), 'stub', dict_files,
+                                               CORRECTIONS_FILE, cache_file=cache_file) as cache:
+                    run(cache)
+                timings[f'{state}_cache_s'] = time.perf_counter() - start
+
+            print(f"  {kind:<6}  {label:>10}  {timings['no_cache_s'] * 1000:>8.1f}ms  "
+                  f"{timings['cold_cache_s'] * 1000:>8.1f}ms  {timings['warm_cache_s'] * 1000:>8.1f}ms")
+            results.append({'input': kind, 'label': label, 'bytes': size, **timings})
+    print()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the transliteration and correction pipeline')
+    parser.add_argument('-o', '--output', type=Path, default=OUTPUT_FILE,
+                        help='JSON results file (default: build/benchmarks/transliteration.json)')
+    parser.add_argument('-r', '--repeats', type=int, default=3,
+                        help='Runs per correction measurement; the best is reported (default: 3)')
+    parser.add_argument('--quick', action='store_true', help='Smaller inputs and fewer requests')
+    args = parser.parse_args()
+
+    if args.quick:
+        correction_counts, sizes_mb, requests = [0, 1000], [0.25], 50
+        csv_rows, html_sizes_kb = [160, 1600], [32, 256]
+    else:
+        correction_counts, sizes_mb, requests = [0, 1000, 10000], [0.25, 1, 4], 200
+        csv_rows, html_sizes_kb = [160, 1600, 16000], [32, 256, 2048]
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as work_dir:
+        stub = make_stub(work_dir)
+        results = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+            'corrections': bench_corrections(correction_counts, sizes_mb, args.repeats, 64 * 1024, work_dir),
+            'pipelines': bench_pipelines(stub, requests),
+            'end_to_end': bench_end_to_end(stub, csv_rows, html_sizes_kb, work_dir),
+        }
+
+    write_json(args.output, results)
+    print(f"✅ Benchmarks finished in {time.perf_counter() - start:.1f}s, results in {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
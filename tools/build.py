@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Build orchestrator for Shaw Type.
+
+Every generator is declared as a target with the files it reads and the
+files it writes. A target's dependencies are the targets whose outputs match
+its inputs. On each run only stale targets are rebuilt, independent targets
+run in parallel, and a summary with the critical path is printed at the end.
+
+A target is stale when one of its outputs is missing, or when an input
+changed since its last successful run. Changes are detected by content hash
+(stored in .cache/build/), so touching a file does not trigger a rebuild.
+Before the first recorded run (e.g. in a fresh clone), existing outputs are
+the committed ones and are accepted as up to date, so a plain build never
+rewrites tracked files.
+
+Targets whose tools are not available here, such as shave, readlex or a
+Playwright browser, are skipped. Their committed outputs are kept.
+
+The first deploy in a fresh clone takes around 15 seconds, against well under
+a second afterwards. It subsets the fonts, recompresses the images and
+measures brotli sizes for the page-weight budgets, and all three results are
+cached in .cache/ by content hash. --quick deploys without these steps. That
+suits local iteration, but not a deploy that will be published.
+
+Usage:
+    python build.py                    # everything, then deploy to build/site
+    python build.py learn_words        # one target (and what it depends on)
+    python build.py --list             # targets and whether they are stale
+    python build.py -f -j 4            # rebuild everything, 4 at a time
+    python build.py --watch            # serve build/site, rebuild and reload on change
+    python build.py --quick            # deploy without font subsetting, image optimisation or budgets
+    python build.py --compare          # fail if time or payload grew past the baseline
+
+Each run writes a metrics report to build/metrics.json (see build_metrics.py).
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+CACHE_DIR = PROJECT_DIR / '.cache' / 'build'
+READLEX_FILE = PROJECT_DIR / 'readlex' / 'readlex.json'
+
+# Modules the word-list generators share
+WORD_TOOLS = ['tools/keyboard_layout_loader.py', 'tools/word_corpus.py']
+WORD_LAYOUTS = ['site/keyboard_layouts.json']
+
+
+class Target:
+    """
+    One build step: a tool script run with arguments.
+
+    Args:
+        name: Target name used on the command line
+        script: Tool script in tools/
+        inputs: Glob patterns, relative to the project, of the files it reads
+            ('dir/**' means every file under dir)
+        outputs: Glob patterns of the files it writes
+        args: Extra command-line arguments for the script
+        check: Optional callable returning why the target can't run here, or None
+        after: Names of targets that must finish first even though this
+            target doesn't read their outputs (e.g. checks)
+    """
+
+    def __init__(self, name, script, inputs, outputs, args=(), check=None, after=()):
+        self.name = name
+        self.script = script
+        self.inputs = [f'tools/{script}'] + list(inputs)
+        self.outputs = list(outputs)
+        self.args = list(args)
+        self.check = check
+        self.after = list(after)
+        self.deps = []
+
+    def command(self):
+        return [sys.executable, str(SCRIPT_DIR / self.script)] + self.args
+
+    def stamp_file(self):
+        return CACHE_DIR / f'{self.name}.json'
+
+
+def expand(pattern):
+    """Files matching a glob pattern relative to the project, sorted."""
+    if pattern.endswith('/**'):
+        return sorted(p for p in (PROJECT_DIR / pattern[:-3]).rglob('*') if p.is_file())
+    return sorted(p for p in PROJECT_DIR.glob(pattern) if p.is_file())
+
+
+def patterns_overlap(a, b):
+    a = a[:-1] if a.endswith('/**') else a
+    b = b[:-1] if b.endswith('/**') else b
+    return fnmatch(a, b) or fnmatch(b, a)
+
+
+def inputs_hash(target):
+    """Hash of the target's input files (paths and contents) and arguments."""
+    digest = hashlib.sha256(json.dumps(target.args).encode('utf-8'))
+    for pattern in target.inputs:
+        for path in expand(pattern):
+            digest.update(path.relative_to(PROJECT_DIR).as_posix().encode('utf-8') + b'\0')
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def staleness(target):
+    """
+    Return (reason, hash): why the target must run (None if up to date) and
+    the current hash of its inputs. Only reads: run_build records the stamps.
+
+    A target that was never built here (a fresh clone) trusts its outputs if
+    they all exist: they are the committed ones, and checkout mtimes say
+    nothing about which is newer. run_build then records the inputs as they
+    are, so later edits make the target stale (use --force to rebuild
+    outputs that were already out of date).
+    """
+    current = inputs_hash(target)
+    output_files = []
+    for pattern in target.outputs:
+        files = expand(pattern)
+        if not files:
+            return f'missing {pattern}', current
+        output_files.extend(files)
+
+    try:
+        with open(target.stamp_file(), 'r', encoding='utf-8') as f:
+            recorded = json.load(f).get('inputs')
+    except (FileNotFoundError, json.JSONDecodeError):
+        recorded = None
+
+    if recorded == current:
+        return None, current
+    if recorded is not None:
+        return 'inputs changed', current
+    if not output_files:
+        return 'never run', current
+    return None, current
+
+
+def save_stamp(target, current):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(target.stamp_file(), 'w', encoding='utf-8') as f:
+        json.dump({'inputs': current}, f)
+
+
+def find_shave():
+    """Path to the shave tool, looked up like generate_translations.py does."""
+    home_bin_shave = Path.home() / 'bin' / 'shave'
+    if home_bin_shave.exists():
+        return str(home_bin_shave)
+    return shutil.which('shave')
+
+
+def find_playwright_browser():
+    """True if Playwright and its Chromium download are installed."""
+    if not importlib.util.find_spec('playwright'):
+        return False
+    roots = [Path.home() / '.cache' / 'ms-playwright', Path.home() / 'Library' / 'Caches' / 'ms-playwright']
+    if os.environ.get('PLAYWRIGHT_BROWSERS_PATH'):
+        roots.insert(0, Path(os.environ['PLAYWRIGHT_BROWSERS_PATH']))
+    return any(any(root.glob('chromium*')) for root in roots if root.is_dir())
+
+
+def define_targets(version, build_number, output_dir, word_source='readlex', backend='shave', quick=False):
+    """Declare every build target, in a sensible serial order."""
+    if word_source == 'readlex':
+        word_inputs = ['readlex/readlex.json']
+    else:
+        word_inputs = ['tools/shavian-gb-word-frequencies.txt', 'tools/shavian-us-word-frequencies.txt']
+
+    def check_words():
+        if word_source == 'readlex' and not READLEX_FILE.exists():
+            return 'readlex not checked out (use --corpus to build from the frequency corpus)'
+        return None
+
+    def check_translations():
+        if backend == 'native':
+            return None if READLEX_FILE.exists() else 'readlex not checked out'
+        return None if find_shave() else "'shave' not found (use --native for the readlex engine)"
+
+    def check_numpy():
+        return None if importlib.util.find_spec('numpy') else 'NumPy not installed (pip install numpy)'
+
+    def check_favicon():
+        return None if importlib.util.find_spec('PIL') else 'Pillow not installed (pip install Pillow)'
+
+    def check_keyboard_images():
+        if find_playwright_browser():
+            return None
+        return 'Playwright browser not installed (pip install playwright && playwright install chromium)'
+
+    targets = [
+        Target('layouts', 'extract_keyboard_layouts.py',
+               inputs=['site/keyboard_layouts.json'],
+               outputs=['site/keyboard_layout_*.json']),
+
+        Target('translations', 'generate_translations.py',
+               inputs=['tools/translations.csv', 'site/*_latin.html',
+                       'tools/shaw-type-british.dict', 'tools/shaw-type-american.dict',
+                       'tools/shavian-corrections.txt', 'tools/shavian_corrections.py',
+                       'tools/shave_pool.py', 'tools/native_transliterator.py',
+                       'tools/translation_cache.py', 'tools/html_segments.py'],
+               outputs=['site/translations_*.json', 'site/*_gb.html', 'site/*_us.html'],
+               args=['-b', backend],
+               check=check_translations),
+
+        Target('learn_words', 'generate_learn_words.py',
+               inputs=WORD_TOOLS + WORD_LAYOUTS + word_inputs,
+               outputs=['site/learn_words_*.json'],
+               args=['--source', word_source],
+               check=check_words),
+
+        Target('play_words', 'generate_play_words.py',
+               inputs=WORD_TOOLS + WORD_LAYOUTS + word_inputs,
+               outputs=['site/words_*.json'],
+               args=['--source', word_source, '--only', 'words'],
+               check=check_words),
+
+        # Tiers the committed word lists, so it runs without readlex
+        Target('play_tiers', 'generate_play_words.py',
+               inputs=WORD_TOOLS + WORD_LAYOUTS + ['site/words_*.json', 'tools/typing_effort.py'],
+               outputs=['site/play_words_*.json'],
+               args=['--only', 'tiers'],
+               check=check_numpy),
+
+        Target('favicon', 'generate_favicon.py',
+               inputs=['site/fonts/Ormin-Regular.otf'],
+               outputs=['site/favicon*.png', 'site/favicon.ico', 'site/apple-touch-icon-*.png'],
+               check=check_favicon),
+
+        Target('keyboard_images', 'generate_keyboard_images.py',
+               inputs=['site/keyboard_layout_*.json', 'site/virtual-keyboard.html',
+                       'site/virtual-keyboard.css', 'site/virtual-keyboard.js', 'site/style.css',
+                       'site/fonts/*.otf'],
+               outputs=['site/keyboard_images/*_base.png', 'site/keyboard_images/*_shift.png'],
+               check=check_keyboard_images),
+
+        # A check with no outputs: reruns whenever the word lists change
+        Target('verify', 'verify_word_data.py',
+               inputs=['site/learn_words_*.json', 'site/words*.json',
+                       'site/play_words_*.json', 'tools/generate_learn_words.py',
+                       'tools/keyboard_layout_loader.py'],
+               outputs=[]),
+
+        Target('deploy', 'deploy.py',
+               inputs=['site/**', 'tools/optimize_images.py', 'tools/inline_resources.py', 'tools/page_budgets.py',
+                       'tools/page-budgets.json', 'tools/subset_fonts.py'],
+               outputs=[f'{output_dir}/.version'],
+               args=['-v', version, '-b', build_number, '-o', output_dir]
+                    + (['--no-subset-fonts', '--no-optimize-images', '--no-budgets'] if quick else []),
+               after=['verify']),
+    ]
+
+    # A target depends on every earlier target whose outputs it reads
+    for i, target in enumerate(targets):
+        for other in targets[:i]:
+            if other.name in target.after or any(
+                    patterns_overlap(i_pattern, o_pattern)
+                    for i_pattern in target.inputs for o_pattern in other.outputs):
+                target.deps.append(other)
+
+    return targets
+
+
+def select_targets(targets, names):
+    """The named targets plus everything they depend on, in declaration order."""
+    if not names:
+        return targets
+    selected = set()
+
+    def add(target):
+        if target.name not in selected:
+            selected.add(target.name)
+            for dep in target.deps:
+                add(dep)
+
+    by_name = {target.name: target for target in targets}
+    for name in names:
+        add(by_name[name])
+    return [target for target in targets if target.name in selected]
+
+
+class Result:
+    def __init__(self, status, detail='', start=0.0, end=0.0, output=''):
+        self.status = status  # 'built', 'fresh', 'skipped', 'failed' or 'blocked'
+        self.detail = detail
+        self.start = start
+        self.end = end
+        self.output = output
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+def run_target(target, build_start):
+    start = time.perf_counter() - build_start
+    process = subprocess.run(target.command(), cwd=PROJECT_DIR, capture_output=True,
+                             text=True, encoding='utf-8', errors='replace')
+    end = time.perf_counter() - build_start
+    output = process.stdout + process.stderr
+    if process.returncode != 0:
+        return Result('failed', f'exit code {process.returncode}', start, end, output)
+    return Result('built', '', start, end, output)
+
+
+def run_build(targets, jobs=None, force=False, dry_run=False, verbose=False):
+    """
+    Run the stale targets, in parallel where dependencies allow.
+
+    Returns:
+        Dict target name → Result
+    """
+    results = {}
+    hashes = {}
+    pending = list(targets)
+    running = {}
+    build_start = time.perf_counter()
+
+    def finished(target):
+        return target.name in results and target.name not in running.values()
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        while pending or running:
+            for target in list(pending):
+                if not all(finished(dep) for dep in target.deps if dep in targets):
+                    continue
+                pending.remove(target)
+                now = time.perf_counter() - build_start
+
+                failed = [dep.name for dep in target.deps
+                          if results.get(dep.name) and results[dep.name].status in ('failed', 'blocked')]
+                if failed:
+                    results[target.name] = Result('blocked', f"{', '.join(failed)} failed", now, now)
+                    continue
+
+                reason = target.check() if target.check else None
+                if reason:
+                    results[target.name] = Result('skipped', reason, now, now)
+                    print(f"  ⓘ {target.name}: skipped, {reason}")
+                    continue
+
+                reason, hashes[target.name] = staleness(target)
+                if force:
+                    reason = 'forced'
+                if reason is None:
+                    if not dry_run and not target.stamp_file().exists():
+                        save_stamp(target, hashes[target.name])
+                    results[target.name] = Result('fresh', 'up to date', now, now)
+                    continue
+
+                if dry_run:
+                    results[target.name] = Result('built', f'would run ({reason})', now, now)
+                    print(f"  → {target.name}: would run ({reason})")
+                    continue
+
+                print(f"  → {target.name}: running ({reason})")
+                results[target.name] = Result('running')
+                running[executor.submit(run_target, target, build_start)] = target.name
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                results[name] = result
+                target = next(t for t in targets if t.name == name)
+                if verbose or result.status == 'failed':
+                    print(result.output.rstrip())
+                if result.status == 'built':
+                    save_stamp(target, hashes[name])
+                    print(f"  ✓ {name} ({result.duration:.2f}s)")
+                else:
+                    print(f"  ❌ {name}: {result.detail}")
+
+    return results
+
+
+def critical_path(targets, results):
+    """The chain of dependent targets with the longest total run time."""
+    path_time = {}
+    path = {}
+    for target in targets:  # declaration order is a topological order
+        best = max((dep for dep in target.deps if dep.name in path_time),
+                   key=lambda dep: path_time[dep.name], default=None)
+        path_time[target.name] = results[target.name].duration + (path_time[best.name] if best else 0)
+        path[target.name] = (path[best.name] if best else []) + [target.name]
+    if not path_time:
+        return [], 0.0
+    last = max(path_time, key=path_time.get)
+    return path[last], path_time[last]
+
+
+def print_summary(targets, results, wall_time):
+    symbols = {'built': '✓', 'fresh': '·', 'skipped': 'ⓘ', 'failed': '❌', 'blocked': '❌'}
+    width = max(len(target.name) for target in targets)
+
+    print("\nBuild summary:")
+    for target in targets:
+        result = results[target.name]
+        if result.status == 'built' and not result.detail:
+            detail = f'{result.duration:.2f}s'
+        else:
+            detail = result.detail
+        print(f"  {symbols[result.status]} {target.name:<{width}}  {detail}")
+
+    chain, total = critical_path(targets, results)
+    built = [name for name in chain if results[name].status == 'built' and not results[name].detail]
+    if built:
+        steps = ' → '.join(f'{name} ({results[name].duration:.2f}s)' for name in built)
+        print(f"\nCritical path: {steps}")
+    print(f"Total: {wall_time:.2f}s wall, {total:.2f}s on the critical path")
+
+
+def main():
+    from build_metrics import (
+        BASELINE_FILE, METRICS_FILE, add_threshold_arguments, collect_metrics, compare_files,
+        save_baseline, snapshot_outputs, thresholds_from,
+    )
+    from deploy import read_version_file
+    from output_writer import write_json
+
+    parser = argparse.ArgumentParser(description='Build Shaw Type, regenerating only what changed')
+    parser.add_argument('targets', nargs='*', metavar='target',
+                        help='Targets to build, with their dependencies (default: all)')
+    parser.add_argument('-v', '--version', help='Version number (default: read from current-version file)')
+    parser.add_argument('-b', '--build-number', help='Build number (default: read from current-version file)')
+    parser.add_argument('-o', '--output-directory', default='build/site',
+                        help='Deploy output directory (default: build/site)')
+    parser.add_argument('-j', '--jobs', type=int, help='Targets to run at once (default: CPU count)')
+    parser.add_argument('-f', '--force', action='store_true', help='Rebuild targets even if they are up to date')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='Show what would run without running it')
+    parser.add_argument('-l', '--list', action='store_true', help='List targets and whether they are stale')
+    parser.add_argument('--corpus', action='store_true',
+                        help='Build word lists from the frequency corpus instead of readlex')
+    parser.add_argument('--native', action='store_true',
+                        help='Transliterate with the in-process readlex engine instead of shave')
+    parser.add_argument('--verbose', action='store_true', help="Print every target's output")
+    parser.add_argument('-q', '--quick', action='store_true',
+                        help='Deploy without font subsetting, image optimisation or budget checks')
+    parser.add_argument('-w', '--watch', action='store_true',
+                        help='Serve the output with live reload and rebuild on every change')
+    parser.add_argument('-p', '--port', type=int, default=8000, help='Port for --watch (default: 8000)')
+    parser.add_argument('--metrics', type=Path, default=METRICS_FILE,
+                        help='Metrics report to write (default: build/metrics.json)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE,
+                        help='Baseline metrics report (default: build/metrics-baseline.json)')
+    parser.add_argument('--compare', action='store_true',
+                        help='Fail if time or payload grew beyond the thresholds since the baseline')
+    parser.add_argument('--save-baseline', action='store_true', help="Make this run's metrics the baseline")
+    add_threshold_arguments(parser)
+    args = parser.parse_args()
+
+    if args.version is None or args.build_number is None:
+        file_version, file_build = read_version_file()
+        version = args.version or file_version
+        build_number = args.build_number or file_build
+    else:
+        version = args.version
+        build_number = args.build_number
+
+    targets = define_targets(version, build_number, args.output_directory,
+                             word_source='corpus' if args.corpus else 'readlex',
+                             backend='native' if args.native else 'shave', quick=args.quick)
+
+    names = [target.name for target in targets]
+    unknown = [name for name in args.targets if name not in names]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)} (choose from {', '.join(names)})")
+    targets = select_targets(targets, args.targets)
+
+    if args.list:
+        width = max(len(target.name) for target in targets)
+        for target in targets:
+            reason = target.check() if target.check else None
+            state = f'skipped, {reason}' if reason else (staleness(target)[0] or 'up to date')
+            deps = ', '.join(dep.name for dep in target.deps)
+            print(f"  {target.name:<{width}}  {state}" + (f"  (after {deps})" if deps else ''))
+        return 0
+
+    if args.watch:
+        from watch import watch
+        return watch(targets, version, build_number, args.output_directory, args.port, args.jobs,
+                     subset_fonts=not args.quick)
+
+    print(f"Building Shaw Type v{version} (build {build_number}) → {args.output_directory}\n")
+    before = snapshot_outputs(targets, args.output_directory)
+    start = time.perf_counter()
+    results = run_build(targets, args.jobs, args.force, args.dry_run, args.verbose)
+    wall_time = time.perf_counter() - start
+    print_summary(targets, results, wall_time)
+
+    if any(result.status in ('failed', 'blocked') for result in results.values()):
+        print("\n❌ Build failed")
+        return 1
+
+    if not args.dry_run:
+        metrics = collect_metrics(targets, results, before, wall_time, version, build_number,
+                                  args.output_directory, args.jobs)
+        write_json(args.metrics, metrics)
+        print(f"\nⓘ Metrics written to {args.metrics}")
+        if args.compare and compare_files(args.metrics, args.baseline, **thresholds_from(args)):
+            print("\n❌ Build regressed")
+            return 1
+        if args.save_baseline:
+            save_baseline(args.metrics, args.baseline)
+            print(f"✓ Saved as the baseline {args.baseline}")
+
+    print("\n✅ Build complete!")
+    if not args.dry_run:
+        print(f"Run 'python3 -m http.server 8000 --directory {args.output_directory}' to test")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
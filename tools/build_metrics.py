@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Build metrics: a JSON record of each build and a comparison with a baseline.
+
+build.py writes a report after every run (build/metrics.json by default)
+with:
+
+- stages: status and duration of each target, and how many of its output
+  files were written, left unchanged or removed. The generators only rewrite
+  files whose content changed (output_writer.py), so a changed modification
+  time means a rewritten file.
+- outputs: total bytes of each target's output files
+- payload: bytes of the deployed site, in total and per file type
+- words: word counts per level of every learn lesson file, and
+  the total of every play word file
+
+The comparison fails when the build time or the payload grows by more than a
+threshold. Times are compared only when the stage ran in both builds (the
+wall time only when the same stages ran), and below a minimum difference
+(default 0.5 s) they count as noise. Word count changes are listed but never
+fail the comparison.
+
+Usage:
+    python build.py --save-baseline              # build, then keep this run as the baseline
+    python build.py --compare                    # build, then fail on regressions
+    python build_metrics.py                      # compare build/metrics.json with the baseline
+    python build_metrics.py -t 0.1 -s 0.02       # stricter: 10% time, 2% size
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from build import PROJECT_DIR, expand
+
+SITE_DIR = PROJECT_DIR / 'site'
+METRICS_FILE = PROJECT_DIR / 'build' / 'metrics.json'
+BASELINE_FILE = PROJECT_DIR / 'build' / 'metrics-baseline.json'
+
+TIME_THRESHOLD = 0.20
+SIZE_THRESHOLD = 0.05
+MIN_TIME_CHANGE = 0.5
+MIN_SIZE_CHANGE = 1024
+
+
+def target_patterns(target, output_dir):
+    # deploy's declared output is only the .version marker; it writes the whole directory
+    if target.name == 'deploy':
+        return [f'{output_dir}/**']
+    return target.outputs
+
+
+def snapshot_outputs(targets, output_dir):
+    """Map each target to {file: (mtime, size)} for its current output files."""
+    state = {}
+    for target in targets:
+        files = {}
+        for pattern in target_patterns(target, output_dir):
+            for path in expand(pattern):
+                stat = path.stat()
+                files[path.relative_to(PROJECT_DIR).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+        state[target.name] = files
+    return state
+
+
+def count_words(site_dir=SITE_DIR):
+    """Word counts per level for lesson files, and totals for play word files."""
+    words = {}
+    for path in sorted(site_dir.glob('learn_words_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            lessons = json.load(f)
+        words[path.name] = {level: len(lesson['words']) for level, lesson in lessons.items()}
+    for pattern in ('words_*.json', 'play_words_*.json'):
+        for path in sorted(site_dir.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                buckets = json.load(f)
+            words[path.name] = sum(
+                len(bucket) if isinstance(bucket, list) else sum(len(tier) for tier in bucket.values())
+                for bucket in buckets.values())
+    return words
+
+
+def payload_sizes(output_path):
+    """Total bytes of the deployed site and bytes per file extension."""
+    by_type = defaultdict(int)
+    for path in output_path.rglob('*'):
+        if path.is_file():
+            by_type[path.suffix.lstrip('.') or path.name] += path.stat().st_size
+    return {'total': sum(by_type.values()), 'by_type': dict(sorted(by_type.items()))}
+
+
+def collect_metrics(targets, results, before, wall_time, version, build_number, output_dir, jobs=None):
+    """Build the metrics report for a finished run."""
+    after = snapshot_outputs(targets, output_dir)
+
+    stages = {}
+    outputs = {}
+    for target in targets:
+        result = results[target.name]
+        old, new = before[target.name], after[target.name]
+        stages[target.name] = {
+            'status': result.status,
+            'duration': round(result.duration, 3),
+            'files_written': sum(1 for path, stat in new.items() if old.get(path) != stat),
+            'files_unchanged': sum(1 for path, stat in new.items() if old.get(path) == stat),
+            'files_removed': sum(1 for path in old if path not in new),
+        }
+        outputs[target.name] = sum(size for _, size in new.values())
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'version': version,
+        'build_number': build_number,
+        'machine': {'python': platform.python_version(), 'cpus': os.cpu_count(), 'jobs': jobs},
+        'wall_time': round(wall_time, 3),
+        'stages': stages,
+        'outputs': outputs,
+        'payload': payload_sizes(PROJECT_DIR / output_dir),
+        'words': count_words(),
+    }
+
+
+def load_metrics(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(metrics_file=METRICS_FILE, baseline_file=BASELINE_FILE):
+    baseline_file.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(metrics_file, baseline_file)
+
+
+def format_size(size):
+    if abs(size) >= 1024 * 1024:
+        return f'{size / (1024 * 1024):.2f} MB'
+    if abs(size) >= 1024:
+        return f'{size / 1024:.1f} KB'
+    return f'{size} B'
+
+
+def compare(current, baseline, time_threshold=TIME_THRESHOLD, size_threshold=SIZE_THRESHOLD,
+            min_time_change=MIN_TIME_CHANGE, min_size_change=MIN_SIZE_CHANGE):
+    """
+    Compare two metrics reports.
+
+    Returns:
+        (rows, word changes) where each row is (metric, baseline, current,
+        change, regressed) with formatted values
+    """
+    rows = []
+
+    def add(metric, old, new, kind):
+        if old is None or new is None:
+            return
+        change = new - old
+        relative = change / old if old else (float('inf') if change > 0 else 0.0)
+        if kind == 'time':
+            regressed = relative > time_threshold and change > min_time_change
+            fmt = lambda value: f'{value:.2f}s'
+        else:
+            regressed = relative > size_threshold and change > min_size_change
+            fmt = format_size
+        sign = '+' if change > 0 else ''
+        percent = f' ({sign}{relative:.0%})' if old else ''
+        rows.append((metric, fmt(old), fmt(new), f'{sign}{fmt(change)}{percent}', regressed))
+
+    def built(report):
+        return {name for name, stage in report.get('stages', {}).items() if stage['status'] == 'built'}
+
+    # Wall times are only comparable when the same stages ran
+    if built(current) == built(baseline):
+        add('wall time', baseline.get('wall_time'), current.get('wall_time'), 'time')
+    for name, stage in current.get('stages', {}).items():
+        old = baseline.get('stages', {}).get(name)
+        # A stage that was up to date or skipped in either build has no comparable time
+        if old and old['status'] == 'built' and stage['status'] == 'built':
+            add(f'{name} time', old['duration'], stage['duration'], 'time')
+
+    add('payload total', baseline.get('payload', {}).get('total'), current.get('payload', {}).get('total'), 'size')
+    old_types = baseline.get('payload', {}).get('by_type', {})
+    for file_type, size in current.get('payload', {}).get('by_type', {}).items():
+        add(f'payload .{file_type}', old_types.get(file_type, 0), size, 'size')
+    for name, size in current.get('outputs', {}).items():
+        if name != 'deploy':
+            add(f'{name} output', baseline.get('outputs', {}).get(name), size, 'size')
+
+    word_changes = []
+    old_words = baseline.get('words', {})
+    for file, counts in current.get('words', {}).items():
+        old = old_words.get(file)
+        if old is None or old == counts:
+            continue
+        if isinstance(counts, dict):
+            for level, count in counts.items():
+                if old.get(level) != count:
+                    word_changes.append(f'{file} level {level}: {old.get(level, 0)} → {count}')
+        else:
+            word_changes.append(f'{file}: {old} → {counts}')
+
+    return rows, word_changes
+
+
+def print_comparison(rows, word_changes, verbose=False):
+    """Print the comparison table (only changed rows unless verbose). Returns True if anything regressed."""
+    shown = [row for row in rows if verbose or row[4] or row[1] != row[2]]
+    if shown:
+        headers = ('metric', 'baseline', 'current', 'change')
+        widths = [max(len(headers[i]), *(len(row[i]) for row in shown)) for i in range(4)]
+        print('    ' + '  '.join(header.ljust(width) for header, width in zip(headers, widths)))
+        for row in shown:
+            symbol = '❌' if row[4] else '✓'
+            print(f'  {symbol} ' + '  '.join(value.ljust(width) for value, width in zip(row[:4], widths)))
+    else:
+        print('  ✓ No changes from the baseline')
+
+    if word_changes:
+        print("\n  ⓘ Word counts changed:")
+        for change in word_changes:
+            print(f"    {change}")
+
+    return any(row[4] for row in rows)
+
+
+def compare_files(metrics_file=METRICS_FILE, baseline_file=BASELINE_FILE, verbose=False, **thresholds):
+    """Compare a metrics file with the baseline file and print the result. Returns an exit code."""
+    if not baseline_file.exists():
+        print(f"ⓘ No baseline at {baseline_file} (save one with --save-baseline)")
+        return 0
+    current = load_metrics(metrics_file)
+    baseline = load_metrics(baseline_file)
+
+    print(f"\nMetrics compared with the baseline from {baseline.get('timestamp', 'unknown')}:")
+    rows, word_changes = compare(current, baseline, **thresholds)
+    if print_comparison(rows, word_changes, verbose):
+        regressed = sum(1 for row in rows if row[4])
+        print(f"\n❌ {regressed} metric(s) regressed beyond the thresholds")
+        return 1
+    print("\n✅ No regressions beyond the thresholds")
+    return 0
+
+
+def add_threshold_arguments(parser):
+    parser.add_argument('-t', '--time-threshold', type=float, default=TIME_THRESHOLD,
+                        help=f'Allowed relative time growth (default: {TIME_THRESHOLD})')
+    parser.add_argument('-s', '--size-threshold', type=float, default=SIZE_THRESHOLD,
+                        help=f'Allowed relative size growth (default: {SIZE_THRESHOLD})')
+    parser.add_argument('--min-time-change', type=float, default=MIN_TIME_CHANGE,
+                        help=f'Time growth in seconds always treated as noise (default: {MIN_TIME_CHANGE})')
+
+
+def thresholds_from(args):
+    return {'time_threshold': args.time_threshold, 'size_threshold': args.size_threshold,
+            'min_time_change': args.min_time_change}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare a build metrics report with a baseline')
+    parser.add_argument('metrics', nargs='?', type=Path, default=METRICS_FILE,
+                        help='Metrics report (default: build/metrics.json)')
+    parser.add_argument('-B', '--baseline', type=Path, default=BASELINE_FILE,
+                        help='Baseline report (default: build/metrics-baseline.json)')
+    parser.add_argument('--save', action='store_true', help='Make the report the new baseline')
+    parser.add_argument('--verbose', action='store_true', help='Show unchanged metrics too')
+    add_threshold_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.metrics.exists():
+        print(f"Error: {args.metrics} not found (run build.py first)")
+        return 1
+    if args.save:
+        save_baseline(args.metrics, args.baseline)
+        print(f"✓ Saved {args.metrics} as the baseline {args.baseline}")
+        return 0
+    return compare_files(args.metrics, args.baseline, args.verbose, **thresholds_from(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,19 @@ Deploy script for Shaw Type
 Copies site/ directory to build output, replacing {{VERSION}} placeholders
 in both HTML and JSON files.
 
+The fonts are subset to the characters the site uses, and the deployed
+style.css loads the WOFF2 subsets (see subset_fonts.py); site/ keeps only
+the OpenType fonts.
+
+Pages listed in tools/page-budgets.json are deployed last, with their small
+startup fetches inlined and preload hints for the rest of their critical
+requests (see inline_resources.py).
+
+Files are only rewritten when their content changes (see output_writer.py),
+and files that are no longer in site/ are removed from the output. The
+result is then checked against the page-weight budgets in
+tools/page-budgets.json (see page_budgets.py); exceeding one fails the deploy.
+
 Usage:
     python deploy.py <version> [output_dir]
 
@@ -14,10 +27,103 @@ Examples:
 
 import sys
 import os
-import shutil
 from pathlib import Path
 
-def deploy(version, build_number, output_dir='build/site'):
+from inline_resources import inline_resources
+from output_writer import counts, write_bytes, write_text
+from page_budgets import check_budgets, load_budgets
+from subset_fonts import write_subsets
+
+def render_html(source_file, version, build_number):
+    """Return an HTML file's content with its version placeholders replaced."""
+    with open(source_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    content = content.replace('{{FULL_VERSION}}', f"{version}-b{build_number}")
+    content = content.replace('{{VERSION}}', version)
+    content = content.replace('{{BUILD_NUMBER}}', build_number)
+    return content
+
+def deploy_file(source_file, dest_file, version, build_number):
+    """
+    Copy one site file to the output, replacing version placeholders in
+    HTML, JSON and JS files. Returns the kind of file: 'html', 'json', 'js' or 'other'.
+    """
+    full_version = f"{version}-b{build_number}"
+
+    if source_file.suffix == '.html':
+        write_text(dest_file, render_html(source_file, version, build_number))
+
+        return 'html'
+
+    elif source_file.suffix == '.json':
+        # Read JSON file
+        with open(source_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Replace version placeholders in JSON (quoted)
+        content = content.replace('"{{FULL_VERSION}}"', f'"{full_version}"')
+        content = content.replace('"{{VERSION}}"', f'"{version}"')
+        content = content.replace('"{{BUILD_NUMBER}}"', f'"{build_number}"')
+
+        # Write to output
+        write_text(dest_file, content)
+
+        return 'json'
+
+    elif source_file.suffix == '.js':
+        # Read JavaScript file
+        with open(source_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Replace version placeholders
+        content = content.replace('{{FULL_VERSION}}', full_version)
+        content = content.replace('{{VERSION}}', version)
+        content = content.replace('{{BUILD_NUMBER}}', build_number)
+
+        # Write to output
+        write_text(dest_file, content)
+
+        return 'js'
+
+    else:
+        # Copy other files as-is
+        write_bytes(dest_file, source_file.read_bytes())
+        return 'other'
+
+def inline_pages():
+    """The pages whose startup fetches are inlined: page → fetches, from the page budgets."""
+    return {page: config.get('fetches', []) for page, config in load_budgets().get('pages', {}).items()}
+
+def deploy_fonts(site_dir, output_path):
+    """
+    Write WOFF2 subsets of the site's fonts to the output, with the
+    stylesheet rewritten to load them. Returns the files written, or an
+    empty set when fontTools or brotli is missing (the stylesheet is then
+    deployed as it is, loading the OpenType fonts).
+    """
+    try:
+        files, subsets = write_subsets(output_path, site_dir)
+    except ImportError:
+        print("  ⓘ fontTools or brotli not installed, deploying the fonts without subsetting")
+        return set()
+    for font, name, data, cached in subsets:
+        print(f"  ✓ {name} ({len(data) / 1024:.1f} KB{', cached' if cached else ''})")
+    return files
+
+def deploy_pages(pages, site_dir, output_path, version, build_number):
+    """
+    Deploy pages with their small startup fetches inlined. Runs after the
+    other files are deployed, since the inlined data is read from the output.
+    """
+    for page, fetches in pages.items():
+        html = render_html(site_dir / page, version, build_number)
+        html, inlined, preloaded = inline_resources(html, output_path, page, fetches, f"{version}-b{build_number}")
+        write_text(output_path / page, html)
+        print(f"  ✓ {page} ({len(inlined)} file(s) inlined, {len(preloaded)} preloaded)")
+
+def deploy(version, build_number, output_dir='build/site', optimize_images=True, budgets=True, inline=True,
+           subset_fonts=True):
     """Deploy files with the specified version and build number to output directory."""
     project_root = Path(__file__).parent.parent
     site_dir = project_root / 'site'
@@ -28,11 +134,6 @@ def deploy(version, build_number, output_dir='build/site'):
         print(f"Error: Site directory not found: {site_dir}")
         return 1
 
-    # Create output directory (remove if exists)
-    if output_path.exists():
-        print(f"Removing existing output directory: {output_path}")
-        shutil.rmtree(output_path)
-
     output_path.mkdir(parents=True, exist_ok=True)
 
     full_version = f"{version}-b{build_number}"
@@ -50,83 +151,83 @@ def deploy(version, build_number, output_dir='build/site'):
         'other': 0
     }
 
+    # PNGs are recompressed (results are cached by content hash)
+    optimize_files = None
+    if optimize_images:
+        try:
+            from optimize_images import optimize_files, print_stats
+        except ImportError:
+            print("  ⓘ Pillow not installed, skipping image optimisation")
+
+    # Every file the output should contain
+    expected = set()
+    images = []
+    pages = inline_pages() if inline else {}
+
+    # The subsets and the stylesheet that loads them replace the plain copy
+    font_files = deploy_fonts(site_dir, output_path) if subset_fonts else set()
+    expected.update(font_files)
+
     # Walk through site directory
     for source_file in site_dir.rglob('*'):
         if source_file.is_file():
             # Calculate relative path
             rel_path = source_file.relative_to(site_dir)
             dest_file = output_path / rel_path
+            expected.add(dest_file)
 
-            # Create parent directory if needed
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Process based on file type
-            if source_file.suffix == '.html':
-                # Read HTML file
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Replace version placeholders
-                content = content.replace('{{FULL_VERSION}}', full_version)
-                content = content.replace('{{VERSION}}', version)
-                content = content.replace('{{BUILD_NUMBER}}', build_number)
-
-                # Write to output
-                with open(dest_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if optimize_files and source_file.suffix == '.png':
+                images.append((source_file, dest_file))
+                stats['other'] += 1
+                continue
 
+            if rel_path.as_posix() in pages:
                 stats['html'] += 1
-                print(f"  ✓ {rel_path}")
-
-            elif source_file.suffix == '.json':
-                # Read JSON file
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Replace version placeholders in JSON (quoted)
-                content = content.replace('"{{FULL_VERSION}}"', f'"{full_version}"')
-                content = content.replace('"{{VERSION}}"', f'"{version}"')
-                content = content.replace('"{{BUILD_NUMBER}}"', f'"{build_number}"')
+                continue
 
-                # Write to output
-                with open(dest_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-
-                stats['json'] += 1
-                print(f"  ✓ {rel_path}")
-
-            elif source_file.suffix == '.js':
-                # Read JavaScript file
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Replace version placeholders
-                content = content.replace('{{FULL_VERSION}}', full_version)
-                content = content.replace('{{VERSION}}', version)
-                content = content.replace('{{BUILD_NUMBER}}', build_number)
-
-                # Write to output
-                with open(dest_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if dest_file in font_files:
+                stats['other'] += 1
+                continue
 
-                stats['js'] += 1
+            kind = deploy_file(source_file, dest_file, version, build_number)
+            stats[kind] += 1
+            if kind != 'other':
                 print(f"  ✓ {rel_path}")
 
-            else:
-                # Copy other files as-is
-                shutil.copy2(source_file, dest_file)
-                stats['other'] += 1
+    deploy_pages(pages, site_dir, output_path, version, build_number)
 
     print()
     print(f"Deployed {stats['html']} HTML files, {stats['js']} JS files, "
           f"{stats['json']} JSON files, {stats['other']} other files")
 
+    if optimize_files:
+        print_stats(optimize_files(images))
+
     # Write version to file for tracking
     version_file = output_path / '.version'
-    with open(version_file, 'w', encoding='utf-8') as f:
-        f.write(version)
+    write_text(version_file, version)
+    expected.add(version_file)
     print(f"  ✓ Version written to {version_file.name}")
 
+    # Remove files that are no longer part of the site
+    removed = 0
+    for path in sorted(output_path.rglob('*'), reverse=True):
+        if path.is_file() and path not in expected:
+            path.unlink()
+            removed += 1
+        elif path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+
+    written, unchanged = counts()
+    print(f"  ⓘ {written} file(s) written, {unchanged} unchanged, {removed} removed")
+
+    if budgets:
+        print()
+        if check_budgets(output_path):
+            print()
+            print("❌ Deployment exceeds the page-weight budgets (see tools/page-budgets.json)")
+            return 1
+
     print()
     print("✅ Deployment complete!")
     print()
@@ -160,6 +261,12 @@ def main():
     parser.add_argument('-v', '--version', help='Version number (default: read from current-version file)')
     parser.add_argument('-b', '--build-number', help='Build number (default: read from current-version file)')
     parser.add_argument('-o', '--output-dir', default='build/site', help='Output directory (default: build/site)')
+    parser.add_argument('--no-optimize-images', action='store_true', help='Copy images without recompressing them')
+    parser.add_argument('--no-budgets', action='store_true', help='Skip the page-weight budget check')
+    parser.add_argument('--no-inline', action='store_true',
+                        help='Deploy pages as they are, without inlined startup fetches or preload hints')
+    parser.add_argument('--no-subset-fonts', action='store_true',
+                        help='Deploy the OpenType fonts without WOFF2 subsets')
 
     args = parser.parse_args()
 
@@ -172,7 +279,8 @@ def main():
         version = args.version
         build_number = args.build_number
 
-    return deploy(version, build_number, args.output_dir)
+    return deploy(version, build_number, args.output_dir, not args.no_optimize_images, not args.no_budgets,
+                  not args.no_inline, not args.no_subset_fonts)
 
 if __name__ == '__main__':
     sys.exit(main())
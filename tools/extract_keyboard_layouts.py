@@ -7,6 +7,8 @@ This enables lazy loading of keyboard layouts for better analytics and performan
 import json
 from pathlib import Path
 
+from output_writer import report, write_json
+
 def split_keyboard_layouts(input_file, output_dir):
     """Split keyboard_layouts.json into separate files for each layout."""
 
@@ -24,14 +26,14 @@ def split_keyboard_layouts(input_file, output_dir):
     for layout_name, layout_data in all_layouts.items():
         output_file = output_dir / f'keyboard_layout_{layout_name}.json'
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(layout_data, f, ensure_ascii=False, indent=2)
+        write_json(output_file, layout_data)
 
         # Count keys (if it has a 'keys' property)
         key_count = len(layout_data.get('keys', {})) if isinstance(layout_data, dict) else 0
         print(f"  - {layout_name} → {output_file.name} ({key_count} keys)")
 
     print(f"\n✓ Split into {len(all_layouts)} files in {output_dir}")
+    report('')
 
 def main():
     script_dir = Path(__file__).parent
@@ -7,67 +7,20 @@ Corrections can include:
 - Fixing incorrect namer dots (common nouns should not have them)
 - Correcting any systematic transliteration errors
 - Applying custom preferences for specific words
+
+The matching engine lives in shavian_corrections.py so the generators can
+apply the same corrections in-process.
 """
 import sys
-import re
 from pathlib import Path
 
-def load_corrections(corrections_file):
-    """Load corrections from a comma-separated file."""
-    corrections = {}
-    if not corrections_file.exists():
-        return corrections
-
-    with open(corrections_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.rstrip('\n')
-            if not line.strip() or line.strip().startswith('#'):
-                continue
-            parts = line.split(',', 1)  # Split on first comma
-            if len(parts) == 2:
-                wrong, correct = parts[0].strip(), parts[1].strip()
-                corrections[wrong] = correct
-
-    return corrections
-
-def apply_corrections(text, corrections):
-    """Apply word-level corrections to text."""
-    if not corrections:
-        return text
-
-    # Create a regex pattern that matches whole words from the corrections dict
-    # Sort by length (longest first) to handle overlapping corrections properly
-    patterns = sorted(corrections.keys(), key=len, reverse=True)
-
-    if not patterns:
-        return text
-
-    # Build patterns with word boundaries
-    # Match only at word boundaries (whitespace, punctuation, start/end of string)
-    # Use lookahead/lookbehind to ensure we match complete tokens
-    escaped_patterns = []
-    for p in patterns:
-        # Match pattern only when:
-        # - preceded by whitespace, punctuation, or start of string
-        # - followed by whitespace, punctuation, or end of string
-        # This prevents matching partial words like matching 𐑼 inside 𐑐·𐑮𐑨𐑒𐑑𐑦𐑕
-        escaped_p = re.escape(p)
-        pattern_with_boundaries = f'(?:^|(?<=\\s)|(?<=[^\\w·𐑐-𐑿])){escaped_p}(?:$|(?=\\s)|(?=[^\\w·𐑐-𐑿]))'
-        escaped_patterns.append(pattern_with_boundaries)
-
-    pattern = '|'.join(escaped_patterns)
-
-    # Replace using the pattern
-    def replacer(match):
-        return corrections.get(match.group(0), match.group(0))
-
-    return re.sub(pattern, replacer, text)
+from shavian_corrections import load_corrections, apply_corrections, compile_corrections
 
 def main():
     script_dir = Path(__file__).parent
     corrections_file = script_dir / "shavian-corrections.txt"
     
-    corrections = load_corrections(corrections_file)
+    corrections = compile_corrections(load_corrections(corrections_file))
     
     # Read from stdin, apply corrections, write to stdout
     for line in sys.stdin:
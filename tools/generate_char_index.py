@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Generate the inverted character index for building custom lessons in the
+browser.
+
+For each dialect this writes char_index_<dialect>/:
+
+    words.json      the shared word table: the top TOP_WORDS words by
+                    frequency (a word's ID is its index) and the indexed chars
+    <hex>.json      one shard per character (e.g. 10450.json for 𐑐): the
+                    sorted IDs of the first POSTINGS_PER_CHAR words that
+                    contain it, delta-encoded
+
+Because IDs are frequency ranks, every posting list is sorted and its prefix
+holds the most useful words, so the client can intersect a few small arrays
+instead of downloading the corpus.
+
+No page builds custom lessons yet, so the index is written to
+build/char_index/ rather than site/, and neither the build nor deploy
+includes it.
+
+Usage:
+    python generate_char_index.py                  # readlex if available, else corpus
+    python generate_char_index.py --source corpus  # no readlex needed
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from generate_play_words import load_readlex_words
+from ngram_index import NgramIndex
+from output_writer import report, write_json
+from word_corpus import load_corpus_words
+
+TOP_WORDS = 10000
+POSTINGS_PER_CHAR = 2000
+INDEX_FORMAT = 1
+
+
+def shard_name(char):
+    return f'{ord(char):x}.json'
+
+
+def generate_char_index(words, output_dir, dialect='gb'):
+    """
+    Write the word table and per-character shards for one dialect.
+
+    Args:
+        words: (word, frequency) list
+        output_dir: Files go to output_dir/char_index_<dialect>/
+        dialect: 'gb' or 'us'
+    """
+    words = sorted(words, key=lambda x: x[1], reverse=True)[:TOP_WORDS]
+    index = NgramIndex(words, sizes=(1,))
+    table = index.tables[1]
+
+    index_dir = Path(output_dir) / f'char_index_{dialect}'
+
+    chars = []
+    total_bytes = 0
+    for row, char_id in enumerate(table.keys):
+        char = index.chars[int(char_id)]
+        postings = table.postings[table.offsets[row]:table.offsets[row + 1]][:POSTINGS_PER_CHAR]
+        deltas = np.diff(postings, prepend=0).tolist()
+
+        shard_file = index_dir / shard_name(char)
+        write_json(shard_file, deltas, indent=None, separators=(',', ':'))
+        total_bytes += shard_file.stat().st_size
+        chars.append(char)
+
+    words_file = index_dir / 'words.json'
+    write_json(words_file, {'format': INDEX_FORMAT, 'chars': ''.join(chars), 'words': index.words},
+               indent=None, separators=(',', ':'))
+    total_bytes += words_file.stat().st_size
+
+    # Drop shards of characters that are no longer indexed
+    expected = {shard_name(char) for char in chars} | {words_file.name}
+    for path in index_dir.glob('*.json'):
+        if path.name not in expected:
+            path.unlink()
+
+    print(f"  {len(index.words)} words, {len(chars)} character shards, "
+          f"{total_bytes:,} bytes → {index_dir.name}/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the client-side character index')
+    parser.add_argument('-s', '--source', choices=['auto', 'readlex', 'corpus'], default='auto',
+                        help='Word source (default: readlex if available, otherwise the frequency corpus)')
+    parser.add_argument('-o', '--output-dir', default='build/char_index',
+                        help='Output directory (default: build/char_index)')
+    args = parser.parse_args()
+
+    # Paths
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+    readlex_file = project_dir / 'readlex' / 'readlex.json'
+
+    source = args.source
+    if source == 'auto':
+        source = 'readlex' if readlex_file.exists() else 'corpus'
+
+    if source == 'readlex' and not readlex_file.exists():
+        print(f"Error: readlex.json not found at {readlex_file}")
+        print("Make sure the readlex submodule is initialized:")
+        print("  git submodule update --init --recursive")
+        print("Or use --source corpus to generate from the bundled frequency tables")
+        return 1
+
+    for dialect in ['gb', 'us']:
+        print(f"\nGenerating character index for {dialect.upper()} English:")
+        if source == 'corpus':
+            words = load_corpus_words(dialect)
+        else:
+            words = load_readlex_words(readlex_file, dialect)
+        generate_char_index(words, project_dir / args.output_dir, dialect)
+
+    print()
+    report('')
+    print("\n✅ Character index generation complete!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
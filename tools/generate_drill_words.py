@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Generate transition drill lessons for each keyboard layout.
+
+Where the learn-mode lessons are built around which characters a word uses,
+drills focus on the transitions between them: each lesson targets a few
+frequent bigrams (or trigrams) that are awkward on the layout - same-finger
+reaches, row jumps, shift changes - and lists the most frequent words that
+contain them and can be typed on the layout.
+
+The output, drill_words_<layout>_<dialect>.json, has the same shape as the
+learn_words files without the name and description keys, which come with
+the UI that shows drills: 'chars' is the set the words are typed with, here
+every character the layout can type, and 'ngrams' the drilled n-grams.
+
+No page reads drills yet, so they are written to build/drill_words/ rather
+than site/, and neither the build nor deploy includes them.
+
+Usage:
+    python generate_drill_words.py                  # readlex if available, else corpus
+    python generate_drill_words.py --source corpus  # no readlex needed
+    python verify_word_data.py -d build/drill_words # check the output
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from generate_play_words import load_readlex_words
+from keyboard_layout_loader import char_mask, load_layouts, mask_chars
+from ngram_index import NgramIndex
+from output_writer import report, write_json
+from word_corpus import load_corpus_words
+
+# Lessons per layout, n-grams drilled per lesson and words per lesson
+LESSONS = {2: 6, 3: 4}
+NGRAMS_PER_LESSON = 4
+WORDS_PER_LESSON = 100
+MIN_WORDS_PER_LESSON = 5
+
+# Only the most frequent n-grams are drill candidates
+CANDIDATES = {2: 200, 3: 400}
+
+ROW_INDEX = {'number': 0, 'qwerty': 1, 'home': 2, 'bottom': 3, 'space': 4}
+
+
+def typeable_mask(layout):
+    """Characters a layout can type, directly or as a ligature of typeable characters."""
+    mask = layout.mask
+    for ligature, sequences in layout.ligatures.items():
+        ligature_mask = char_mask(ligature)
+        if ligature_mask and all(layout.lookup(char) for char in sequences[0]):
+            mask |= ligature_mask
+    return mask
+
+
+def transition_difficulty(layout, ngram):
+    """
+    How awkward an n-gram is to type on a layout, or None if it has a
+    character without a key of its own or repeats a key.
+    """
+    positions = [layout.lookup(char) for char in ngram]
+    if not all(positions):
+        return None
+
+    difficulty = 1.0 + sum(position.shift for position in positions)
+    for a, b in zip(positions, positions[1:]):
+        if a.key == b.key:
+            return None
+        if a.finger == b.finger and a.hand == b.hand:
+            difficulty += 2
+        difficulty += abs(ROW_INDEX[a.row] - ROW_INDEX[b.row])
+    return difficulty
+
+
+def generate_drill_lessons(index, layout):
+    """Return the drill lessons for one layout in learn_words shape."""
+    allowed = typeable_mask(layout)
+    lessons = {}
+
+    for n, count in LESSONS.items():
+        # Rank the frequent n-grams by weight x difficulty
+        ranked = []
+        for ngram, weight in index.top(n, CANDIDATES[n], allowed_mask=allowed):
+            difficulty = transition_difficulty(layout, ngram)
+            if difficulty is not None:
+                ranked.append((weight * difficulty, ngram))
+        ranked.sort(key=lambda x: x[0], reverse=True)
+        drills = [ngram for _, ngram in ranked]
+
+        for i in range(count):
+            ngrams = drills[i * NGRAMS_PER_LESSON:(i + 1) * NGRAMS_PER_LESSON]
+            if not ngrams:
+                break
+            words = index.words_with_any(ngrams, WORDS_PER_LESSON, allowed_mask=allowed)
+            if len(words) < MIN_WORDS_PER_LESSON:
+                continue
+            lessons[str(len(lessons) + 1)] = {
+                'chars': mask_chars(allowed),
+                'ngrams': ngrams,
+                'words': words,
+            }
+
+    return lessons
+
+
+def generate_drill_words(words, output_dir, dialect='gb', layouts=None):
+    """
+    Generate drill_words_<layout>_<dialect>.json for every layout.
+
+    Args:
+        words: (word, frequency) list
+        output_dir: Directory to write the JSON files to
+        dialect: 'gb' or 'us'
+        layouts: Optional dict of compiled layouts (default: all layouts)
+    """
+    start = time.perf_counter()
+    index = NgramIndex(words)
+    print(f"  Indexed {len(index.words)} words in {time.perf_counter() - start:.2f}s "
+          f"({len(index.tables[2])} bigrams, {len(index.tables[3])} trigrams)")
+
+    for name, layout in (layouts or load_layouts()).items():
+        lessons = generate_drill_lessons(index, layout)
+        output_file = Path(output_dir) / f'drill_words_{name}_{dialect}.json'
+        write_json(output_file, lessons)
+        print(f"  {name}: {len(lessons)} drill lessons → {output_file.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate transition drill lessons')
+    parser.add_argument('-s', '--source', choices=['auto', 'readlex', 'corpus'], default='auto',
+                        help='Word source (default: readlex if available, otherwise the frequency corpus)')
+    parser.add_argument('-o', '--output-dir', default='build/drill_words',
+                        help='Output directory (default: build/drill_words)')
+    args = parser.parse_args()
+
+    # Paths
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+    readlex_file = project_dir / 'readlex' / 'readlex.json'
+
+    source = args.source
+    if source == 'auto':
+        source = 'readlex' if readlex_file.exists() else 'corpus'
+
+    if source == 'readlex' and not readlex_file.exists():
+        print(f"Error: readlex.json not found at {readlex_file}")
+        print("Make sure the readlex submodule is initialized:")
+        print("  git submodule update --init --recursive")
+        print("Or use --source corpus to generate from the bundled frequency tables")
+        return 1
+
+    for dialect in ['gb', 'us']:
+        print(f"\n{'='*60}")
+        print(f"Generating drill lessons for {dialect.upper()} English")
+        print(f"{'='*60}")
+
+        if source == 'corpus':
+            words = load_corpus_words(dialect)
+        else:
+            words = load_readlex_words(readlex_file, dialect)
+        generate_drill_words(words, project_dir / args.output_dir, dialect)
+
+    print()
+    report('')
+    print(f"\n{'='*60}")
+    print("✅ Drill lesson generation complete!")
+    print(f"{'='*60}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
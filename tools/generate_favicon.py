@@ -1,142 +1,217 @@
 #!/usr/bin/env python3
 """
 Generate favicon PNGs with Shavian text in Ormin font at multiple sizes.
+
+Each variant (white rounded tile, transparent for iOS auto-theming) is drawn
+directly at every output size, with a stroke width scaled to the size, and
+once per size however many files use it. The sizes are rendered in parallel
+worker processes. Nothing is rendered when the font, glyphs, sizes and drawing
+parameters hash to the same value as the previous run and all outputs exist.
+
+Usage:
+    python generate_favicon.py          # regenerate if inputs changed
+    python generate_favicon.py --force  # always regenerate
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import argparse
+import hashlib
+import io
+import json
 import os
-
-def generate_favicon_size(size, font_path, shaw_char='𐑖', tee_char='𐑑'):
-    """Generate a single favicon at the given size with nestled 𐑖 and 𐑑."""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+import PIL
+
+from output_writer import report, write_bytes
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SITE_DIR = PROJECT_DIR / 'site'
+FONT_PATH = SITE_DIR / 'fonts' / 'Ormin-Regular.otf'
+CACHE_FILE = PROJECT_DIR / '.cache' / 'favicon.json'
+
+# Bump when the drawing code changes in a way the parameters don't capture
+RENDER_VERSION = 2
+
+# Characters to render: '𐑖' (shaw) with nestled '𐑑' (tee)
+SHAW_CHAR = '𐑖'
+TEE_CHAR = '𐑑'
+
+# Mid-range blue has good contrast on both light and dark backgrounds
+TEXT_COLOR = (85, 95, 220)  # #555fdc
+BACKGROUND_COLOR = (255, 255, 255, 255)
+
+# Output file -> (variant, size, format)
+# 'tile' has a white rounded background; 'transparent' is for Apple touch
+# icons, where iOS adds its own background respecting the user's colour preference
+OUTPUTS = {
+    'favicon-64x64.png': ('tile', 64, 'PNG'),
+    'favicon-128x128.png': ('tile', 128, 'PNG'),
+    'favicon-180x180.png': ('tile', 180, 'PNG'),
+    'favicon-192x192.png': ('tile', 192, 'PNG'),
+    'favicon-512x512.png': ('tile', 512, 'PNG'),
+    'favicon.png': ('tile', 64, 'PNG'),
+    'favicon.ico': ('tile', 32, 'ICO'),
+    'apple-touch-icon-180x180.png': ('transparent', 180, 'PNG'),
+    'apple-touch-icon-192x192.png': ('transparent', 192, 'PNG'),
+}
+
+
+@lru_cache(maxsize=None)
+def load_font(font_path, font_size):
+    return ImageFont.truetype(str(font_path), font_size)
+
+
+def draw_favicon(size, font_path, background=True, shaw_char=SHAW_CHAR, tee_char=TEE_CHAR):
+    """Draw a favicon at the given size with nestled 𐑖 and 𐑑."""
     # Create transparent image
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-
-    # Draw rounded rectangle with white fill (no border)
     draw = ImageDraw.Draw(img)
-    corner_radius = size // 4  # 25% corner radius (more extreme than before which was 20%)
-
-    # Draw white rounded rectangle
-    draw.rounded_rectangle([(0, 0), (size-1, size-1)], radius=corner_radius,
-                          fill=(255, 255, 255, 255))
 
-    # Use blue text color
-    text_color = (85, 95, 220)  # #555fdc
+    if background:
+        # White rounded rectangle, 25% corner radius (no border)
+        draw.rounded_rectangle([(0, 0), (size-1, size-1)], radius=size // 4,
+                               fill=BACKGROUND_COLOR)
 
-    # Calculate font size - increased by 8% (98% of size)
-    font_size = int(size * 0.98)
-    font = ImageFont.truetype(font_path, font_size)
+    # Font size is 98% of the icon size
+    font = load_font(font_path, int(size * 0.98))
 
     # Get bounding boxes for both characters (same font size)
-    temp_draw = ImageDraw.Draw(img)
-
-    # Shaw character bounding box
-    shaw_bbox = temp_draw.textbbox((0, 0), shaw_char, font=font)
-    shaw_width = shaw_bbox[2] - shaw_bbox[0]
-    shaw_height = shaw_bbox[3] - shaw_bbox[1]
-
-    # Tee character bounding box (same font)
-    tee_bbox = temp_draw.textbbox((0, 0), tee_char, font=font)
-    tee_width = tee_bbox[2] - tee_bbox[0]
-    tee_height = tee_bbox[3] - tee_bbox[1]
-
-    # Position shaw to be slightly left of center at 12% from top
-    shaw_x = (size - shaw_width) // 2 - shaw_bbox[0] - int(tee_width * 0.3)
-    shaw_y = int(size * 0.12) - shaw_bbox[1]  # Position at 12% from top
-
-    # Position tee to nestle in shaw's curve, with baseline clear of bottom
-    tee_x = shaw_x + int(shaw_width * 0.75)  # Increased spacing (was 0.7)
-    # Position tee moved up to match shaw's upward nudge
-    tee_bottom_margin = int(size * 0.16)  # Increased from 8% to 16% to move up with shaw
-    tee_y = size - tee_bottom_margin - tee_bbox[3]
-
-    # Draw blue shaw and tee characters (same font size, with stroke for boldness)
-    draw = ImageDraw.Draw(img)
-    stroke_width = max(1, size // 40)  # Bold effect with stroke
-    draw.text((shaw_x, shaw_y), shaw_char, font=font, fill=text_color,
-              stroke_width=stroke_width, stroke_fill=text_color)
-    draw.text((tee_x, tee_y), tee_char, font=font, fill=text_color,
-              stroke_width=stroke_width, stroke_fill=text_color)
-
-    return img
-
-def generate_favicon_transparent(size, font_path, shaw_char='𐑖', tee_char='𐑑'):
-    """Generate a favicon with transparent background for iOS auto-theming."""
-    # Create transparent image
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-
-    # Calculate font size
-    font_size = int(size * 0.98)
-    font = ImageFont.truetype(font_path, font_size)
-
-    # Get bounding boxes for both characters
-    temp_draw = ImageDraw.Draw(img)
-
-    shaw_bbox = temp_draw.textbbox((0, 0), shaw_char, font=font)
+    shaw_bbox = draw.textbbox((0, 0), shaw_char, font=font)
     shaw_width = shaw_bbox[2] - shaw_bbox[0]
-    shaw_height = shaw_bbox[3] - shaw_bbox[1]
-
-    tee_bbox = temp_draw.textbbox((0, 0), tee_char, font=font)
+    tee_bbox = draw.textbbox((0, 0), tee_char, font=font)
     tee_width = tee_bbox[2] - tee_bbox[0]
-    tee_height = tee_bbox[3] - tee_bbox[1]
 
     # Position shaw slightly left of center at 12% from top
     shaw_x = (size - shaw_width) // 2 - shaw_bbox[0] - int(tee_width * 0.3)
     shaw_y = int(size * 0.12) - shaw_bbox[1]
 
-    # Position tee to nestle in shaw's curve
+    # Position tee to nestle in shaw's curve, with baseline 16% clear of bottom
     tee_x = shaw_x + int(shaw_width * 0.75)
-    tee_bottom_margin = int(size * 0.16)
-    tee_y = size - tee_bottom_margin - tee_bbox[3]
+    tee_y = size - int(size * 0.16) - tee_bbox[3]
 
-    # Draw blue characters on transparent background
-    # Mid-range blue has good contrast on both light and dark backgrounds
-    # iOS will add its own background respecting user's color preference
-    blue_color = (85, 95, 220)  # #555fdc - the border color from our main icon
-    draw = ImageDraw.Draw(img)
+    # Draw blue shaw and tee characters, with stroke for boldness
     stroke_width = max(1, size // 40)
-    draw.text((shaw_x, shaw_y), shaw_char, font=font, fill=blue_color,
-              stroke_width=stroke_width, stroke_fill=blue_color)
-    draw.text((tee_x, tee_y), tee_char, font=font, fill=blue_color,
-              stroke_width=stroke_width, stroke_fill=blue_color)
+    draw.text((shaw_x, shaw_y), shaw_char, font=font, fill=TEXT_COLOR,
+              stroke_width=stroke_width, stroke_fill=TEXT_COLOR)
+    draw.text((tee_x, tee_y), tee_char, font=font, fill=TEXT_COLOR,
+              stroke_width=stroke_width, stroke_fill=TEXT_COLOR)
 
     return img
 
-def generate_favicons():
-    # Load Ormin font
-    font_path = '../site/fonts/Ormin-Regular.otf'
-    if not os.path.exists(font_path):
+
+def generate_favicon_size(size, font_path=FONT_PATH, shaw_char=SHAW_CHAR, tee_char=TEE_CHAR):
+    """Generate a single favicon at the given size with nestled 𐑖 and 𐑑."""
+    return draw_favicon(size, font_path, True, shaw_char, tee_char)
+
+
+def generate_favicon_transparent(size, font_path=FONT_PATH, shaw_char=SHAW_CHAR, tee_char=TEE_CHAR):
+    """Generate a favicon with transparent background for iOS auto-theming."""
+    return draw_favicon(size, font_path, False, shaw_char, tee_char)
+
+
+def render_variant(variant, size, font_path):
+    """Render one (variant, size) icon; runs in a worker process."""
+    return draw_favicon(size, font_path, background=(variant == 'tile'))
+
+
+def render_all(keys, font_path, jobs=None):
+    """Render every (variant, size) in keys, in parallel when there are CPUs to spare."""
+    workers = min(len(keys), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        return {key: render_variant(*key, font_path) for key in keys}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {key: executor.submit(render_variant, *key, font_path) for key in keys}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def same_pixels(path, image):
+    """True if the file at path holds exactly this image."""
+    try:
+        with Image.open(path) as existing:
+            existing = existing.convert('RGBA')
+    except (OSError, ValueError):
+        return False
+    return existing.size == image.size and ImageChops.difference(existing, image).getbbox() is None
+
+
+def inputs_hash(font_path=FONT_PATH):
+    """Hash the font, glyphs and every parameter that affects the output."""
+    digest = hashlib.sha256()
+    with open(font_path, 'rb') as f:
+        digest.update(f.read())
+    params = {
+        'render_version': RENDER_VERSION,
+        'pillow': PIL.__version__,
+        'glyphs': [SHAW_CHAR, TEE_CHAR],
+        'colors': [TEXT_COLOR, BACKGROUND_COLOR],
+        'outputs': OUTPUTS,
+    }
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_cached_hash():
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('hash')
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_hash(value):
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = CACHE_FILE.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump({'hash': value}, f)
+    os.replace(temp_file, CACHE_FILE)
+
+
+def generate_favicons(output_dir=SITE_DIR, font_path=FONT_PATH, force=False, jobs=None):
+    if not font_path.exists():
         print(f"Error: Font not found at {font_path}")
-        return
-
-    # Characters to render: '𐑖' (shaw) with nestled '𐑑' (tee)
-
-    # Generate multiple sizes (64x64 and larger)
-    sizes = [64, 128, 180, 192, 512]
-
-    for size in sizes:
-        # Light mode version
-        img = generate_favicon_size(size, font_path)
-        output_path = f'../site/favicon-{size}x{size}.png'
-        img.save(output_path, 'PNG')
-        print(f"Generated {output_path}")
-
-    # Also generate default favicon.png (64x64) and favicon.ico (32x32)
-    img_64 = generate_favicon_size(64, font_path)
-    img_64.save('../site/favicon.png', 'PNG')
-    print(f"Generated ../site/favicon.png (64x64)")
-
-    img_32 = generate_favicon_size(32, font_path)
-    img_32.save('../site/favicon.ico', 'ICO')
-    print(f"Generated ../site/favicon.ico (32x32)")
-
-    # Generate transparent background versions for Apple touch icons
-    # iOS automatically applies a background respecting the user's color preference
-    apple_sizes = [180, 192]
-    for size in apple_sizes:
-        img_transparent = generate_favicon_transparent(size, font_path)
-        output_path = f'../site/apple-touch-icon-{size}x{size}.png'
-        img_transparent.save(output_path, 'PNG')
-        print(f"Generated {output_path} (transparent for iOS auto-theming)")
+        return 1
+
+    current_hash = inputs_hash(font_path)
+    outputs_exist = all((output_dir / name).exists() for name in OUTPUTS)
+    if not force and outputs_exist and load_cached_hash() == current_hash:
+        print("✅ Favicons are up to date")
+        return 0
+
+    # Small sizes are drawn at their own size: downsampling a large drawing
+    # would thicken and blur the strokes
+    keys = list(dict.fromkeys((variant, size) for variant, size, _ in OUTPUTS.values()))
+    images = render_all(keys, font_path, jobs)
+
+    for name, (variant, size, image_format) in OUTPUTS.items():
+        key = (variant, size)
+        output_path = output_dir / name
+        # Encoders differ between Pillow versions: keep files that already match
+        if same_pixels(output_path, images[key]):
+            print(f"Unchanged {output_path.name} ({size}x{size})")
+            continue
+        buffer = io.BytesIO()
+        images[key].save(buffer, image_format)
+        write_bytes(output_path, buffer.getvalue())
+        print(f"Generated {output_path.name} ({size}x{size})")
+
+    save_cached_hash(current_hash)
+    report('')
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate favicons and Apple touch icons')
+    parser.add_argument('-f', '--force', action='store_true',
+                        help='Regenerate even if the inputs are unchanged')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='Worker processes for rendering (default: CPU count)')
+    args = parser.parse_args()
+    return generate_favicons(force=args.force, jobs=args.jobs)
+
 
 if __name__ == '__main__':
-    generate_favicons()
+    exit(main())
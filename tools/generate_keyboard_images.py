@@ -3,15 +3,30 @@
 Generate keyboard layout images by taking screenshots of the virtual keyboard
 rendered in the actual game. This ensures the images match exactly how the
 keyboard appears in the app.
+
+Layouts are rendered concurrently, each in its own browser context, and every
+step waits for an explicit readiness signal (virtual keyboard loaded, fonts
+ready, labels rendered) instead of sleeping. A layout is skipped when its
+keyboard_layout_*.json, the keyboard HTML/CSS and the fonts hash the same as
+on the previous run.
+
+Usage:
+    python generate_keyboard_images.py              # only changed layouts
+    python generate_keyboard_images.py --force      # re-render everything
+    python generate_keyboard_images.py qwerty jafl  # specific layouts
 """
 
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
-import os
+import functools
+import hashlib
 import http.server
-import socketserver
+import json
+import os
 import threading
-import time
+from pathlib import Path
+
+from output_writer import report, write_bytes
 
 # Keyboard layouts to generate
 LAYOUTS = [
@@ -22,20 +37,46 @@ LAYOUTS = [
     'jafl'
 ]
 
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SITE_DIR = PROJECT_DIR / 'site'
+OUTPUT_DIR = SITE_DIR / 'keyboard_images'
+CACHE_FILE = PROJECT_DIR / '.cache' / 'keyboard_images.json'
+
+# Files every layout's rendering depends on
+SHARED_INPUTS = [
+    SITE_DIR / 'virtual-keyboard.html',
+    SITE_DIR / 'virtual-keyboard.css',
+    SITE_DIR / 'virtual-keyboard.js',
+    SITE_DIR / 'style.css',
+]
+
+# Disable transitions so screenshots never catch a legend mid-animation
+NO_TRANSITIONS_CSS = '*, *::before, *::after { transition: none !important; animation: none !important; }'
+
+# True once the home-row 'a' key shows this layout's legend for the shift state
+LABELS_RENDERED_JS = '''([layout, shift]) => {
+    if (typeof KEYBOARD_MAPS === 'undefined' || !KEYBOARD_MAPS[layout]) return false;
+    if (currentLayout !== layout || isShiftActive !== shift) return false;
+    const keys = KEYBOARD_MAPS[layout].keys;
+    const legend = document.querySelector('#virtualKeyboard .key[data-key="a"] .key-main');
+    return !!legend && legend.textContent === ((shift ? keys['A'] : keys['a']) || '');
+}'''
+
+
 def start_server(port, directory):
-    """Start a simple HTTP server in a background thread."""
+    """Start a simple threaded HTTP server in a background thread."""
     class QuietHandler(http.server.SimpleHTTPRequestHandler):
         def log_message(self, format, *args):
             pass  # Suppress server logs
 
-    os.chdir(directory)
-    handler = QuietHandler
+    handler = functools.partial(QuietHandler, directory=str(directory))
 
     # Try to find an available port
     max_attempts = 10
     for attempt in range(max_attempts):
         try:
-            httpd = socketserver.TCPServer(("", port + attempt), handler)
+            httpd = http.server.ThreadingHTTPServer(("", port + attempt), handler)
             actual_port = port + attempt
             if attempt > 0:
                 print(f"  Port {port} in use, using port {actual_port} instead")
@@ -52,143 +93,179 @@ def start_server(port, directory):
 
     raise OSError(f"Could not find available port starting from {port}")
 
-async def generate_keyboard_screenshots(server_port=8765):
-    """Generate screenshots for all keyboard layouts and shift states."""
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_dir = os.path.dirname(script_dir)
-    site_dir = os.path.join(project_dir, 'site')
+def layout_input_hash(layout):
+    """Hash everything that affects how a layout's images look."""
+    digest = hashlib.sha256()
+    fonts = sorted((SITE_DIR / 'fonts').glob('*'))
+    for path in [SITE_DIR / f'keyboard_layout_{layout}.json'] + SHARED_INPUTS + fonts:
+        digest.update(path.name.encode())
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_cache():
+    if CACHE_FILE.exists():
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            pass
+    return {}
+
+
+def save_cache(cache):
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = CACHE_FILE.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(temp_file, CACHE_FILE)
+
+
+async def wait_for_paint(page):
+    """Resolve after fonts are ready and two animation frames have been painted."""
+    await page.evaluate('''() => document.fonts.ready.then(() => new Promise(resolve =>
+        requestAnimationFrame(() => requestAnimationFrame(() => resolve(true)))))''')
+
+
+async def render_layout(browser, base_url, layout):
+    """Render one layout's base and shift images in a fresh browser context."""
+    context = await browser.new_context()
+    try:
+        # Start with this layout selected and the splash already dismissed
+        await context.add_init_script(
+            f"localStorage.setItem('keyboardLayout', {json.dumps(layout)});"
+        )
+        page = await context.new_page()
+        await page.goto(f'{base_url}/index.html', wait_until='load')
+        await page.add_style_tag(content=NO_TRANSITIONS_CSS)
+
+        # Ready when init() has injected the virtual keyboard
+        await page.wait_for_function(
+            "() => typeof updateVirtualKeyboardLabels === 'function' && !!document.getElementById('virtualKeyboard')"
+        )
+
+        await page.evaluate('''async (layout) => {
+            const splashModal = document.getElementById('splashModal');
+            if (splashModal) {
+                splashModal.classList.remove('show');
+                splashModal.style.display = 'none';
+            }
+            currentLayout = layout;
+            await getKeyboardLayout(layout);
+            isShiftActive = false;
+            showVirtualKeyboard();
+            updateVirtualKeyboardLabels();
+        }''', layout)
+        await page.wait_for_function(LABELS_RENDERED_JS, arg=[layout, False])
+        await wait_for_paint(page)
+
+        keyboard = await page.wait_for_selector('#virtualKeyboard .keyboard-body', state='visible')
+
+        # Take base layer screenshot
+        write_bytes(OUTPUT_DIR / f'{layout}_base.png', await keyboard.screenshot())
+        saved = [f'{layout}_base.png']
+
+        # Activate shift and wait for the shifted labels
+        await page.evaluate('() => toggleShift()')
+        await page.wait_for_function(LABELS_RENDERED_JS, arg=[layout, True])
+
+        # Check if this layout has a shift layer (non-empty shift characters)
+        has_shift_layer = await page.evaluate('''() => {
+            const keys = document.querySelectorAll('.key[data-shavian]');
+            return keys.length > 0;
+        }''')
+
+        if has_shift_layer:
+            await wait_for_paint(page)
+            write_bytes(OUTPUT_DIR / f'{layout}_shift.png', await keyboard.screenshot())
+            saved.append(f'{layout}_shift.png')
+
+        return saved
+    finally:
+        await context.close()
+
+
+async def generate_keyboard_screenshots(layouts=LAYOUTS, force=False, server_port=8765):
+    """Generate screenshots for the given keyboard layouts and shift states."""
+    from playwright.async_api import async_playwright
+
+    cache = load_cache()
+    hashes = {layout: layout_input_hash(layout) for layout in layouts}
+
+    pending = []
+    for layout in layouts:
+        outputs_exist = (OUTPUT_DIR / f'{layout}_base.png').exists()
+        if not force and outputs_exist and cache.get(layout) == hashes[layout]:
+            print(f"  ⓘ {layout} unchanged, skipping")
+        else:
+            pending.append(layout)
+
+    if not pending:
+        print("\n✅ All keyboard images are up to date")
+        return
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Start local web server
     print(f"Starting local web server on port {server_port}...")
-    server, actual_port = start_server(server_port, site_dir)
-    time.sleep(1)  # Give server time to start
+    server, actual_port = start_server(server_port, SITE_DIR)
+    base_url = f'http://localhost:{actual_port}'
 
     try:
         async with async_playwright() as p:
-            # Launch browser
             browser = await p.chromium.launch()
-            page = await browser.new_page()
-
-            # Load the local site via HTTP server
-            await page.goto(f'http://localhost:{actual_port}/index.html')
-
-            # Wait for page to load
-            await page.wait_for_load_state('networkidle')
-            await asyncio.sleep(2)  # Extra time for fonts to load
-
-            # Close splash screen if it's showing by directly manipulating the DOM
-            await page.evaluate('''() => {
-                const splashModal = document.getElementById('splashModal');
-                if (splashModal) {
-                    splashModal.classList.remove('show');
-                    splashModal.style.display = 'none';
-                }
-            }''')
-            await asyncio.sleep(0.5)
-
-            # Start play mode to activate the game
-            await page.click('#homePlayBtn')
-
-            # Wait for countdown/game to start
-            await asyncio.sleep(4)
-
-            # Show virtual keyboard using JavaScript
-            await page.evaluate('''() => {
-                showVirtualKeyboard();
-                updateVirtualKeyboardLabels();
-            }''')
-
-            # Wait for keyboard to appear
-            await page.wait_for_selector('#virtualKeyboard', state='visible')
-            await asyncio.sleep(0.5)
-
-            # Get the keyboard element
-            keyboard = await page.query_selector('#virtualKeyboard .keyboard-body')
-
-            if not keyboard:
-                print("Error: Could not find keyboard element")
+            try:
+                print(f"Generating screenshots for {', '.join(pending)}...")
+                results = await asyncio.gather(
+                    *(render_layout(browser, base_url, layout) for layout in pending),
+                    return_exceptions=True
+                )
+            finally:
                 await browser.close()
-                return
-
-            # Ensure output directory exists
-            output_dir = os.path.join(project_dir, 'site', 'keyboard_images')
-            os.makedirs(output_dir, exist_ok=True)
-
-            # Generate screenshots for each layout
-            for layout in LAYOUTS:
-                print(f"Generating screenshots for {layout}...")
-
-                # Change layout using JavaScript - update currentLayout and refresh keyboard
-                result = await page.evaluate(f'''() => {{
-                    // Update the currentLayout variable directly (not window.currentLayout)
-                    currentLayout = '{layout}';
-                    localStorage.setItem('currentLayout', '{layout}');
-
-                    // Call updateVirtualKeyboardLabels to refresh with the new layout
-                    if (typeof updateVirtualKeyboardLabels === 'function') {{
-                        updateVirtualKeyboardLabels();
-                    }}
-
-                    return '{layout}';
-                }}''')
-                print(f"  Layout set to: {result}")
-                await asyncio.sleep(0.3)
-
-                # Ensure shift is not active
-                is_shift_active = await page.evaluate('''() => {
-                    return window.isShiftActive || false;
-                }''')
-
-                if is_shift_active:
-                    # Click shift to deactivate
-                    await page.click('.key[data-key="Shift"]')
-                    await asyncio.sleep(0.2)
-
-                # Take base layer screenshot
-                output_path = os.path.join(output_dir, f'{layout}_base.png')
-                await keyboard.screenshot(path=output_path)
-                print(f"  ✓ Saved {layout}_base.png")
-
-                # Activate shift and update keyboard labels
-                await page.evaluate(f'''() => {{
-                    // Call toggleShift to activate shift mode
-                    if (typeof toggleShift === 'function') {{
-                        toggleShift();
-                    }}
-                }}''')
-                await asyncio.sleep(0.3)
-
-                # Check if this layout has a shift layer (non-empty shift characters)
-                has_shift_layer = await page.evaluate('''() => {
-                    const keys = document.querySelectorAll('.key[data-shavian]');
-                    return keys.length > 0;
-                }''')
-
-                if has_shift_layer:
-                    # Take shift layer screenshot
-                    output_path = os.path.join(output_dir, f'{layout}_shift.png')
-                    await keyboard.screenshot(path=output_path)
-                    print(f"  ✓ Saved {layout}_shift.png")
-
-                    # Deactivate shift for next layout
-                    await page.click('.key[data-key="Shift"]')
-                    await asyncio.sleep(0.2)
-                else:
-                    print(f"  ⓘ No shift layer for {layout}")
-                    # Deactivate shift
-                    await page.click('.key[data-key="Shift"]')
-                    await asyncio.sleep(0.2)
-
-            await browser.close()
-            print("\n✅ All keyboard images generated successfully!")
     finally:
         # Shut down the server
         server.shutdown()
 
+    failed = []
+    for layout, result in zip(pending, results):
+        if isinstance(result, Exception):
+            print(f"  ✗ {layout}: {result}")
+            failed.append(layout)
+            continue
+        for filename in result:
+            print(f"  ✓ Saved {filename}")
+        if len(result) == 1:
+            print(f"  ⓘ No shift layer for {layout}")
+        cache[layout] = hashes[layout]
+
+    save_cache(cache)
+    report()
+
+    if failed:
+        print(f"\n❌ Failed to generate images for: {', '.join(failed)}")
+        return 1
+
+    print("\n✅ All keyboard images generated successfully!")
+    return 0
+
+
 def main():
     """Main entry point."""
-    asyncio.run(generate_keyboard_screenshots())
+    parser = argparse.ArgumentParser(description='Generate keyboard layout screenshots')
+    parser.add_argument('layouts', nargs='*', metavar='layout',
+                        help=f"Layouts to render (default: all of {', '.join(LAYOUTS)})")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help='Re-render layouts even if their inputs are unchanged')
+    args = parser.parse_args()
+
+    unknown = [layout for layout in args.layouts if layout not in LAYOUTS]
+    if unknown:
+        parser.error(f"unknown layout(s): {', '.join(unknown)}")
+
+    return asyncio.run(generate_keyboard_screenshots(args.layouts or LAYOUTS, args.force)) or 0
+
 
 if __name__ == '__main__':
-    main()
+    exit(main())
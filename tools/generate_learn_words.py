@@ -2,11 +2,18 @@
 """
 Generate word lists for Learn mode based on Shavian keyboard layouts.
 Progressive levels based on finger travel distance from home row.
+
+Words come from readlex.json, or from the compiled word-frequency corpus
+(word_corpus.py) when readlex is not checked out:
+    python generate_learn_words.py --source corpus
 """
 
-import json
+import argparse
 from pathlib import Path
+from generate_play_words import load_readlex_words
 from keyboard_layout_loader import get_layout_for_learn_mode, LIGATURES, load_keyboard_layouts
+from output_writer import report, write_json
+from word_corpus import load_corpus_words
 
 # Define progressive levels for Shaw Imperial
 LEARN_LEVELS_IMPERIAL = {
@@ -235,60 +242,6 @@ def is_shavian_only_with_namer_dot(word):
     return True
 
 
-def load_readlex_words(readlex_file, dialect='gb'):
-    """
-    Load words from readlex.json and select appropriate variant.
-    
-    Args:
-        readlex_file: Path to readlex.json
-        dialect: 'gb' for British (RRP), 'us' for American (GenAm preferred)
-    
-    Returns:
-        List of (shavian_word, frequency) tuples
-    """
-    with open(readlex_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    words = []
-    variant_pref = 'GenAm' if dialect == 'us' else 'RRP'
-    
-    for key, entries in data.items():
-        # Select the appropriate variant
-        selected_entry = None
-        
-        # First, try to find preferred variant
-        for entry in entries:
-            if entry.get('var') == variant_pref:
-                selected_entry = entry
-                break
-        
-        # If no preferred variant found, use RRP
-        if selected_entry is None:
-            for entry in entries:
-                if entry.get('var') == 'RRP':
-                    selected_entry = entry
-                    break
-        
-        # Fallback to first entry if nothing else matches
-        if selected_entry is None and len(entries) > 0:
-            selected_entry = entries[0]
-        
-        if selected_entry:
-            shaw_word = selected_entry.get('Shaw', '')
-            freq = selected_entry.get('freq', 0)
-            pos = selected_entry.get('pos', '')
-            
-            # Add namer dot for proper nouns (NP0, NP0+...)
-            if pos.startswith('NP0') and shaw_word and not shaw_word.startswith('·'):
-                shaw_word = '·' + shaw_word
-            
-            # Only include if it's purely Shavian (namer dot U+00B7 is allowed)
-            if shaw_word and is_shavian_only_with_namer_dot(shaw_word):
-                words.append((shaw_word, freq))
-    
-    return words
-
-
 def expand_ligatures(word):
     """
     Expand ligatures in a word to their component characters.
@@ -335,7 +288,7 @@ def get_new_chars_for_level(level_num, learn_levels):
     return current_chars - prev_chars
 
 
-def generate_learn_word_lists(readlex_file, learn_levels, output_file, layout_name, use_ligatures=True, dialect='gb', all_chars=''):
+def generate_learn_word_lists(readlex_file, learn_levels, output_file, layout_name, use_ligatures=True, dialect='gb', all_chars='', words=None):
     """
     Generate word lists for each learning level for a specific layout.
     Words are selected to:
@@ -344,12 +297,16 @@ def generate_learn_word_lists(readlex_file, learn_levels, output_file, layout_na
     - Remain high-frequency and useful
 
     A compound letter lesson is automatically inserted at third-from-last position.
+
+    If words (a list of (word, frequency) tuples) is given, it is used instead
+    of loading readlex_file.
     """
     # Load all words with frequency info from readlex
-    all_words = load_readlex_words(readlex_file, dialect)
+    source = 'readlex' if words is None else 'corpus'
+    all_words = load_readlex_words(readlex_file, dialect) if words is None else words
 
     print(f"\n{layout_name} Layout ({dialect.upper()}):")
-    print(f"Loaded {len(all_words)} words from readlex")
+    print(f"Loaded {len(all_words)} words from {source}")
     if use_ligatures:
         print(f"  Using ligature expansion")
     else:
@@ -446,13 +403,17 @@ def generate_learn_word_lists(readlex_file, learn_levels, output_file, layout_na
             print(f"  Compound Letters: SKIPPED - only {len(ligature_words)} words available")
 
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(learn_words, f, ensure_ascii=False, indent=2)
+    write_json(output_file, learn_words)
 
     print(f"  Saved to {output_file}")
 
 
-if __name__ == '__main__':
+def main():
+    parser = argparse.ArgumentParser(description='Generate Learn mode word lists')
+    parser.add_argument('-s', '--source', choices=['auto', 'readlex', 'corpus'], default='auto',
+                        help='Word source (default: readlex if available, otherwise the frequency corpus)')
+    args = parser.parse_args()
+
     # Load keyboard layouts from JSON
     keyboard_layouts = load_keyboard_layouts()
 
@@ -500,16 +461,21 @@ if __name__ == '__main__':
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
     readlex_file = project_dir / 'readlex' / 'readlex.json'
-    
-    if not readlex_file.exists():
+
+    source = args.source
+    if source == 'auto':
+        source = 'readlex' if readlex_file.exists() else 'corpus'
+
+    if source == 'readlex' and not readlex_file.exists():
         print(f"Error: readlex.json not found at {readlex_file}")
         print("Make sure the readlex submodule is initialized:")
         print("  git submodule update --init --recursive")
-        exit(1)
+        print("Or use --source corpus to generate from the bundled frequency tables")
+        return 1
 
     # Generate for both GB and US dialects
     for dialect in ['gb', 'us']:
-
+        words = load_corpus_words(dialect) if source == 'corpus' else None
 
         print(f"\n{'='*60}")
         print(f"Generating word lists for {dialect.upper()} English")
@@ -523,7 +489,8 @@ if __name__ == '__main__':
             'Shaw Imperial',
             use_ligatures=True,
             dialect=dialect,
-            all_chars=all_imperial_chars
+            all_chars=all_imperial_chars,
+            words=words
         )
 
         # Generate for Shaw Imperial (without ligatures)
@@ -534,7 +501,8 @@ if __name__ == '__main__':
             'Shaw Imperial (No Ligatures)',
             use_ligatures=False,
             dialect=dialect,
-            all_chars=all_imperial_chars
+            all_chars=all_imperial_chars,
+            words=words
         )
 
         # Generate for Imperial Good Companion (with ligatures)
@@ -545,7 +513,8 @@ if __name__ == '__main__':
             'Imperial Good Companion',
             use_ligatures=True,
             dialect=dialect,
-            all_chars=all_new_imperial_chars
+            all_chars=all_new_imperial_chars,
+            words=words
         )
 
         # Generate for Imperial Good Companion (without ligatures)
@@ -556,7 +525,8 @@ if __name__ == '__main__':
             'Imperial Good Companion (No Ligatures)',
             use_ligatures=False,
             dialect=dialect,
-            all_chars=all_new_imperial_chars
+            all_chars=all_new_imperial_chars,
+            words=words
         )
 
         # Generate for Shaw QWERTY (no ligatures)
@@ -567,7 +537,8 @@ if __name__ == '__main__':
             'Shaw QWERTY',
             use_ligatures=False,
             dialect=dialect,
-            all_chars=all_qwerty_chars
+            all_chars=all_qwerty_chars,
+            words=words
         )
 
         # Generate for Shaw 2-layer (no ligature support - ligatures are direct keys)
@@ -578,7 +549,8 @@ if __name__ == '__main__':
             'Shaw 2-layer (shift)',
             use_ligatures=False,
             dialect=dialect,
-            all_chars=all_2layer_chars
+            all_chars=all_2layer_chars,
+            words=words
         )
 
         # Generate for Shaw-JAFL (with ligatures)
@@ -589,7 +561,8 @@ if __name__ == '__main__':
             'Shaw-JAFL',
             use_ligatures=True,
             dialect=dialect,
-            all_chars=all_jafl_chars
+            all_chars=all_jafl_chars,
+            words=words
         )
 
         # Generate for Shaw-JAFL (without ligatures)
@@ -600,5 +573,14 @@ if __name__ == '__main__':
             'Shaw-JAFL (No Ligatures)',
             use_ligatures=False,
             dialect=dialect,
-            all_chars=all_jafl_chars
+            all_chars=all_jafl_chars,
+            words=words
         )
+
+    print()
+    report('')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -1,12 +1,33 @@
 #!/usr/bin/env python3
 """
 Generate word lists for Play mode organized by word length.
-Uses readlex.json as the source of truth for Shavian spellings.
+Uses readlex.json as the source of truth for Shavian spellings, or the
+compiled word-frequency corpus (word_corpus.py) when readlex is not checked out.
+
+Alongside words_<dialect>.json, play_words_<layout>_<dialect>.json splits each
+length bucket into easy/medium/hard tiers by typing effort on that layout
+(see typing_effort.py). Play mode draws its early levels from the easy tier.
+
+Usage:
+    python generate_play_words.py                  # readlex if available, else corpus
+    python generate_play_words.py --source corpus  # no readlex needed
+    python generate_play_words.py --only tiers     # tiers from the existing word lists
 """
 
+import argparse
 import json
+from functools import lru_cache
 from pathlib import Path
 
+from output_writer import report, write_json
+from word_corpus import load_corpus_words
+
+# Top N words by frequency for each length (1-10 characters)
+MAX_WORD_LENGTH = 10
+MAX_WORDS_PER_LENGTH = 200
+
+EFFORT_TIERS = ['easy', 'medium', 'hard']
+
 
 def is_shavian_only(word):
     """
@@ -34,10 +55,19 @@ def is_shavian_only_with_namer_dot(word):
     return True
 
 
+@lru_cache(maxsize=1)
+def _read_readlex(readlex_file, mtime_ns):
+    with open(readlex_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def load_readlex_words(readlex_file, dialect='gb'):
     """
     Load words from readlex.json and select appropriate variant.
 
+    Results are cached per file version, so generators run in one process
+    (see shawtype.py) parse readlex.json once.
+
     Args:
         readlex_file: Path to readlex.json
         dialect: 'gb' for British (RRP), 'us' for American (GenAm preferred)
@@ -45,8 +75,13 @@ def load_readlex_words(readlex_file, dialect='gb'):
     Returns:
         List of (shavian_word, frequency) tuples
     """
-    with open(readlex_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    mtime_ns = Path(readlex_file).stat().st_mtime_ns
+    return list(_select_readlex_words(str(readlex_file), mtime_ns, dialect))
+
+
+@lru_cache(maxsize=None)
+def _select_readlex_words(readlex_file, mtime_ns, dialect):
+    data = _read_readlex(readlex_file, mtime_ns)
 
     words = []
     variant_pref = 'GenAm' if dialect == 'us' else 'RRP'
@@ -85,10 +120,10 @@ def load_readlex_words(readlex_file, dialect='gb'):
             if shaw_word and is_shavian_only_with_namer_dot(shaw_word):
                 words.append((shaw_word, freq))
 
-    return words
+    return tuple(words)
 
 
-def generate_play_words(readlex_file, output_file, dialect='gb'):
+def generate_play_words(readlex_file, output_file, dialect='gb', words=None):
     """
     Generate words organized by length for play mode.
 
@@ -96,11 +131,18 @@ def generate_play_words(readlex_file, output_file, dialect='gb'):
         readlex_file: Path to readlex.json
         output_file: Path to output JSON file
         dialect: 'gb' or 'us'
+        words: Optional pre-loaded (word, frequency) list, e.g. from load_corpus_words()
+
+    Returns:
+        The (word, frequency) list sorted by frequency (descending)
     """
-    words = load_readlex_words(readlex_file, dialect)
+    source = 'readlex' if words is None else 'corpus'
+    if words is None:
+        words = load_readlex_words(readlex_file, dialect)
+    words = list(words)
 
     print(f"\nGenerating play words for {dialect.upper()} English:")
-    print(f"  Loaded {len(words)} words from readlex")
+    print(f"  Loaded {len(words)} words from {source}")
 
     # Sort by frequency (descending)
     words.sort(key=lambda x: x[1], reverse=True)
@@ -113,10 +155,7 @@ def generate_play_words(readlex_file, output_file, dialect='gb'):
             words_by_length[length] = []
         words_by_length[length].append(shaw_word)
 
-    # Create output structure with top words for each length (1-10 characters)
-    MAX_WORD_LENGTH = 10
-    MAX_WORDS_PER_LENGTH = 200
-
+    # Create output structure with top words for each length
     output = {}
     for length in range(1, MAX_WORD_LENGTH + 1):
         if length in words_by_length:
@@ -128,23 +167,81 @@ def generate_play_words(readlex_file, output_file, dialect='gb'):
             print(f"  Length {length}: 0 words")
 
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_json(output_file, output)
 
     print(f"  Saved to {output_file}")
 
+    return words
+
+
+def generate_effort_tiers(words_file, output_dir, dialect='gb', layouts=None):
+    """
+    Generate effort-tiered play words for each keyboard layout.
+
+    Every length bucket of words_file is split into EFFORT_TIERS by typing
+    effort on the layout; each tier keeps frequency order. Words the layout
+    can't type are left out.
+
+    Args:
+        words_file: Path to words_<dialect>.json (length -> words by frequency)
+        output_dir: Directory for play_words_<layout>_<dialect>.json
+        dialect: 'gb' or 'us'
+        layouts: Optional dict of compiled layouts (default: all layouts)
+    """
+    import numpy as np
+    from keyboard_layout_loader import load_layouts
+    from typing_effort import EffortModel
+
+    with open(words_file, 'r', encoding='utf-8') as f:
+        buckets = json.load(f)
+    model = EffortModel([word for bucket in buckets.values() for word in bucket])
+    # Index of each bucket's first word in the model
+    starts = np.cumsum([0] + [len(bucket) for bucket in buckets.values()])
+    layouts = layouts or load_layouts()
+
+    print(f"\nGenerating effort tiers for {dialect.upper()} English:")
+    for name, layout in layouts.items():
+        effort = model.score(layout)
+
+        output = {}
+        for length, start, end in zip(buckets, starts, starts[1:]):
+            selected = start + np.flatnonzero(np.isfinite(effort[start:end]))
+            by_effort = selected[np.argsort(effort[selected], kind='stable')]
+            output[length] = {
+                tier: [model.words[i] for i in np.sort(indices)]
+                for tier, indices in zip(EFFORT_TIERS, np.array_split(by_effort, len(EFFORT_TIERS)))
+            }
+
+        output_file = Path(output_dir) / f'play_words_{name}_{dialect}.json'
+        write_json(output_file, output)
+
+        typeable = int(np.isfinite(effort).sum())
+        print(f"  {name}: {typeable} of {len(model.words)} words typeable → {output_file.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Play mode word lists')
+    parser.add_argument('-s', '--source', choices=['auto', 'readlex', 'corpus'], default='auto',
+                        help='Word source (default: readlex if available, otherwise the frequency corpus)')
+    parser.add_argument('--only', choices=['words', 'tiers'],
+                        help='Only write the word lists, or only the effort tiers (from the existing word lists)')
+    args = parser.parse_args()
 
-if __name__ == '__main__':
     # Paths
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
     readlex_file = project_dir / 'readlex' / 'readlex.json'
 
-    if not readlex_file.exists():
+    source = args.source
+    if source == 'auto':
+        source = 'readlex' if readlex_file.exists() else 'corpus'
+
+    if source == 'readlex' and not readlex_file.exists() and args.only != 'tiers':
         print(f"Error: readlex.json not found at {readlex_file}")
         print("Make sure the readlex submodule is initialized:")
         print("  git submodule update --init --recursive")
-        exit(1)
+        print("Or use --source corpus to generate from the bundled frequency tables")
+        return 1
 
     # Generate for both GB and US dialects
     for dialect in ['gb', 'us']:
@@ -154,8 +251,23 @@ if __name__ == '__main__':
         print(f"Generating play mode words for {dialect.upper()} English")
         print(f"{'='*60}")
 
-        generate_play_words(readlex_file, output_file, dialect)
+        if args.only != 'tiers':
+            words = load_corpus_words(dialect) if source == 'corpus' else None
+            generate_play_words(readlex_file, output_file, dialect, words=words)
+
+        if args.only != 'words':
+            try:
+                generate_effort_tiers(output_file, project_dir / 'site', dialect)
+            except ImportError:
+                print("  ⓘ NumPy not installed, skipping effort tiers (pip install numpy)")
 
+    print()
+    report('')
     print(f"\n{'='*60}")
     print("✅ Play word generation complete!")
     print(f"{'='*60}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -2,18 +2,31 @@
 """
 Generate Shavian transliterations from Latin source files.
 Uses the 'shave' tool with custom dictionary to create British and American variants.
+Shave runs as a pool of long-lived processes (see shave_pool.py), so all files
+and both dialects are transliterated concurrently.
 
-By default, only processes files with uncommitted changes.
-Use -a/--all to process all files.
+Results are cached per CSV value and HTML segment (see translation_cache.py),
+so only new or changed text goes through shave; every output is reassembled
+from the cache on each run. HTML pages are split into segments first (text
+runs with their inline tags, and alt/title/aria-label/placeholder values),
+so the rest of the markup never goes through the transliterator.
+
+Use -b native to transliterate in-process with native_transliterator.py
+instead of the external shave tool. Use -a/--all to ignore the cache.
 """
 
 import argparse
 import csv
-import json
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from html_segments import segment_html, splice_segments
+from native_transliterator import NativePool, native_version, READLEX_FILE
+from output_writer import report, write_json, write_text
+from shave_pool import ShavePool, CORRECTIONS_FILE
+from translation_cache import TranslationCache, file_hash
+
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_DIR = SCRIPT_DIR.parent
 CONTENT_DIR = PROJECT_DIR / "content"
@@ -22,43 +35,6 @@ DICT_FILE_BRITISH = SCRIPT_DIR / "shaw-type-british.dict"
 DICT_FILE_AMERICAN = SCRIPT_DIR / "shaw-type-american.dict"
 
 
-def get_changed_files():
-    """
-    Get list of files with uncommitted changes (staged or unstaged).
-    Returns set of absolute Path objects.
-    """
-    try:
-        # Get unstaged changes
-        unstaged = subprocess.run(
-            ["git", "diff", "--name-only"],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=PROJECT_DIR
-        )
-
-        # Get staged changes
-        staged = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=PROJECT_DIR
-        )
-
-        # Combine and convert to absolute paths
-        changed = set()
-        for line in (unstaged.stdout + staged.stdout).splitlines():
-            if line.strip():
-                changed.add((PROJECT_DIR / line.strip()).resolve())
-
-        return changed
-    except subprocess.CalledProcessError:
-        # If git command fails, return empty set (will process nothing by default)
-        print("Warning: Could not check git status. Use -a/--all to process all files.")
-        return set()
-
-
 def check_dependencies():
     """Check if required tools are installed."""
     # Check for shave - try the ~/bin location first since that's where it usually is
@@ -77,37 +53,7 @@ def check_dependencies():
     sys.exit(1)
 
 
-def transliterate_text(text, dialect, shave_cmd):
-    """
-    Transliterate text using the shave tool.
-
-    Args:
-        text: The text to transliterate
-        dialect: 'british' or 'american'
-        shave_cmd: Path to shave executable
-
-    Returns:
-        The transliterated text
-    """
-    flag = "--readlex-british" if dialect == "british" else "--readlex-american"
-    dict_file = DICT_FILE_BRITISH if dialect == "british" else DICT_FILE_AMERICAN
-
-    try:
-        result = subprocess.run(
-            [shave_cmd, flag, str(dict_file)],
-            input=text,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error transliterating text: {e}")
-        print(f"stderr: {e.stderr}")
-        return text  # Return original on error
-
-
-def transliterate_csv(input_file, output_latin, output_british, output_american, shave_cmd):
+def transliterate_csv(input_file, output_latin, output_british, output_american, pool):
     """
     Transliterate a CSV file, preserving keys and transliterating values.
     Creates Latin, British, and American JSON output files.
@@ -117,7 +63,7 @@ def transliterate_csv(input_file, output_latin, output_british, output_american,
         output_latin: Path to Latin JSON output file
         output_british: Path to British JSON output file
         output_american: Path to American JSON output file
-        shave_cmd: Path to shave executable
+        pool: ShavePool or TranslationCache used for both dialects
     """
     print(f"  Processing {input_file.name}...")
 
@@ -131,125 +77,62 @@ def transliterate_csv(input_file, output_latin, output_british, output_american,
             keys.append(row['key'])
             values.append(row['value'])
 
+    # Both dialects go through the pool at once, one framed request each
+    british_future = pool.submit(values, 'british')
+    american_future = pool.submit(values, 'american')
+
     # Save Latin translations (original values)
     translations_latin = dict(zip(keys, values))
-    with open(output_latin, 'w', encoding='utf-8') as f:
-        json.dump(translations_latin, f, ensure_ascii=False, indent=2)
+    write_json(output_latin, translations_latin)
     print(f"    ✓ Saved {output_latin.name}")
 
-    # Batch transliterate all values at once (much faster!)
-    all_values_text = '\n'.join(values)
-
-    # Get path to Shavian correction script
-    fix_script = SCRIPT_DIR / "fix-shavian.py"
-
-    # British - pipe through correction filter
-    shave_proc = subprocess.Popen(
-        [shave_cmd, "--readlex-british", str(DICT_FILE_BRITISH)],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    fix_proc = subprocess.Popen(
-        ["python3", str(fix_script)],
-        stdin=shave_proc.stdout,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    shave_proc.stdin.write(all_values_text)
-    shave_proc.stdin.close()
-    british_output, _ = fix_proc.communicate()
-    british_values = british_output.strip().split('\n')
-
-    # American - pipe through correction filter
-    shave_proc = subprocess.Popen(
-        [shave_cmd, "--readlex-american", str(DICT_FILE_AMERICAN)],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    fix_proc = subprocess.Popen(
-        ["python3", str(fix_script)],
-        stdin=shave_proc.stdout,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    shave_proc.stdin.write(all_values_text)
-    shave_proc.stdin.close()
-    american_output, _ = fix_proc.communicate()
-    american_values = american_output.strip().split('\n')
+    british_values = [value.strip() for value in british_future.result()]
+    american_values = [value.strip() for value in american_future.result()]
 
     # Combine keys with transliterated values
     translations_british = dict(zip(keys, british_values))
     translations_american = dict(zip(keys, american_values))
 
     # Save British translations
-    with open(output_british, 'w', encoding='utf-8') as f:
-        json.dump(translations_british, f, ensure_ascii=False, indent=2)
+    write_json(output_british, translations_british)
     print(f"    ✓ Saved {output_british.name}")
 
     # Save American translations
-    with open(output_american, 'w', encoding='utf-8') as f:
-        json.dump(translations_american, f, ensure_ascii=False, indent=2)
+    write_json(output_american, translations_american)
     print(f"    ✓ Saved {output_american.name}")
 
 
-def transliterate_html(input_file, output_british, output_american, shave_cmd):
+def transliterate_html(input_file, output_british, output_american, pool):
     """
     Transliterate an HTML file for both British and American dialects.
+    Only text runs and translatable attribute values are transliterated (see
+    html_segments.py); the rest of the markup is copied through unchanged.
 
     Args:
         input_file: Path to input HTML file
         output_british: Path to British HTML output file
         output_american: Path to American HTML output file
-        shave_cmd: Path to shave executable
+        pool: ShavePool or TranslationCache used for both dialects
     """
     print(f"  Processing {input_file.name}...")
 
     with open(input_file, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Get path to Shavian correction script
-    fix_script = SCRIPT_DIR / "fix-shavian.py"
+    # One framed request per dialect with every text node in the page
+    segments = segment_html(content)
+    texts = [segment.text for segment in segments]
+    british_future = pool.submit(texts, 'british')
+    american_future = pool.submit(texts, 'american')
 
-    # British - pipe through correction filter
-    shave_proc = subprocess.Popen(
-        [shave_cmd, "--readlex-british", str(DICT_FILE_BRITISH)],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    fix_proc = subprocess.Popen(
-        ["python3", str(fix_script)],
-        stdin=shave_proc.stdout,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    shave_proc.stdin.write(content)
-    shave_proc.stdin.close()
-    british_output, _ = fix_proc.communicate()
-    with open(output_british, 'w', encoding='utf-8') as f:
-        f.write(british_output)
+    british_texts = [text.strip() for text in british_future.result()]
+    british_output = splice_segments(content, segments, british_texts)
+    write_text(output_british, british_output)
     print(f"    ✓ Saved {output_british.name}")
 
-    # American - pipe through correction filter
-    shave_proc = subprocess.Popen(
-        [shave_cmd, "--readlex-american", str(DICT_FILE_AMERICAN)],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    fix_proc = subprocess.Popen(
-        ["python3", str(fix_script)],
-        stdin=shave_proc.stdout,
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    shave_proc.stdin.write(content)
-    shave_proc.stdin.close()
-    american_output, _ = fix_proc.communicate()
-    with open(output_american, 'w', encoding='utf-8') as f:
-        f.write(american_output)
+    american_texts = [text.strip() for text in american_future.result()]
+    american_output = splice_segments(content, segments, american_texts)
+    write_text(output_american, american_output)
     print(f"    ✓ Saved {output_american.name}")
 
 
@@ -262,13 +145,32 @@ def main():
     parser.add_argument(
         '-a', '--all',
         action='store_true',
-        help='Process all files (default: only process files with uncommitted changes)'
+        help='Re-transliterate everything, ignoring cached results'
+    )
+    parser.add_argument(
+        '-b', '--backend',
+        choices=['shave', 'native'],
+        default='shave',
+        help="Transliterator: the external 'shave' tool or the in-process readlex engine (default: shave)"
+    )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=1,
+        help='Number of shave processes to keep running per dialect (default: 1)'
     )
     args = parser.parse_args()
 
     print("Generating Shavian transliterations...")
 
-    shave_cmd = check_dependencies()
+    if args.backend == 'native':
+        if not READLEX_FILE.exists():
+            print(f"Error: readlex.json not found at {READLEX_FILE}")
+            print("Make sure the readlex submodule is initialized:")
+            print("  git submodule update --init --recursive")
+            sys.exit(1)
+    else:
+        shave_cmd = check_dependencies()
 
     if not DICT_FILE_BRITISH.exists():
         print(f"Error: British dictionary file not found at {DICT_FILE_BRITISH}")
@@ -278,33 +180,20 @@ def main():
         print(f"Error: American dictionary file not found at {DICT_FILE_AMERICAN}")
         sys.exit(1)
 
-    # Get changed files if not processing all
-    changed_files = None
-    if not args.all:
-        changed_files = get_changed_files()
-        if changed_files:
-            print(f"\nProcessing {len(changed_files)} changed file(s)")
-        else:
-            print("\nNo changed files detected. Use -a/--all to process all files.")
-            return
+    # Collect jobs first, then run them all concurrently against the cache
+    jobs = []
 
     # Process CSV translations
     csv_file = SCRIPT_DIR / "translations.csv"
-    csv_changed = args.all or (changed_files and csv_file.resolve() in changed_files)
-
-    if csv_changed:
-        print("\nGenerating JSON translations from CSV:")
-        if csv_file.exists():
-            transliterate_csv(
-                csv_file,
-                SITE_DIR / "translations_latin.json",
-                SITE_DIR / "translations_british.json",
-                SITE_DIR / "translations_american.json",
-                shave_cmd
-            )
-        else:
-            print(f"  Error: {csv_file} not found!")
-            sys.exit(1)
+    if not csv_file.exists():
+        print(f"  Error: {csv_file} not found!")
+        sys.exit(1)
+    jobs.append((transliterate_csv, (
+        csv_file,
+        SITE_DIR / "translations_latin.json",
+        SITE_DIR / "translations_british.json",
+        SITE_DIR / "translations_american.json",
+    )))
 
     # Process HTML content files from site/ directory
     content_files = [
@@ -315,29 +204,41 @@ def main():
         "whats_new.html"
     ]
 
-    html_files_processed = False
     for filename in content_files:
         base_name = filename.replace('.html', '')
         source_path = SITE_DIR / f"{base_name}_latin.html"
 
-        # Check if this file should be processed
-        should_process = args.all or (changed_files and source_path.resolve() in changed_files)
-
-        if should_process and source_path.exists():
-            if not html_files_processed:
-                print("\nProcessing HTML content files:")
-                html_files_processed = True
-
+        if source_path.exists():
             gb_output = SITE_DIR / f"{base_name}_gb.html"
             us_output = SITE_DIR / f"{base_name}_us.html"
 
             # Transliterate to GB and US
-            transliterate_html(source_path, gb_output, us_output, shave_cmd)
+            jobs.append((transliterate_html, (source_path, gb_output, us_output)))
+
+    dict_files = {'british': DICT_FILE_BRITISH, 'american': DICT_FILE_AMERICAN}
 
-    if csv_changed or html_files_processed:
-        print("\n✅ Translation generation complete!")
+    if args.backend == 'native':
+        start_pool = lambda: NativePool(dict_files)
+        backend_version = native_version()
     else:
-        print("\n✅ No translation files needed updating.")
+        def start_pool():
+            pool = ShavePool(shave_cmd, dict_files, workers_per_dialect=args.workers)
+            if not pool.streaming:
+                print("  Note: shave does not stream output; using one process per request")
+            return pool
+        backend_version = f"shave:{file_hash(shave_cmd)}"
+
+    print(f"\nTransliterating {len(jobs)} file(s):")
+    with TranslationCache(start_pool, backend_version, dict_files,
+                          CORRECTIONS_FILE, refresh=args.all) as cache:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(func, *job_args, cache) for func, job_args in jobs]
+            for future in futures:
+                future.result()
+
+    print(f"\n  {cache.hits} cached, {cache.misses} transliterated")
+    report()
+    print("\n✅ Translation generation complete!")
 
 
 if __name__ == "__main__":
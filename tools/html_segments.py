@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Split HTML content pages into translatable text segments and splice
+transliterations back into the original layout.
+
+A segment is a run of text together with the inline elements inside it
+(<a>, <em>, <strong>, <br> and so on), so a sentence is transliterated in
+one piece and keeps its context for capitalisation and namer dots. The
+inline tags pass through the transliterator as markup. The values of the
+alt, title, aria-label and placeholder attributes are segments of their
+own; a tag with one of them ends the run around it, so segments never
+overlap.
+
+Everything else, i.e. other tags and attributes, comments and the contents of
+<script>/<style> (or any element marked translate="no"), is left byte for
+byte as it is. Leading and trailing whitespace stays in the page, so the
+transliterator only sees the text itself.
+"""
+
+import re
+from html.parser import HTMLParser
+
+# Elements whose content is never translated
+SKIP_ELEMENTS = {'script', 'style'}
+
+# Elements that never have an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr'
+}
+
+# Elements that sit inside a sentence rather than break the text up
+INLINE_ELEMENTS = {
+    'a', 'abbr', 'b', 'bdi', 'bdo', 'br', 'cite', 'code', 'dfn', 'em', 'i',
+    'kbd', 'mark', 'q', 's', 'samp', 'small', 'span', 'strong', 'sub', 'sup',
+    'time', 'u', 'var', 'wbr'
+}
+
+# Attributes whose values are text shown to the reader
+TRANSLATABLE_ATTRIBUTES = {'alt', 'title', 'aria-label', 'placeholder'}
+
+# A segment is only worth transliterating if it contains Latin letters
+LATIN_LETTER = re.compile(r'[A-Za-zÀ-ɏ]')
+MARKUP = re.compile(r'<[^>]*>')
+ATTRIBUTE = re.compile(r"""\s([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+
+CHUNK_SIZE = 64 * 1024
+
+# Event kinds
+TEXT, INLINE, BREAK = 'text', 'inline', 'break'
+
+
+class Segment:
+    """A text node: source[start:end] == leading + text + trailing."""
+
+    __slots__ = ('start', 'end', 'leading', 'text', 'trailing')
+
+    def __init__(self, start, end, raw):
+        stripped = raw.strip()
+        self.start = start
+        self.end = end
+        self.text = stripped
+        self.leading = raw[:len(raw) - len(raw.lstrip())]
+        self.trailing = raw[len(self.leading) + len(stripped):]
+
+
+class TextNodeSegmenter(HTMLParser):
+    """
+    Streaming HTML parser that records the source offsets of text runs and
+    translatable attribute values.
+    Feed it chunks with feed(), then call close() and read .segments.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.source = []
+        self.line_starts = [0]
+        self.length = 0
+        self.stack = []  # (tag, translatable) for open elements
+        self.events = []  # (offset, kind, translatable)
+        self.attribute_segments = []
+
+    def feed(self, data):
+        # Track line starts so getpos() can be turned into offsets
+        for match in re.finditer('\n', data):
+            self.line_starts.append(self.length + match.end())
+        self.length += len(data)
+        self.source.append(data)
+        super().feed(data)
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def _translatable(self):
+        return self.stack[-1][1] if self.stack else True
+
+    def _event(self, kind):
+        self.events.append((self._offset(), kind, self._translatable()))
+
+    def _tag(self, tag, attrs):
+        """Record a start tag; returns whether its content is translatable."""
+        attrs = dict(attrs)
+        translatable = self._translatable() and attrs.get('translate') != 'no'
+        found = translatable and TRANSLATABLE_ATTRIBUTES.intersection(attrs)
+        if found:
+            start = self._offset()
+            for match in ATTRIBUTE.finditer(self.get_starttag_text()):
+                group = 2 if match.group(2) is not None else 3 if match.group(3) is not None else 4
+                if match.group(1).lower() in found and match.group(group) is not None:
+                    segment = Segment(start + match.start(group), start + match.end(group), match.group(group))
+                    if LATIN_LETTER.search(segment.text):
+                        self.attribute_segments.append(segment)
+
+        inline = tag in INLINE_ELEMENTS and translatable and not found
+        self._event(INLINE if inline else BREAK)
+        return translatable and tag not in SKIP_ELEMENTS
+
+    def handle_starttag(self, tag, attrs):
+        translatable = self._tag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, translatable))
+
+    def handle_startendtag(self, tag, attrs):
+        self._tag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # An inline element's end tag stays in the run if its start tag did
+        inline = tag in INLINE_ELEMENTS and any(
+            open_tag == tag for open_tag, _ in self.stack) and self._translatable()
+        self._event(INLINE if inline else BREAK)
+        # Pop up to the matching element, tolerating unclosed children
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+
+    def handle_data(self, data):
+        self._event(TEXT)
+
+    def handle_entityref(self, name):
+        self._event(TEXT)
+
+    def handle_charref(self, name):
+        self._event(TEXT)
+
+    def handle_comment(self, data):
+        self._event(BREAK)
+
+    def handle_decl(self, decl):
+        self._event(BREAK)
+
+    def handle_pi(self, data):
+        self._event(BREAK)
+
+    def unknown_decl(self, data):
+        self._event(BREAK)
+
+    @property
+    def segments(self):
+        """Translatable text segments, in document order."""
+        source = ''.join(self.source)
+        segments = []
+        run_start = None
+        run_end = None
+        after_text = False
+
+        # Each event runs until the next one. A run is the text and inline
+        # tags between two breaks, from its first text to the end of its last.
+        for offset, kind, translatable in self.events + [(len(source), BREAK, False)]:
+            if after_text:
+                run_end = offset
+            after_text = kind == TEXT and translatable
+            if after_text:
+                if run_start is None:
+                    run_start = offset
+            elif (kind != INLINE or not translatable) and run_start is not None:
+                segment = Segment(run_start, run_end, source[run_start:run_end])
+                if LATIN_LETTER.search(MARKUP.sub('', segment.text)):
+                    segments.append(segment)
+                run_start = None
+
+        return sorted(segments + self.attribute_segments, key=lambda segment: segment.start)
+
+
+def segment_html(content):
+    """Return the translatable text segments of an HTML string."""
+    parser = TextNodeSegmenter()
+    for i in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[i:i + CHUNK_SIZE])
+    parser.close()
+    return parser.segments
+
+
+def splice_segments(content, segments, replacements):
+    """Replace each segment's text with its replacement, keeping everything else."""
+    parts = []
+    position = 0
+    for segment, replacement in zip(segments, replacements):
+        parts.append(content[position:segment.start])
+        parts.append(segment.leading + replacement + segment.trailing)
+        position = segment.end
+    parts.append(content[position:])
+    return ''.join(parts)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Inline a page's small startup fetches and preload the rest.
+
+The startup fetches of each page come from tools/page-budgets.json (see
+page_budgets.py). When deploying, those of at most INLINE_MAX_BYTES are
+embedded in the page as one <script type="application/json" id="inline-data">
+block, keyed by file name: JSON files as their value, other files as text.
+The page's scripts read it with window.inlineResource(name) and only fetch
+what isn't there, so each inlined file is one round trip less before first
+interaction (the translations were three blocking requests).
+
+The rest of the critical request set gets <link rel="preload"> hints, so
+browsers request it with the page instead of once a script or stylesheet
+asks for it: larger startup fetches (as="fetch", with the version query the
+scripts add) and the fonts the stylesheets load (as="font").
+
+deploy.py runs this on the deployed files. To see what a page would get:
+    python inline_resources.py              # build/site/index.html
+"""
+
+import argparse
+import html as html_lib
+import json
+import re
+import sys
+from pathlib import Path
+
+from page_budgets import BUDGETS_FILE, critical_requests, load_budgets
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+
+INLINE_DATA_ID = 'inline-data'
+# Larger files cost more as part of every page load than as a parallel request
+INLINE_MAX_BYTES = 16 * 1024
+
+FONT_TYPES = {'.woff2': 'font/woff2', '.woff': 'font/woff', '.otf': 'font/otf', '.ttf': 'font/ttf'}
+
+# Hints go before the first stylesheet or script, so they are seen first
+# and the data block precedes every script that reads it
+_INSERT_BEFORE = re.compile(r'<link\b[^>]*\brel=["\']stylesheet["\']|<script\b', re.IGNORECASE)
+
+
+def inline_block(resources):
+    """The <script> element holding the inlined resources."""
+    data = json.dumps(resources, ensure_ascii=False, separators=(',', ':'))
+    # '</' and '<!--' would end the element early; the escapes are the same strings in JSON
+    data = data.replace('</', '<\\/').replace('<!--', '\\u003c!--')
+    return f'<script type="application/json" id="{INLINE_DATA_ID}">{data}</script>'
+
+
+def preload_link(url, path):
+    """A <link rel="preload"> for a font, or for a fetch() of url."""
+    href = html_lib.escape(url)
+    font_type = FONT_TYPES.get(Path(path).suffix)
+    if font_type:
+        return f'<link rel="preload" href="{href}" as="font" type="{font_type}" crossorigin>'
+    # fetch() requests are CORS-mode, so the preload must be too for the browser to reuse it
+    return f'<link rel="preload" href="{href}" as="fetch" crossorigin>'
+
+
+def inline_resources(html, output_path, page, fetches, full_version, max_bytes=INLINE_MAX_BYTES):
+    """
+    Inline the page's small startup fetches and add preload hints for the
+    rest of its critical requests, reading the deployed files in output_path.
+
+    Returns:
+        (html, inlined files, preloaded files)
+    """
+    output_path = Path(output_path)
+    base = Path(page).parent
+
+    resources = {}
+    preloads = []   # (url, file)
+    for fetch in fetches:
+        path = output_path / fetch
+        if not path.exists():
+            continue
+        if path.stat().st_size > max_bytes:
+            preloads.append((f'{fetch}?v={full_version}', fetch))
+            continue
+        text = path.read_text(encoding='utf-8')
+        resources[fetch] = json.loads(text) if path.suffix == '.json' else text
+
+    # Stylesheets and scripts are already tags in the page; the fonts they load aren't
+    for rel_path in critical_requests(output_path, page, html=html):
+        if Path(rel_path).suffix in FONT_TYPES and rel_path not in fetches:
+            preloads.append((Path(rel_path).relative_to(base).as_posix(), rel_path))
+
+    tags = [preload_link(url, path) for url, path in preloads]
+    if resources:
+        tags.append(inline_block(resources))
+    if not tags:
+        return html, [], []
+
+    match = _INSERT_BEFORE.search(html)
+    at = match.start() if match else html.lower().index('</head>')
+    indent = html[html.rfind('\n', 0, at) + 1:at]
+    if indent.strip():
+        indent = ''
+    html = html[:at] + ''.join(f'{tag}\n{indent}' for tag in tags) + html[at:]
+    return html, list(resources), [path for _, path in preloads]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show what deploy inlines into each page and preloads")
+    parser.add_argument('-o', '--output-dir', default='build/site', help='Deployed site (default: build/site)')
+    parser.add_argument('-c', '--config', type=Path, default=BUDGETS_FILE,
+                        help='Budgets file with the startup fetches (default: tools/page-budgets.json)')
+    args = parser.parse_args()
+
+    output_path = PROJECT_DIR / args.output_dir
+    if not output_path.exists():
+        print(f"Error: {output_path} not found (run deploy.py first)")
+        return 1
+
+    for page, config in load_budgets(args.config).get('pages', {}).items():
+        html = (output_path / page).read_text(encoding='utf-8')
+        fetches = config.get('fetches', [])
+        _, inlined, preloaded = inline_resources(html, output_path, page, fetches, 'VERSION')
+        print(f"{page}:")
+        for name in inlined:
+            size = (output_path / name).stat().st_size
+            print(f"  ✓ inline   {name} ({size / 1024:.1f} KB)")
+        for name in preloaded:
+            print(f"  ✓ preload  {name}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """
 Helper module to load and parse keyboard layouts from JSON.
+
+load_layout() returns a compiled Layout with reverse lookups (character →
+key position), per-row character sets as bitmasks and the layout's ligature
+table. Compiled layouts are cached per process by the hash of the JSON file.
 """
 
+import hashlib
 import json
 from pathlib import Path
+from typing import NamedTuple
+
+LAYOUTS_FILE = Path(__file__).parent.parent / 'site' / 'keyboard_layouts.json'
 
 # Standard QWERTY physical key positions
 QWERTY_ROWS = {
@@ -14,11 +22,204 @@ QWERTY_ROWS = {
     'bottom': list('zxcvbnm,./')
 }
 
+# Every physical key the layouts map, row by row, left to right
+PHYSICAL_ROWS = {
+    'number': list('`1234567890-='),
+    'qwerty': list('qwertyuiop[]\\'),
+    'home': list('asdfghjkl;\''),
+    'bottom': list('zxcvbnm,./'),
+    'space': [' '],
+}
+
+# Shifted counterpart of each unshifted key (mirrors virtual-keyboard.js)
+SHIFT_MAP = {
+    '1': '!', '2': '@', '3': '#', '4': '$', '5': '%',
+    '6': '^', '7': '&', '8': '*', '9': '(', '0': ')',
+    '`': '~', '-': '_', '=': '+',
+    '[': '{', ']': '}', '\\': '|',
+    ';': ':', '\'': '"',
+    ',': '<', '.': '>', '/': '?'
+}
+
+# Touch-typing finger for each physical key: (hand, finger)
+FINGERS = {}
+for _keys, _hand, _finger in [
+    ('`1qaz', 'left', 'pinky'), ('2wsx', 'left', 'ring'), ('3edc', 'left', 'middle'),
+    ('45rtfgvb', 'left', 'index'), ('67yuhjnm', 'right', 'index'), ('8ik,', 'right', 'middle'),
+    ('9ol.', 'right', 'ring'), ('0-=p[]\\;\'/', 'right', 'pinky'), (' ', 'both', 'thumb'),
+]:
+    for _key in _keys:
+        FINGERS[_key] = (_hand, _finger)
+
+# Characters that map to themselves and are not part of a layout's alphabet
+PUNCTUATION = '1234567890[];\',./-=\\[]`'
+
+# Bit positions for character sets: the Shavian block, then the namer dot
+SHAVIAN_START = 0x10450
+SHAVIAN_SIZE = 48
+NAMER_DOT = '·'
+NAMER_DOT_BIT = SHAVIAN_SIZE
+
+
+def shifted_key(key):
+    """Return the key that produces key's shifted character."""
+    if len(key) == 1 and 'a' <= key <= 'z':
+        return key.upper()
+    return SHIFT_MAP.get(key, key)
+
+
+def char_bit(char):
+    """Bit for a single character, or 0 if it has no bit."""
+    offset = ord(char) - SHAVIAN_START
+    if 0 <= offset < SHAVIAN_SIZE:
+        return 1 << offset
+    if char == NAMER_DOT:
+        return 1 << NAMER_DOT_BIT
+    return 0
+
+
+def char_mask(text):
+    """
+    Bitmask of the characters in text, or None if any character has no bit
+    (so the text can never be typed from a mask alone).
+    """
+    mask = 0
+    for char in text:
+        bit = char_bit(char)
+        if not bit:
+            return None
+        mask |= bit
+    return mask
+
+
+def mask_chars(mask):
+    """Characters set in a mask, in code point order."""
+    chars = [chr(SHAVIAN_START + i) for i in range(SHAVIAN_SIZE) if mask >> i & 1]
+    if mask >> NAMER_DOT_BIT & 1:
+        chars.append(NAMER_DOT)
+    return ''.join(chars)
+
+
+class KeyPosition(NamedTuple):
+    """Where a character is typed: the unshifted key, its row and column, finger and shift."""
+    key: str
+    row: str
+    column: int
+    finger: str
+    hand: str
+    shift: bool
+
+
+class Layout:
+    """
+    A keyboard layout compiled for lookups.
+
+    Attributes:
+        name: Layout name ('imperial', 'qwerty', ...)
+        keys: Raw key → character map from the JSON
+        auto_ligatures: 'always', 'optional' or 'never'
+        ligatures: Dict ligature → tuple of component sequences
+        positions: Dict character → tuple of KeyPositions, unshifted first
+        rows: Dict row name → characters on that row (base then shift per key),
+            the alphabet used by learn mode
+        row_masks: Dict row name → bitmask of rows[name]
+        mask: Bitmask of every character on the layout
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        self.keys = data.get('keys', {})
+        self.auto_ligatures = data.get('autoLigatures', 'never')
+        self.ligatures = {
+            ligature: tuple(tuple(sequence) for sequence in sequences)
+            for ligature, sequences in data.get('ligatures', {}).items()
+        }
+
+        positions = {}
+        shift_positions = []
+        for row_name, row_keys in PHYSICAL_ROWS.items():
+            for column, key in enumerate(row_keys):
+                hand, finger = FINGERS[key]
+                position = KeyPosition(key, row_name, column, finger, hand, False)
+                char = self.keys.get(key)
+                if char:
+                    positions.setdefault(char, []).append(position)
+                shift_key = shifted_key(key)
+                char = self.keys.get(shift_key) if shift_key != key else None
+                if char:
+                    shift_positions.append((char, position._replace(shift=True)))
+        # Unshifted positions come first, so lookup() prefers them
+        for char, position in shift_positions:
+            positions.setdefault(char, []).append(position)
+        self.positions = {char: tuple(found) for char, found in positions.items()}
+
+        # Same selection as learn mode always used: base then shift character
+        # of each key, without punctuation that maps to itself
+        self.rows = {}
+        for row_name, row_keys in QWERTY_ROWS.items():
+            chars = []
+            for key in row_keys:
+                sources = [key] if key.upper() == key else [key, key.upper()]
+                for source in sources:
+                    char = self.keys.get(source)
+                    if char and char not in PUNCTUATION:
+                        chars.append(char)
+            self.rows[row_name] = ''.join(chars)
+
+        self.row_masks = {row_name: char_mask(chars) or 0 for row_name, chars in self.rows.items()}
+        self.mask = 0
+        for char in self.positions:
+            self.mask |= char_mask(char) or 0
+
+    def lookup(self, char):
+        """Return the preferred KeyPosition for a character, or None if it isn't on the layout."""
+        found = self.positions.get(char)
+        return found[0] if found else None
+
+    def expand_ligatures(self, word):
+        """Replace this layout's ligatures with their first component sequence."""
+        for ligature, sequences in self.ligatures.items():
+            if ligature in word:
+                word = word.replace(ligature, ''.join(sequences[0]))
+        return word
+
+    def can_type(self, word, allowed_mask=None):
+        """True if every character of word is in allowed_mask (default: the whole layout)."""
+        mask = char_mask(word)
+        return mask is not None and not mask & ~(self.mask if allowed_mask is None else allowed_mask)
+
+    def __repr__(self):
+        return f"Layout({self.name!r}, {len(self.positions)} chars)"
+
+
+_compiled = {}  # file digest -> {name: Layout}
+
+
+def load_layouts(json_file=None):
+    """Load and compile every layout in a keyboard_layouts.json file (cached by file hash)."""
+    json_file = Path(json_file or LAYOUTS_FILE)
+    data = json_file.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest not in _compiled:
+        _compiled[digest] = {
+            name: Layout(name, entry)
+            for name, entry in json.loads(data.decode('utf-8')).items()
+        }
+    return _compiled[digest]
+
+
+def load_layout(name, json_file=None):
+    """Return the compiled Layout for one layout name."""
+    layouts = load_layouts(json_file)
+    if name not in layouts:
+        raise ValueError(f"Unknown layout: {name}")
+    return layouts[name]
+
+
 def load_keyboard_layouts(json_file=None):
     """Load keyboard layouts from JSON file."""
     if json_file is None:
-        script_dir = Path(__file__).parent
-        json_file = script_dir.parent / 'site' / 'keyboard_layouts.json'
+        json_file = LAYOUTS_FILE
 
     with open(json_file, 'r', encoding='utf-8') as f:
         return json.load(f)
@@ -33,32 +234,7 @@ def organize_layout_by_rows(layout_map):
     Returns:
         Dict with keys 'number', 'qwerty', 'home', 'bottom' containing the Shavian chars
     """
-    organized = {
-        'number': '',
-        'qwerty': '',
-        'home': '',
-        'bottom': ''
-    }
-
-    # Map each QWERTY key to its row
-    for row_name, keys in QWERTY_ROWS.items():
-        chars = []
-        for key in keys:
-            # Check both lowercase and uppercase (shift layer)
-            if key in layout_map:
-                char = layout_map[key]
-                # Skip punctuation and numbers that map to themselves
-                if char and char not in '1234567890[];\',./-=\\[]`':
-                    chars.append(char)
-            # Also check uppercase version
-            if key.upper() in layout_map and key.upper() != key:
-                char = layout_map[key.upper()]
-                if char and char not in '1234567890[];\',./-=\\[]`':
-                    chars.append(char)
-
-        organized[row_name] = ''.join(chars)
-
-    return organized
+    return dict(Layout('', {'keys': layout_map}).rows)
 
 def get_layout_for_learn_mode(layout_name, keyboard_layouts=None):
     """
@@ -72,12 +248,13 @@ def get_layout_for_learn_mode(layout_name, keyboard_layouts=None):
         Dict with keys 'number', 'qwerty', 'home', 'bottom'
     """
     if keyboard_layouts is None:
-        keyboard_layouts = load_keyboard_layouts()
+        return dict(load_layout(layout_name).rows)
 
     if layout_name not in keyboard_layouts:
         raise ValueError(f"Unknown layout: {layout_name}")
 
-    layout_map = keyboard_layouts[layout_name]
+    # Layout entries hold the key map under 'keys', next to the ligatures
+    layout_map = keyboard_layouts[layout_name]['keys']
     return organize_layout_by_rows(layout_map)
 
 # Ligatures: compound letters formed by typing two characters
@@ -92,12 +269,17 @@ LIGATURES = {
 
 if __name__ == '__main__':
     # Test loading
-    layouts = load_keyboard_layouts()
+    layouts = load_layouts()
     print(f"Loaded {len(layouts)} keyboard layouts:")
-    for name in layouts.keys():
-        print(f"  {name}")
+    for layout in layouts.values():
+        print(f"  {layout.name}: {len(layout.positions)} chars, "
+              f"{len(layout.ligatures)} ligatures ({layout.auto_ligatures})")
 
     print("\nImperial layout organized by rows:")
-    imperial = get_layout_for_learn_mode('imperial', layouts)
-    for row, chars in imperial.items():
+    imperial = load_layout('imperial')
+    for row, chars in imperial.rows.items():
         print(f"  {row}: {chars}")
+
+    print("\nImperial reverse lookups:")
+    for char in '𐑪𐑸𐑠':
+        print(f"  {char}: {imperial.positions[char]}")
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Local lesson-query service for designing Learn mode lessons.
+
+Keeps each dialect's word table warm in memory as NumPy arrays (a character
+bitmask, a uint8 count column per character and the typed length of every
+word, with and without ligature expansion), so the ranked word list for any
+character set comes back in milliseconds instead of a full
+generate_learn_words.py run. Ranking is the same as
+generate_learn_word_lists():
+
+    score = focus_count * 1000 + freq / 100 + len(word) * level
+
+(or 1000 + freq / 100 + len(word) * level with flat=1, as used by the
+Number Row Focus lesson), with ties kept in corpus order.
+
+Usage:
+    python lesson_server.py query -c 𐑩𐑯𐑑𐑛𐑕 -f 𐑛𐑕      # print one lesson
+    python lesson_server.py serve -p 8001              # HTTP/JSON service
+    python lesson_server.py bench                      # latency benchmark
+
+HTTP:
+    GET /lesson?chars=...&focus=...&dialect=gb&ligatures=1&level=1&limit=100
+    GET /health
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from generate_learn_words import (
+    LEARN_LEVELS_2LAYER, LEARN_LEVELS_IMPERIAL, LEARN_LEVELS_JAFL,
+    LEARN_LEVELS_NEW_IMPERIAL, LEARN_LEVELS_QWERTY,
+    can_type_with_chars, count_target_chars, expand_ligatures, get_new_chars_for_level,
+    load_readlex_words,
+)
+from keyboard_layout_loader import NAMER_DOT_BIT, char_bit
+from word_corpus import load_corpus_words
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+READLEX_FILE = PROJECT_DIR / 'readlex' / 'readlex.json'
+
+DEFAULT_PORT = 8001
+DEFAULT_LIMIT = 100
+DIALECTS = ('gb', 'us')
+
+# Bit index → count column (the 48 Shavian letters, then the namer dot)
+BITS = NAMER_DOT_BIT + 1
+UNTYPEABLE = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+LEARN_LEVELS = {
+    'imperial': LEARN_LEVELS_IMPERIAL,
+    'igc': LEARN_LEVELS_NEW_IMPERIAL,
+    'qwerty': LEARN_LEVELS_QWERTY,
+    '2layer': LEARN_LEVELS_2LAYER,
+    'jafl': LEARN_LEVELS_JAFL,
+}
+
+
+def char_column(char):
+    """Count column of a character, or None if it has no bit."""
+    bit = char_bit(char)
+    return bit.bit_length() - 1 if bit else None
+
+
+def chars_mask(chars):
+    """Bitmask of the characters in chars that have a bit (others are ignored)."""
+    mask = 0
+    for char in chars:
+        mask |= char_bit(char)
+    return mask
+
+
+def column_sum(columns, selected, candidates):
+    """Sum the selected uint8 count columns for each candidate word.
+
+    Small candidate sets gather their entries from each column; large ones
+    add the whole columns and gather the totals, which is cheaper than
+    gathering most of every column.
+    """
+    if len(candidates) * 4 < columns.shape[1]:
+        total = np.zeros(len(candidates), dtype=np.uint16)
+        for column in selected:
+            total += columns[column].take(candidates)
+        return total.astype(np.int64)
+    total = np.zeros(columns.shape[1], dtype=np.uint16)
+    for column in selected:
+        total += columns[column]
+    return total.take(candidates).astype(np.int64)
+
+
+class WordTable:
+    """
+    One dialect's words encoded for lesson queries.
+
+    Args:
+        words: (word, frequency) list, in the order ties should keep
+    """
+
+    def __init__(self, words):
+        self.words = [word for word, _ in words]
+        self.freqs = np.array([freq for _, freq in words], dtype=np.float64)
+        self.lengths = np.array([len(word) for word in self.words], dtype=np.float64)
+
+        # Ligature mode → (masks, columns, typed lengths) over the typed form of each word
+        self.modes = {
+            False: self._encode(self.words),
+            True: self._encode([expand_ligatures(word) for word in self.words]),
+        }
+
+    @staticmethod
+    def _encode(typed_words):
+        masks = np.zeros(len(typed_words), dtype=np.uint64)
+        counts = np.zeros((len(typed_words), BITS), dtype=np.uint8)
+        for i, word in enumerate(typed_words):
+            mask = 0
+            for char in word:
+                column = char_column(char)
+                if column is None:
+                    mask = None
+                    break
+                mask |= 1 << column
+                counts[i, column] += 1
+            masks[i] = UNTYPEABLE if mask is None else mask
+        # One contiguous column per character, so a query reads only the
+        # columns it needs
+        columns = np.ascontiguousarray(counts.T)
+        return masks, columns, counts.sum(axis=1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.words)
+
+    def query(self, chars, focus, use_ligatures=True, level=1, flat=False, limit=DEFAULT_LIMIT):
+        """
+        Rank the words typeable with chars that contain a focus character.
+
+        Args:
+            chars: Available characters
+            focus: Characters the lesson practises
+            use_ligatures: Type ligatures as their two component letters
+            level: Lesson number; longer words score higher in later lessons
+            flat: Don't favour words with several focus characters
+            limit: Maximum number of words to return
+
+        Returns:
+            List of (word, score) pairs, best first
+        """
+        masks, columns, typed_lengths = self.modes[bool(use_ligatures)]
+        allowed_bits = chars_mask(chars)
+        focus_bits = chars_mask(focus) & allowed_bits
+        allowed = np.uint64(allowed_bits)
+        focus_mask = np.uint64(focus_bits)
+        candidates = np.flatnonzero(((masks & ~allowed) == 0) & ((masks & focus_mask) != 0))
+
+        # Focus character count per candidate, summed over the fewer of the
+        # focus columns and the other allowed columns: candidates only use
+        # allowed characters, so the focus count is the typed length less
+        # the other characters. Whole columns sum faster than a 2-D gather.
+        focus_columns = [bit for bit in range(BITS) if focus_bits >> bit & 1]
+        other_columns = [bit for bit in range(BITS) if (allowed_bits & ~focus_bits) >> bit & 1]
+        if len(focus_columns) <= len(other_columns):
+            focus_count = column_sum(columns, focus_columns, candidates)
+        else:
+            focus_count = typed_lengths[candidates] - column_sum(columns, other_columns, candidates)
+
+        # Same operation order as generate_learn_word_lists(), so scores match exactly
+        if flat:
+            scores = 1000 + self.freqs[candidates] / 100 + self.lengths[candidates] * level
+        else:
+            scores = focus_count * 1000 + self.freqs[candidates] / 100 + self.lengths[candidates] * level
+
+        # Stable sort of just the words that can reach the top: everything
+        # scoring at least the limit-th best score, ties included
+        if limit is not None and len(scores) > limit:
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            top = np.flatnonzero(scores >= threshold)
+        else:
+            top = np.arange(len(scores))
+        order = top[np.argsort(-scores[top], kind='stable')][:limit]
+        return [(self.words[candidates[i]], float(scores[i])) for i in order]
+
+
+def load_words(dialect, source='auto'):
+    """Load a dialect's (word, frequency) list from readlex or the corpus."""
+    if source == 'auto':
+        source = 'readlex' if READLEX_FILE.exists() else 'corpus'
+    if source == 'readlex':
+        return load_readlex_words(READLEX_FILE, dialect)
+    return load_corpus_words(dialect)
+
+
+class LessonService:
+    """Word tables for every dialect, loaded on first use and kept warm."""
+
+    def __init__(self, source='auto'):
+        self.source = source
+        self.tables = {}
+
+    def table(self, dialect):
+        if dialect not in DIALECTS:
+            raise ValueError(f"Unknown dialect: {dialect}")
+        if dialect not in self.tables:
+            self.tables[dialect] = WordTable(load_words(dialect, self.source))
+        return self.tables[dialect]
+
+    def lesson(self, chars, focus=None, dialect='gb', use_ligatures=True, level=1, flat=False,
+               limit=DEFAULT_LIMIT):
+        """Return the lesson for a query as a JSON-ready dict."""
+        table = self.table(dialect)
+        start = time.perf_counter()
+        results = table.query(chars, focus or chars, use_ligatures, level, flat, limit)
+        return {
+            'chars': chars,
+            'focus': focus or chars,
+            'dialect': dialect,
+            'ligatures': bool(use_ligatures),
+            'words': [word for word, _ in results],
+            'scores': [score for _, score in results],
+            'ms': round((time.perf_counter() - start) * 1000, 3),
+        }
+
+
+def parse_flag(value):
+    return value.lower() not in ('0', 'false', 'no', 'off')
+
+
+def make_handler(service):
+    class LessonHandler(BaseHTTPRequestHandler):
+        def send_json(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if url.path == '/health':
+                self.send_json(200, {'status': 'ok', 'dialects': sorted(service.tables)})
+                return
+            if url.path != '/lesson':
+                self.send_json(404, {'error': f'Unknown path: {url.path}'})
+                return
+
+            try:
+                if not params.get('chars'):
+                    raise ValueError("Missing 'chars'")
+                body = service.lesson(
+                    params['chars'],
+                    params.get('focus'),
+                    dialect=params.get('dialect', 'gb'),
+                    use_ligatures=parse_flag(params.get('ligatures', '1')),
+                    level=int(params.get('level', 1)),
+                    flat=parse_flag(params.get('flat', '0')),
+                    limit=int(params.get('limit', DEFAULT_LIMIT)),
+                )
+            except ValueError as e:
+                self.send_json(400, {'error': str(e)})
+                return
+            self.send_json(200, body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return LessonHandler
+
+
+def reference_lesson(words, chars, focus, use_ligatures, level, flat, limit):
+    """The ranking as generate_learn_word_lists() computes it, word by word."""
+    candidates = []
+    for word, freq in words:
+        if can_type_with_chars(word, chars, use_ligatures):
+            target_count = count_target_chars(word, set(focus), use_ligatures)
+            if target_count > 0:
+                if flat:
+                    score = 1000 + (freq / 100) + (len(word) * level)
+                else:
+                    score = (target_count * 1000) + (freq / 100) + (len(word) * level)
+                candidates.append((word, score))
+    candidates.sort(key=lambda x: x[1], reverse=True)
+    return [word for word, _ in candidates[:limit]]
+
+
+def benchmark_queries(count, seed=0):
+    """Every Learn mode level of every layout, plus random character sets."""
+    queries = []
+    for learn_levels in LEARN_LEVELS.values():
+        for level_num, level_info in learn_levels.items():
+            focus = level_info.get('focus') or ''.join(get_new_chars_for_level(level_num, learn_levels))
+            flat = level_num == 5 and level_info['nameKey'] == 'lessonNumberRowFocus'
+            for use_ligatures in (True, False):
+                queries.append((level_info['chars'], focus, use_ligatures, level_num, flat))
+
+    rng = random.Random(seed)
+    alphabet = [chr(0x10450 + i) for i in range(48)]
+    while len(queries) < count:
+        chars = rng.sample(alphabet, rng.randint(8, 40))
+        focus = rng.sample(chars, rng.randint(1, 4))
+        queries.append((''.join(chars), ''.join(focus), rng.random() < 0.5, rng.randint(1, 12), False))
+    return queries
+
+
+def run_benchmark(service, dialect, count, check, target_ms):
+    start = time.perf_counter()
+    table = service.table(dialect)
+    print(f"Loaded {len(table)} {dialect.upper()} words in {time.perf_counter() - start:.2f}s")
+
+    queries = benchmark_queries(count)
+    timings = []
+    mismatches = 0
+    words = list(zip(table.words, table.freqs.tolist())) if check else None
+    for chars, focus, use_ligatures, level, flat in queries:
+        start = time.perf_counter()
+        results = table.query(chars, focus, use_ligatures, level, flat)
+        timings.append((time.perf_counter() - start) * 1000)
+        if check:
+            expected = reference_lesson(words, chars, focus, use_ligatures, level, flat, DEFAULT_LIMIT)
+            mismatches += [word for word, _ in results] != expected
+
+    timings = np.array(timings)
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"{len(queries)} queries: p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {timings.max():.2f} ms")
+    if check:
+        if mismatches:
+            print(f"❌ {mismatches} queries differ from generate_learn_word_lists() ranking")
+        else:
+            print("✓ All results match generate_learn_word_lists() ranking")
+
+    if mismatches or p99 > target_ms:
+        if p99 > target_ms:
+            print(f"❌ p99 {p99:.2f} ms is over the {target_ms} ms target")
+        return 1
+    print(f"✅ p99 within the {target_ms} ms target")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query Learn mode word lists for any character set')
+    parser.add_argument('-s', '--source', choices=['auto', 'readlex', 'corpus'], default='auto',
+                        help='Word source (default: readlex if available, otherwise the frequency corpus)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    query_parser = subparsers.add_parser('query', help='Print the ranked words for one lesson')
+    query_parser.add_argument('-c', '--chars', required=True, help='Available characters')
+    query_parser.add_argument('-f', '--focus', help='Focus characters (default: all of --chars)')
+    query_parser.add_argument('-d', '--dialect', choices=DIALECTS, default='gb')
+    query_parser.add_argument('--no-ligatures', action='store_true',
+                              help="Don't expand ligatures to their component letters")
+    query_parser.add_argument('-l', '--level', type=int, default=1,
+                              help='Lesson number, which weights word length (default: 1)')
+    query_parser.add_argument('--flat', action='store_true',
+                              help="Don't favour words with several focus characters")
+    query_parser.add_argument('-n', '--limit', type=int, default=DEFAULT_LIMIT)
+    query_parser.add_argument('--json', action='store_true', help='Print the JSON response')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the HTTP/JSON service')
+    serve_parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--host', default='127.0.0.1')
+
+    bench_parser = subparsers.add_parser('bench', help='Measure query latency')
+    bench_parser.add_argument('-d', '--dialect', choices=DIALECTS, default='gb')
+    bench_parser.add_argument('-n', '--queries', type=int, default=1000)
+    bench_parser.add_argument('--target-ms', type=float, default=5.0,
+                              help='p99 latency target in milliseconds (default: 5)')
+    bench_parser.add_argument('--no-check', action='store_true',
+                              help="Don't compare results against the reference ranking")
+
+    args = parser.parse_args()
+    service = LessonService(args.source)
+
+    if args.command == 'query':
+        body = service.lesson(args.chars, args.focus, args.dialect, not args.no_ligatures,
+                              args.level, args.flat, args.limit)
+        if args.json:
+            print(json.dumps(body, ensure_ascii=False, indent=2))
+        else:
+            print(' '.join(body['words']))
+            print(f"ⓘ {len(body['words'])} words in {body['ms']} ms")
+        return 0
+
+    if args.command == 'bench':
+        return run_benchmark(service, args.dialect, args.queries, not args.no_check, args.target_ms)
+
+    start = time.perf_counter()
+    for dialect in DIALECTS:
+        service.table(dialect)
+    print(f"Loaded word tables in {time.perf_counter() - start:.2f}s")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving lessons at http://{args.host}:{args.port}/lesson?chars=...")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
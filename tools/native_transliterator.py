@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Pure-Python Latin → Shavian transliterator built on readlex.
+
+An in-process alternative to the external 'shave' tool. It compiles readlex
+plus the shaw-type-*.dict overrides into a hashed lookup index (one per
+dialect), caches the index in .cache/ keyed by the hashes of its sources, and
+transliterates word by word:
+
+- lookups are case-insensitive; capitalised words that readlex only knows as
+  proper nouns (or that are capitalised mid-sentence and have a proper-noun
+  reading) get a namer dot; shaw-type-*.dict entries are used exactly as
+  written, so the dictionary decides whether they have one
+- punctuation, numbers, HTML tags/entities and {{PLACEHOLDERS}} pass through
+- possessive 's is added to the transliterated stem when the full form is
+  not in the lexicon
+- words not in the lexicon are left in Latin
+
+Usage:
+    echo "Shaw Type is a typing practice tool." | python native_transliterator.py british
+"""
+
+import hashlib
+import json
+import marshal
+import re
+import sys
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+
+from shavian_corrections import load_corrections, compile_corrections
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+READLEX_FILE = PROJECT_DIR / "readlex" / "readlex.json"
+CACHE_DIR = PROJECT_DIR / ".cache"
+CORRECTIONS_FILE = SCRIPT_DIR / "shavian-corrections.txt"
+DICT_FILES = {
+    'british': SCRIPT_DIR / "shaw-type-british.dict",
+    'american': SCRIPT_DIR / "shaw-type-american.dict",
+}
+
+# Bump when the index layout or transliteration rules change
+ENGINE_VERSION = 2
+
+NAMER_DOT = '·'
+
+# readlex variant preferred for each dialect (mirrors load_readlex_words)
+VARIANT_PREFERENCE = {
+    'british': 'RRP',
+    'american': 'GenAm',
+}
+
+TOKEN = re.compile(r"""
+    (?P<placeholder>\{\{\w+\}\})
+  | (?P<markup><[^>]*>|&\#?\w+;)
+  | (?P<word>[A-Za-z]+(?:['’][A-Za-z]+)*)
+  | (?P<end>[.!?]+)
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+VOICELESS = set('𐑐𐑑𐑒𐑓𐑔')
+SIBILANTS = set('𐑕𐑟𐑖𐑠𐑗𐑡')
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sources_hash(paths):
+    """Hash the engine version and source files (each file is read once per process)."""
+    digest = hashlib.sha256(str(ENGINE_VERSION).encode())
+    for path in paths:
+        stat = path.stat()
+        digest.update(path.name.encode())
+        digest.update(_file_digest(str(path), stat.st_mtime_ns, stat.st_size).encode())
+    return digest.hexdigest()
+
+
+def _select_entry(entries, variant_pref):
+    """Pick the dialect's entry from a readlex variant list."""
+    for preference in (variant_pref, 'RRP'):
+        for entry in entries:
+            if entry.get('var') == preference:
+                return entry
+    return entries[0] if entries else None
+
+
+def build_index(readlex_file, dict_file, dialect):
+    """
+    Build the lookup index for one dialect.
+
+    Returns:
+        Tuple (words, overrides): words maps a lowercase Latin spelling to
+        (common Shavian or '', proper-noun Shavian or ''), picking the most
+        frequent reading of each; overrides maps the dict file's exact
+        spellings to their output.
+    """
+    with open(readlex_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    variant_pref = VARIANT_PREFERENCE[dialect]
+    best = {}  # latin -> [common, common_freq, proper, proper_freq]
+
+    for key, entries in data.items():
+        entry = _select_entry(entries, variant_pref)
+        if not entry or not entry.get('Shaw'):
+            continue
+
+        latin = (entry.get('Latn') or key.split('_')[0]).replace('’', "'").lower()
+        shaw = entry['Shaw'].lstrip(NAMER_DOT)
+        freq = entry.get('freq', 0) or 0
+        slot = best.setdefault(latin, ['', -1, '', -1])
+
+        if entry.get('pos', '').startswith('NP0'):
+            if freq > slot[3]:
+                slot[2], slot[3] = NAMER_DOT + shaw, freq
+        elif freq > slot[1]:
+            slot[0], slot[1] = shaw, freq
+
+    words = {latin: (slot[0], slot[2]) for latin, slot in best.items()}
+
+    overrides = {}
+    with open(dict_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2:
+                overrides[parts[0]] = parts[1]
+
+    return words, overrides
+
+
+def load_index(dialect, readlex_file=READLEX_FILE, dict_file=None, cache_dir=CACHE_DIR):
+    """Load the dialect's index from the cache, building it if the sources changed."""
+    dict_file = Path(dict_file or DICT_FILES[dialect])
+    readlex_file = Path(readlex_file)
+    sources_hash = _sources_hash([readlex_file, dict_file])
+    cache_file = Path(cache_dir) / f"native-index-{dialect}.marshal"
+
+    if cache_file.exists():
+        with open(cache_file, 'rb') as f:
+            cached_hash, words, overrides = marshal.load(f)
+        if cached_hash == sources_hash:
+            return words, overrides
+
+    words, overrides = build_index(readlex_file, dict_file, dialect)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = cache_file.with_suffix('.tmp')
+    with open(temp_file, 'wb') as f:
+        marshal.dump((sources_hash, words, overrides), f)
+    temp_file.replace(cache_file)
+    return words, overrides
+
+
+class NativeTransliterator:
+    """Word-by-word transliterator for one dialect."""
+
+    def __init__(self, dialect, readlex_file=READLEX_FILE, dict_file=None, cache_dir=CACHE_DIR):
+        self.dialect = dialect
+        self.words, self.overrides = load_index(dialect, readlex_file, dict_file, cache_dir)
+
+    def lookup(self, word, sentence_start):
+        """Return the Shavian for a Latin word, or None if it is unknown."""
+        # Dictionary entries are used as written, namer dot or not
+        if word in self.overrides:
+            return self.overrides[word]
+
+        normalized = word.replace('’', "'")
+        entry = self.words.get(normalized.lower())
+        if entry:
+            common, proper = entry
+            capitalised = word[0].isupper() and not word.isupper()
+            if proper and (not common or (capitalised and not sentence_start)):
+                return proper
+            return common or None
+
+        # Possessive of a known word: add the 's ending to the stem
+        if normalized.lower().endswith("'s"):
+            stem = self.lookup(word[:-2], sentence_start)
+            if stem:
+                last = stem[-1]
+                if last in SIBILANTS:
+                    return stem + '𐑩𐑟'
+                return stem + ('𐑕' if last in VOICELESS else '𐑟')
+
+        return None
+
+    def transliterate(self, text):
+        """Transliterate a string, leaving markup and unknown words untouched."""
+        out = []
+        sentence_start = True
+        for match in TOKEN.finditer(text):
+            kind = match.lastgroup
+            token = match.group()
+            if kind == 'word':
+                shaw = self.lookup(token, sentence_start)
+                out.append(shaw if shaw is not None else token)
+                sentence_start = False
+            else:
+                out.append(token)
+                if kind == 'end':
+                    sentence_start = True
+        return ''.join(out)
+
+
+class NativePool:
+    """
+    In-process backend with the ShavePool interface (submit/close), so
+    generate_translations.py can use it in place of shave.
+    """
+
+    streaming = True
+
+    def __init__(self, dict_files=DICT_FILES, readlex_file=READLEX_FILE, corrections_file=CORRECTIONS_FILE):
+        self.transliterators = {
+            dialect: NativeTransliterator(dialect, readlex_file, dict_file)
+            for dialect, dict_file in dict_files.items()
+        }
+        self.corrections = compile_corrections(load_corrections(corrections_file))
+
+    def transliterate(self, texts, dialect):
+        transliterator = self.transliterators[dialect]
+        return [self.corrections.apply(transliterator.transliterate(text)) for text in texts]
+
+    def submit(self, texts, dialect):
+        """Transliterate synchronously; returns an already-completed Future."""
+        future = Future()
+        try:
+            future.set_result(self.transliterate(texts, dialect))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        pass
+
+
+def native_version(readlex_file=READLEX_FILE):
+    """Identify this engine and its lexicon for cache keys."""
+    return f"native:{ENGINE_VERSION}:{_sources_hash([Path(readlex_file)])[:16]}"
+
+
+def main():
+    dialect = sys.argv[1] if len(sys.argv) > 1 else 'british'
+    if dialect not in DICT_FILES:
+        print(f"Usage: {Path(__file__).name} [british|american] < input")
+        return 1
+    if not READLEX_FILE.exists():
+        print(f"Error: readlex.json not found at {READLEX_FILE}")
+        print("Make sure the readlex submodule is initialized:")
+        print("  git submodule update --init --recursive")
+        return 1
+
+    pool = NativePool({dialect: DICT_FILES[dialect]})
+    sys.stdout.write(pool.transliterate([sys.stdin.read()], dialect)[0])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
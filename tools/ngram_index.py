@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Character n-gram index over a Shavian word corpus.
+
+For bigrams and trigrams the index holds the frequency-weighted count of
+every n-gram and a posting list of the words containing it. Everything is
+stored in flat NumPy integer arrays (CSR style), and words are numbered by
+frequency rank, so posting lists are already in frequency order.
+
+Usage:
+    python ngram_index.py [gb|us]   # build the index and print the top n-grams
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from keyboard_layout_loader import char_bit
+
+
+class NgramTable:
+    """
+    All n-grams of one size.
+
+    Attributes:
+        keys: Sorted n-gram ids (int64)
+        weights: Frequency-weighted occurrence count of each n-gram
+        offsets: postings[offsets[i]:offsets[i + 1]] are the words with keys[i]
+        postings: Word ids (int32), ascending within each n-gram
+    """
+
+    def __init__(self, keys, weights, offsets, postings):
+        self.keys = keys
+        self.weights = weights
+        self.offsets = offsets
+        self.postings = postings
+
+    def find(self, ngram_id):
+        """Return the table row for an n-gram id, or -1 if it doesn't occur."""
+        i = int(np.searchsorted(self.keys, ngram_id))
+        return i if i < len(self.keys) and self.keys[i] == ngram_id else -1
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class NgramIndex:
+    """
+    Bigram and trigram index of a word list.
+
+    Args:
+        words: (word, frequency) pairs; word ids follow descending frequency
+        sizes: N-gram sizes to index
+    """
+
+    def __init__(self, words, sizes=(2, 3)):
+        words = sorted(words, key=lambda x: x[1], reverse=True)
+        self.words = [word for word, _ in words]
+        self.freqs = np.array([freq for _, freq in words], dtype=np.float64)
+
+        self.chars = sorted({char for word in self.words for char in word})
+        self.char_ids = {char: i for i, char in enumerate(self.chars)}
+        self.base = len(self.chars)
+
+        self.lengths = np.fromiter((len(word) for word in self.words), dtype=np.int64,
+                                   count=len(self.words))
+        self.starts = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+        self.codes = np.fromiter((self.char_ids[char] for word in self.words for char in word),
+                                 dtype=np.int64, count=int(self.lengths.sum()))
+        self.word_of = np.repeat(np.arange(len(self.words), dtype=np.int64), self.lengths)
+
+        # Character-set bitmask of every word (see keyboard_layout_loader.char_mask)
+        bits = np.array([char_bit(char) for char in self.chars], dtype=np.uint64)
+        nonempty = self.lengths > 0
+        self.masks = np.zeros(len(self.words), dtype=np.uint64)
+        if self.codes.size:
+            self.masks[nonempty] = np.bitwise_or.reduceat(bits[self.codes], self.starts[nonempty])
+
+        self.tables = {n: self._build(n) for n in sizes}
+
+    def _build(self, n):
+        position = np.arange(len(self.codes), dtype=np.int64) - self.starts[self.word_of]
+        valid = np.flatnonzero(position + n <= self.lengths[self.word_of])
+
+        ids = np.zeros(len(valid), dtype=np.int64)
+        for j in range(n):
+            ids = ids * self.base + self.codes[valid + j]
+        owners = self.word_of[valid]
+
+        keys, inverse = np.unique(ids, return_inverse=True)
+        weights = np.bincount(inverse, weights=self.freqs[owners], minlength=len(keys))
+
+        # One posting per (n-gram, word) pair, sorted by n-gram then word
+        pairs = np.unique(inverse.astype(np.int64) * len(self.words) + owners)
+        postings = (pairs % len(self.words)).astype(np.int32)
+        counts = np.bincount(pairs // len(self.words), minlength=len(keys))
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+        return NgramTable(keys, weights, offsets, postings)
+
+    def encode(self, ngram):
+        """Return the id of an n-gram string, or None if it has an unknown character."""
+        ngram_id = 0
+        for char in ngram:
+            if char not in self.char_ids:
+                return None
+            ngram_id = ngram_id * self.base + self.char_ids[char]
+        return ngram_id
+
+    def decode(self, ngram_id, n):
+        chars = []
+        for _ in range(n):
+            ngram_id, code = divmod(int(ngram_id), self.base)
+            chars.append(self.chars[code])
+        return ''.join(reversed(chars))
+
+    def _row(self, ngram):
+        table = self.tables.get(len(ngram))
+        ngram_id = self.encode(ngram)
+        if table is None or ngram_id is None:
+            return None, -1
+        return table, table.find(ngram_id)
+
+    def weight(self, ngram):
+        """Frequency-weighted count of an n-gram (0 if it never occurs)."""
+        table, row = self._row(ngram)
+        return float(table.weights[row]) if row >= 0 else 0.0
+
+    def postings(self, ngram):
+        """Word ids containing an n-gram, most frequent first."""
+        table, row = self._row(ngram)
+        if row < 0:
+            return np.zeros(0, dtype=np.int32)
+        return table.postings[table.offsets[row]:table.offsets[row + 1]]
+
+    def words_with(self, ngram, limit=None):
+        return [self.words[i] for i in self.postings(ngram)[:limit]]
+
+    def words_with_all(self, ngrams, limit=None):
+        """Words containing every n-gram, most frequent first."""
+        ids = None
+        for ngram in ngrams:
+            postings = self.postings(ngram)
+            ids = postings if ids is None else np.intersect1d(ids, postings, assume_unique=True)
+        return [self.words[i] for i in (ids if ids is not None else [])[:limit]]
+
+    def words_with_any(self, ngrams, limit=None, allowed_mask=None):
+        """
+        Words containing at least one n-gram, most frequent first.
+
+        Args:
+            allowed_mask: Optional character bitmask words must stay within
+        """
+        postings = [self.postings(ngram) for ngram in ngrams]
+        ids = np.unique(np.concatenate(postings)) if postings else np.zeros(0, dtype=np.int32)
+        if allowed_mask is not None:
+            ids = ids[(self.masks[ids] & ~np.uint64(allowed_mask)) == 0]
+        return [self.words[i] for i in ids[:limit]]
+
+    def top(self, n, limit=None, allowed_mask=None):
+        """
+        Most frequent n-grams of size n as (ngram, weight) pairs.
+
+        Args:
+            allowed_mask: Optional character bitmask the n-gram must stay within
+        """
+        table = self.tables[n]
+        order = np.argsort(-table.weights, kind='stable')
+        result = []
+        for row in order:
+            ngram = self.decode(table.keys[row], n)
+            if allowed_mask is not None and any(not char_bit(c) & allowed_mask for c in ngram):
+                continue
+            result.append((ngram, float(table.weights[row])))
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+
+def main():
+    from word_corpus import load_corpus_words
+
+    dialect = sys.argv[1] if len(sys.argv) > 1 else 'gb'
+    words = load_corpus_words(dialect)
+
+    start = time.perf_counter()
+    index = NgramIndex(words)
+    elapsed = time.perf_counter() - start
+
+    print(f"Indexed {len(index.words)} words in {elapsed:.2f}s: "
+          f"{len(index.tables[2])} bigrams, {len(index.tables[3])} trigrams")
+    for n in (2, 3):
+        top = ' '.join(ngram for ngram, _ in index.top(n, 15))
+        print(f"  top {n}-grams: {top}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Optimise the PNG images of a deployed site.
+
+Every PNG is recompressed losslessly (and stored as an exact palette image
+when it has 256 colours or fewer). With --lossy, images are also quantised
+to a 256-colour palette, which suits the flat-colour favicons and keyboard
+images.
+
+Results are cached in .cache/images/ by content hash, so unchanged images
+cost a file read on later builds.
+
+Usage:
+    python optimize_images.py                 # optimise build/site in place
+    python optimize_images.py dist/ --lossy   # another directory, quantised
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import PIL
+from PIL import Image
+
+from output_writer import write_bytes
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+CACHE_DIR = PROJECT_DIR / '.cache' / 'images'
+
+# Bump when the optimisation steps change
+OPTIMIZER_VERSION = 2
+
+
+def _encode_png(img):
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _exact_palette(img):
+    """Convert an image with at most 256 colours to a palette image, losslessly."""
+    rgba = img.convert('RGBA')
+    colors = rgba.getcolors(256)
+    if colors is None:
+        return None
+
+    index = {color: i for i, (_, color) in enumerate(colors)}
+    palette_img = Image.new('P', rgba.size)
+    palette_img.putdata([index[pixel] for pixel in rgba.getdata()])
+    palette_img.putpalette([channel for _, color in colors for channel in color], 'RGBA')
+    return palette_img
+
+
+def optimize_png(data, lossy=False):
+    """
+    Return the smallest PNG encoding of an image.
+
+    Args:
+        data: Original PNG bytes
+        lossy: If True, also try quantising to a 256-colour palette
+
+    Returns:
+        PNG bytes, which may be the original data
+    """
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    candidates = [data, _encode_png(img)]
+
+    palette_img = _exact_palette(img)
+    if palette_img is not None:
+        candidates.append(_encode_png(palette_img))
+    elif lossy:
+        quantized = img.convert('RGBA').quantize(256, method=Image.Quantize.FASTOCTREE)
+        candidates.append(_encode_png(quantized))
+
+    return min(candidates, key=len)
+
+
+class ImageOptimizer:
+    """
+    Content-hash cache in front of optimize_png().
+
+    Args:
+        cache_dir: Directory for cached results
+        lossy: Passed to optimize_png()
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, lossy=False):
+        self.cache_dir = Path(cache_dir)
+        self.lossy = lossy
+        self.prefix = f"{OPTIMIZER_VERSION}\0{PIL.__version__}\0{int(lossy)}\0".encode()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def optimize(self, data):
+        """Return the optimised PNG bytes for PNG data, using the cache."""
+        key = hashlib.sha256(self.prefix + data).hexdigest()
+        png_file = self.cache_dir / f'{key}.png'
+
+        if png_file.exists():
+            png = png_file.read_bytes()
+            with self.lock:
+                self.hits += 1
+            return png
+
+        png = optimize_png(data, self.lossy)
+
+        # Written under a temporary name and renamed, so a partial entry is never used
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_file = png_file.with_name(f'{key}.{threading.get_ident()}.tmp')
+        temp_file.write_bytes(png)
+        os.replace(temp_file, png_file)
+
+        with self.lock:
+            self.misses += 1
+        return png
+
+
+def optimize_files(pairs, lossy=False, cache_dir=CACHE_DIR, workers=None):
+    """
+    Write the optimised PNG of each source file to its destination.
+    Unchanged outputs are not rewritten (see output_writer.py).
+
+    Args:
+        pairs: (source, destination) paths; they may be the same file
+
+    Returns:
+        Dict with counts and total bytes before and after
+    """
+    optimizer = ImageOptimizer(cache_dir, lossy)
+
+    def process(pair):
+        source, dest = pair
+        original = Path(source).read_bytes()
+        png = optimizer.optimize(original)
+        write_bytes(dest, png)
+        return len(original), len(png)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(process, pairs))
+
+    return {
+        'images': len(pairs),
+        'before': sum(before for before, _ in results),
+        'after': sum(after for _, after in results),
+        'hits': optimizer.hits,
+        'misses': optimizer.misses,
+    }
+
+
+def optimize_directory(directory, lossy=False, cache_dir=CACHE_DIR, workers=None):
+    """Optimise every PNG under a directory in place."""
+    files = sorted(Path(directory).rglob('*.png'))
+    return optimize_files([(path, path) for path in files], lossy, cache_dir, workers)
+
+
+def print_stats(stats):
+    saved = stats['before'] - stats['after']
+    percent = 100 * saved / stats['before'] if stats['before'] else 0
+    print(f"Optimised {stats['images']} PNG images: {stats['before']:,} → {stats['after']:,} bytes "
+          f"(-{percent:.1f}%), {stats['hits']} cached, {stats['misses']} processed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Losslessly optimise PNG images')
+    parser.add_argument('directory', nargs='?', default=PROJECT_DIR / 'build' / 'site', type=Path,
+                        help='Directory to optimise in place (default: build/site)')
+    parser.add_argument('--lossy', action='store_true',
+                        help='Also quantise images with more than 256 colours to a palette')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of worker threads (default: CPU count based)')
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        print(f"Error: Directory not found: {args.directory}")
+        return 1
+
+    print_stats(optimize_directory(args.directory, args.lossy, workers=args.workers))
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Atomic, write-if-changed output files for the generators and deploy.
+
+Every output goes through write_bytes(), write_text() or write_json():
+
+- The new content is compared with the file already on disk (size first,
+  then bytes), and an identical file is left alone, so its mtime only
+  changes when its content does.
+- Changed content is written to a temporary file in the same directory and
+  moved into place with os.replace(), so a crash never leaves a half-written
+  file behind.
+- JSON is serialised with a fixed indent and separators, so the same
+  data always produces the same bytes.
+
+Counts of written and unchanged files are kept per process; tools print
+them with report().
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+_lock = threading.Lock()
+_counts = {'written': 0, 'unchanged': 0}
+
+# Permissions for new files, as open() would create them
+_umask = os.umask(0)
+os.umask(_umask)
+DEFAULT_MODE = 0o666 & ~_umask
+
+
+def _count(key):
+    with _lock:
+        _counts[key] += 1
+
+
+def write_bytes(path, data):
+    """
+    Write data to path unless the file already holds exactly that data.
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            _count('unchanged')
+            return False
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = DEFAULT_MODE
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+    _count('written')
+    return True
+
+
+def write_text(path, text):
+    """write_bytes() for UTF-8 text."""
+    return write_bytes(path, text.encode('utf-8'))
+
+
+def write_json(path, data, indent=2, ensure_ascii=False, separators=None):
+    """
+    write_bytes() for JSON. The defaults match the generators' usual
+    json.dump(data, f, ensure_ascii=False, indent=2); pass indent=None and
+    separators=(',', ':') for compact files.
+    """
+    return write_text(path, json.dumps(data, indent=indent, ensure_ascii=ensure_ascii,
+                                       separators=separators))
+
+
+def counts():
+    """Return (written, unchanged) totals for this process."""
+    with _lock:
+        return _counts['written'], _counts['unchanged']
+
+
+def reset_counts():
+    """Start counting from zero (shawtype.py does this between chained commands)."""
+    with _lock:
+        _counts['written'] = _counts['unchanged'] = 0
+
+
+def report(prefix='  '):
+    """Print how many output files were written and how many were unchanged."""
+    written, unchanged = counts()
+    print(f"{prefix}ⓘ {written} file(s) written, {unchanged} unchanged")
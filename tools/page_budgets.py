@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Page-weight budgets for the deployed site.
+
+Budgets live in tools/page-budgets.json, in KB (1024 bytes), as raw, gzip
+and/or brotli limits:
+
+- assets: glob pattern → budget. Each deployed file is held to the first
+  pattern it matches, so specific patterns go before general ones.
+- pages: page → its budget and the files its scripts fetch at startup. The
+  page's critical request set is the page itself, its scripts and
+  stylesheets, the files its stylesheets reference (for @font-face rules,
+  only the first source, which is the one browsers download) and those
+  startup fetches, less the ones deploy inlined into the page
+  (inline_resources.py); the budget applies to their total.
+
+Sizes are measured on the deployed files, so version placeholders are
+filled in and images are already optimised. gzip uses level 6 (a typical
+server setting) and brotli quality 11 (as for precompressed files).
+Compressed sizes are cached in .cache/compressed_sizes.json by content
+hash. Without the brotli module, brotli sizes and budgets are skipped.
+
+deploy.py runs the check after every deploy and fails when a budget is
+exceeded. To check an existing deploy:
+    python page_budgets.py                  # build/site
+    python page_budgets.py -o dist/ -a      # every asset, not just the ones over budget
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+BUDGETS_FILE = SCRIPT_DIR / 'page-budgets.json'
+CACHE_FILE = PROJECT_DIR / '.cache' / 'compressed_sizes.json'
+
+ENCODINGS = ['raw', 'gzip', 'brotli']
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 11
+
+_SCRIPT_SRC = re.compile(r'<script\b[^>]*\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+_LINK_TAG = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_HREF = re.compile(r'\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+_STYLESHEET = re.compile(r'\brel=["\']stylesheet["\']', re.IGNORECASE)
+_CSS_URL = re.compile(r'url\(\s*["\']?([^"\')]+)["\']?\s*\)')
+_FONT_SRC = re.compile(r'src\s*:\s*([^;}]*)')
+# Startup fetches deploy inlined into the page (see inline_resources.py)
+_INLINE_DATA = re.compile(r'<script type="application/json" id="inline-data">(.*?)</script>', re.DOTALL)
+
+
+class SizeCache:
+    """Raw, gzip and brotli sizes of file contents, cached by content hash."""
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+        self.used = {}
+
+    def sizes(self, data):
+        """Return {'raw': n, 'gzip': n, 'brotli': n or None} for data."""
+        key = hashlib.sha256(data).hexdigest()
+        entry = self.entries.get(key)
+        if entry is None or (entry.get('brotli') is None and brotli):
+            entry = {
+                'raw': len(data),
+                'gzip': len(gzip.compress(data, GZIP_LEVEL, mtime=0)),
+                'brotli': len(brotli.compress(data, quality=BROTLI_QUALITY)) if brotli else None,
+            }
+        self.used[key] = entry
+        return entry
+
+    def save(self):
+        """Keep only the entries used in this run."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.used, f)
+
+
+def load_budgets(budgets_file=BUDGETS_FILE):
+    with open(budgets_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def local_path(url):
+    """The site-relative path of a same-origin URL, or None for external and data URLs."""
+    if re.match(r'^[a-z][a-z0-9+.-]*:', url, re.IGNORECASE) or url.startswith('//'):
+        return None
+    return url.split('#')[0].split('?')[0].lstrip('/') or None
+
+
+def critical_requests(output_path, page, fetches=(), html=None):
+    """
+    The files a page requests before first interaction, in request order:
+    the page, its stylesheets and what they reference, its scripts, then
+    the startup fetches listed in the budgets that aren't inlined in it.
+    html is the page's content, when not read from output_path.
+    """
+    if html is None:
+        html = (output_path / page).read_text(encoding='utf-8')
+    base = Path(page).parent
+    files = [page]
+
+    for tag in _LINK_TAG.findall(html):
+        href = _HREF.search(tag)
+        if not href or not _STYLESHEET.search(tag):
+            continue
+        css = local_path(href.group(1))
+        if css is None:
+            continue
+        css = (base / css).as_posix()
+        files.append(css)
+        css_file = output_path / css
+        if css_file.exists():
+            css_text = css_file.read_text(encoding='utf-8')
+            # Fallback sources after the first are only fetched if it fails
+            urls = [_CSS_URL.findall(src)[:1] for src in _FONT_SRC.findall(css_text)]
+            urls.append(_CSS_URL.findall(_FONT_SRC.sub('', css_text)))
+            for url in (url for group in urls for url in group):
+                path = local_path(url)
+                if path:
+                    files.append((Path(css).parent / path).as_posix())
+
+    for src in _SCRIPT_SRC.findall(html):
+        path = local_path(src)
+        if path:
+            files.append((base / path).as_posix())
+
+    inline_data = _INLINE_DATA.search(html)
+    inlined = json.loads(inline_data.group(1)) if inline_data else {}
+    files.extend(fetch for fetch in fetches if fetch not in inlined)
+    return list(dict.fromkeys(files))
+
+
+def format_kb(size):
+    return '-' if size is None else f'{size / 1024:.1f}'
+
+
+def over_budget(sizes, budget):
+    """The encodings whose size exceeds the budget (in KB)."""
+    return [encoding for encoding in ENCODINGS
+            if encoding in budget and sizes.get(encoding) is not None
+            and sizes[encoding] > budget[encoding] * 1024]
+
+
+def describe(sizes, budget):
+    parts = []
+    for encoding in ENCODINGS:
+        if encoding in budget:
+            if sizes.get(encoding) is None:
+                parts.append(f"{encoding} not measured")
+            else:
+                parts.append(f"{encoding} {format_kb(sizes[encoding])}/{budget[encoding]:g} KB")
+    return ', '.join(parts)
+
+
+def check_budgets(output_path, budgets_file=BUDGETS_FILE, show_all=False):
+    """
+    Check the deployed site against the budgets and print the results.
+
+    Returns:
+        Number of budgets exceeded
+    """
+    output_path = Path(output_path)
+    budgets = load_budgets(budgets_file)
+    cache = SizeCache()
+    failures = 0
+
+    def sizes_of(rel_path):
+        return cache.sizes((output_path / rel_path).read_bytes())
+
+    print("Page-weight budgets" + ("" if brotli else " (brotli not installed, brotli sizes skipped)") + ":")
+
+    for page, config in budgets.get('pages', {}).items():
+        if not (output_path / page).exists():
+            print(f"  ❌ {page}: page not found")
+            failures += 1
+            continue
+
+        total = dict.fromkeys(ENCODINGS, 0)
+        print(f"\n  {page} critical requests (KB):")
+        print(f"    {'file':<36}  {'raw':>7}  {'gzip':>7}  {'brotli':>7}")
+        for rel_path in critical_requests(output_path, page, config.get('fetches', [])):
+            if not (output_path / rel_path).exists():
+                print(f"    ❌ {rel_path}: not found")
+                failures += 1
+                continue
+            sizes = sizes_of(rel_path)
+            for encoding in ENCODINGS:
+                total[encoding] = None if total[encoding] is None or sizes[encoding] is None \
+                    else total[encoding] + sizes[encoding]
+            print(f"    {rel_path:<36}  {format_kb(sizes['raw']):>7}  {format_kb(sizes['gzip']):>7}  "
+                  f"{format_kb(sizes['brotli']):>7}")
+        print(f"    {'total':<36}  {format_kb(total['raw']):>7}  {format_kb(total['gzip']):>7}  "
+              f"{format_kb(total['brotli']):>7}")
+
+        budget = config.get('budget', {})
+        exceeded = over_budget(total, budget)
+        symbol = '❌' if exceeded else '✓'
+        print(f"  {symbol} {page} critical set: {describe(total, budget)}")
+        failures += len(exceeded)
+
+    asset_budgets = budgets.get('assets', {})
+    checked = 0
+    print()
+    for path in sorted(output_path.rglob('*')):
+        if not path.is_file():
+            continue
+        rel_path = path.relative_to(output_path).as_posix()
+        pattern = next((pattern for pattern in asset_budgets if fnmatch(rel_path, pattern)), None)
+        if pattern is None:
+            continue
+        budget = asset_budgets[pattern]
+        sizes = sizes_of(rel_path)
+        checked += 1
+        exceeded = over_budget(sizes, budget)
+        failures += len(exceeded)
+        if exceeded or show_all:
+            symbol = '❌' if exceeded else '✓'
+            print(f"  {symbol} {rel_path} ({pattern}): {describe(sizes, budget)}")
+
+    cache.save()
+    if failures:
+        print(f"  ❌ {failures} budget(s) exceeded ({checked} assets checked)")
+    else:
+        print(f"  ✓ All {checked} assets within budget")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the deployed site against its page-weight budgets')
+    parser.add_argument('-o', '--output-dir', default='build/site', help='Deployed site (default: build/site)')
+    parser.add_argument('-c', '--config', type=Path, default=BUDGETS_FILE,
+                        help='Budgets file (default: tools/page-budgets.json)')
+    parser.add_argument('-a', '--all', action='store_true', help='List every asset checked, not only failures')
+    args = parser.parse_args()
+
+    output_path = PROJECT_DIR / args.output_dir
+    if not output_path.exists():
+        print(f"Error: {output_path} not found (run deploy.py first)")
+        return 1
+
+    failures = check_budgets(output_path, args.config, args.all)
+    print()
+    if failures:
+        print("❌ Page-weight budget exceeded")
+        return 1
+    print("✅ Within page-weight budgets")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
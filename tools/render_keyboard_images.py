@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Render keyboard layout images straight from site/keyboard_layout_*.json,
+without a browser.
+
+The key rows come from site/virtual-keyboard.html (desktop view) and the
+geometry mirrors site/virtual-keyboard.css, so the output lines up with the
+virtual keyboard in the game. Each layer is written as SVG, plus PNG when
+Pillow is installed, to build/keyboard_images/ unless -o says otherwise.
+
+Usage:
+    python render_keyboard_images.py                # all layouts
+    python render_keyboard_images.py qwerty jafl    # specific layouts
+    python render_keyboard_images.py --scale 2      # high-DPI PNGs
+    python render_keyboard_images.py --svg-only     # skip PNG output
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from generate_keyboard_images import LAYOUTS, PROJECT_DIR, SITE_DIR
+from keyboard_layout_loader import Layout, shifted_key
+from output_writer import report, write_bytes, write_text
+
+KEYBOARD_HTML = SITE_DIR / 'virtual-keyboard.html'
+FONT_FILE = SITE_DIR / 'fonts' / 'InterAlia-Regular.otf'
+# Not site/keyboard_images, which holds the committed Playwright screenshots
+OUTPUT_DIR = PROJECT_DIR / 'build' / 'keyboard_images'
+
+# Geometry from virtual-keyboard.css (desktop, box-sizing: border-box)
+BODY_PADDING = 10
+BODY_RADIUS = 12
+ROW_GAP = 4
+KEY_HEIGHT = 34
+KEY_RADIUS = 5
+KEY_WIDTHS = {
+    'key': 34,
+    'key-wide': 50,
+    'key-wider': 62,
+    'key-widest': 82,
+    'key-space': 312,
+}
+FONT_SIZE = 15
+SHIFT_FONT_SCALE = 0.85
+SHIFT_OPACITY = 0.4
+SHIFT_OFFSET = -1.5  # translateY(-150%) of the shift legend's own line box
+
+# Inter Alia metrics (hhea ascent/descent per em), used for line-height: normal
+FONT_ASCENT = 1984 / 2048
+FONT_DESCENT = 495 / 2048
+
+BODY_COLOR = '#2a2a2a'
+KEY_COLOR = '#3d3d3d'
+KEY_BORDER_COLOR = '#4a4a4a'
+TEXT_COLOR = '#e0e0e0'
+
+# Labels of the non-character keys (mirrors updateKeyboardLabels() in virtual-keyboard.js)
+SPECIAL_KEYS = {
+    'Backspace': '⌫',
+    'Tab': '⇥',
+    'CapsLock': '⇪',
+    'Enter': '⏎',
+    'Shift': '⇧'
+}
+
+
+class KeyboardRowsParser(HTMLParser):
+    """Collect the desktop key rows of virtual-keyboard.html as (data-key, class) lists."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        if 'keyboard-row' in classes:
+            self.rows.append([])
+        elif 'key' in classes and 'mobile-only' not in classes and self.rows:
+            size = next((c for c in classes if c in KEY_WIDTHS and c != 'key'), 'key')
+            self.rows[-1].append((attrs.get('data-key'), size))
+
+
+@lru_cache(maxsize=None)
+def load_rows(html_file=KEYBOARD_HTML):
+    parser = KeyboardRowsParser()
+    parser.feed(Path(html_file).read_text(encoding='utf-8'))
+    return [row for row in parser.rows if row]
+
+
+def key_legends(key, keyboard_map, shift):
+    """Return (main, shift) legends for a key, as the virtual keyboard shows them."""
+    # The screenshots show a blank space bar (the label isn't in the desktop view)
+    if key == ' ':
+        return '', ''
+    if key in SPECIAL_KEYS:
+        return SPECIAL_KEYS[key], ''
+    base_char = keyboard_map.get(key) or ''
+    shift_char = keyboard_map.get(shifted_key(key)) or ''
+    return (shift_char, base_char) if shift else (base_char, shift_char)
+
+
+def layout_keys(keyboard_map, shift, rows=None):
+    """
+    Lay out the keyboard for one layer.
+
+    Returns:
+        Tuple (width, height, keys) where keys is a list of
+        (x, y, width, main legend, shift legend)
+    """
+    rows = rows or load_rows()
+    row_widths = [
+        sum(KEY_WIDTHS[size] for _, size in row) + ROW_GAP * (len(row) - 1)
+        for row in rows
+    ]
+    width = max(row_widths) + 2 * BODY_PADDING
+    height = len(rows) * KEY_HEIGHT + (len(rows) - 1) * ROW_GAP + 2 * BODY_PADDING
+
+    keys = []
+    y = BODY_PADDING
+    for row, row_width in zip(rows, row_widths):
+        # Rows are centred (justify-content: center)
+        x = (width - row_width) / 2
+        for key, size in row:
+            main, shift_legend = key_legends(key, keyboard_map, shift)
+            keys.append((x, y, KEY_WIDTHS[size], main, shift_legend))
+            x += KEY_WIDTHS[size] + ROW_GAP
+        y += KEY_HEIGHT + ROW_GAP
+
+    return width, height, keys
+
+
+def baseline(center_y, font_size):
+    """Baseline of a line box of height line-height: normal centred on center_y."""
+    line_height = (FONT_ASCENT + FONT_DESCENT) * font_size
+    return center_y - line_height / 2 + FONT_ASCENT * font_size
+
+
+def legend_positions(y):
+    """Return ((main baseline, size), (shift baseline, size)) for a key at y."""
+    center_y = y + KEY_HEIGHT / 2
+    shift_size = FONT_SIZE * SHIFT_FONT_SCALE
+    shift_center = center_y + SHIFT_OFFSET * (FONT_ASCENT + FONT_DESCENT) * shift_size
+    return (baseline(center_y, FONT_SIZE), FONT_SIZE), (baseline(shift_center, shift_size), shift_size)
+
+
+def body_path(width, height):
+    """Keyboard body outline: square top corners, rounded bottom corners."""
+    r = BODY_RADIUS
+    return (f'M0,0 H{width} V{height - r} A{r},{r} 0 0 1 {width - r},{height} '
+            f'H{r} A{r},{r} 0 0 1 0,{height - r} Z')
+
+
+def render_svg(keyboard_map, shift, output_dir=OUTPUT_DIR):
+    """Render one layer as an SVG document string, to be saved in output_dir."""
+    width, height, keys = layout_keys(keyboard_map, shift)
+    font_url = Path(os.path.relpath(FONT_FILE, output_dir)).as_posix()
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+        '<style>'
+        f"@font-face {{ font-family: 'Inter-Alia'; src: url('{font_url}') format('opentype'); }}"
+        f"text {{ font-family: 'Inter-Alia', sans-serif; fill: {TEXT_COLOR}; text-anchor: middle; }}"
+        '</style>',
+        '<defs><filter id="shadow" x="-20%" y="-20%" width="140%" height="160%">'
+        '<feDropShadow dx="0" dy="2" stdDeviation="2" flood-color="#000" flood-opacity="0.3"/>'
+        '</filter></defs>',
+        f'<path d="{body_path(width, height)}" fill="{BODY_COLOR}"/>',
+    ]
+
+    for i, (x, y, key_width, main, shift_legend) in enumerate(keys):
+        (main_y, main_size), (shift_y, shift_size) = legend_positions(y)
+        center_x = x + key_width / 2
+        parts.append(
+            f'<rect x="{x + 0.5}" y="{y + 0.5}" width="{key_width - 1}" height="{KEY_HEIGHT - 1}" '
+            f'rx="{KEY_RADIUS}" fill="{KEY_COLOR}" stroke="{KEY_BORDER_COLOR}" filter="url(#shadow)"/>'
+        )
+        if not (main or shift_legend):
+            continue
+        # Legends are clipped to the key (overflow: hidden)
+        parts.append(
+            f'<clipPath id="k{i}"><rect x="{x}" y="{y}" width="{key_width}" '
+            f'height="{KEY_HEIGHT}" rx="{KEY_RADIUS}"/></clipPath><g clip-path="url(#k{i})">'
+        )
+        if main:
+            parts.append(f'<text x="{center_x}" y="{main_y:.2f}" font-size="{main_size}">'
+                         f'{escape(main)}</text>')
+        if shift_legend:
+            parts.append(f'<text x="{center_x}" y="{shift_y:.2f}" font-size="{shift_size:.2f}" '
+                         f'opacity="{SHIFT_OPACITY}">{escape(shift_legend)}</text>')
+        parts.append('</g>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    from PIL import ImageFont
+    return ImageFont.truetype(str(FONT_FILE), size)
+
+
+@lru_cache(maxsize=None)
+def rounded_mask(width, height, radius, scale):
+    from PIL import Image, ImageDraw
+    mask = Image.new('L', (round(width * scale), round(height * scale)), 0)
+    ImageDraw.Draw(mask).rounded_rectangle(
+        (0, 0, mask.width - 1, mask.height - 1), radius=radius * scale, fill=255
+    )
+    return mask
+
+
+@lru_cache(maxsize=None)
+def key_tile(key_width, main, shift_legend, scale):
+    """
+    Render one key with its legends, clipped to the key like overflow: hidden.
+    Cached: most keys look the same on both layers and on several layouts.
+    """
+    from PIL import Image, ImageDraw
+
+    tile = Image.new('RGBA', (round(key_width * scale), round(KEY_HEIGHT * scale)), KEY_BORDER_COLOR)
+    draw = ImageDraw.Draw(tile)
+    border = max(1, round(scale))
+    draw.rounded_rectangle(
+        (border, border, tile.width - 1 - border, tile.height - 1 - border),
+        radius=max(0, KEY_RADIUS * scale - border), fill=KEY_COLOR
+    )
+
+    (main_y, main_size), (shift_y, shift_size) = legend_positions(0)
+    center_x = key_width * scale / 2
+    if main:
+        draw.text((center_x, main_y * scale), main, fill=TEXT_COLOR,
+                  font=load_font(round(main_size * scale)), anchor='ms')
+    if shift_legend:
+        layer = Image.new('RGBA', tile.size, (0, 0, 0, 0))
+        ImageDraw.Draw(layer).text(
+            (center_x, shift_y * scale), shift_legend,
+            fill=TEXT_COLOR + format(round(255 * SHIFT_OPACITY), '02x'),
+            font=load_font(round(shift_size * scale)), anchor='ms'
+        )
+        tile.alpha_composite(layer)
+    return tile
+
+
+def render_png(keyboard_map, shift, scale=1):
+    """Render one layer as a Pillow RGBA image."""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    width, height, keys = layout_keys(keyboard_map, shift)
+    size = (round(width * scale), round(height * scale))
+
+    # Body with rounded bottom corners
+    body_mask = Image.new('L', size, 0)
+    body_draw = ImageDraw.Draw(body_mask)
+    body_draw.rounded_rectangle((0, 0, size[0] - 1, size[1] - 1), radius=BODY_RADIUS * scale, fill=255)
+    body_draw.rectangle((0, 0, size[0] - 1, BODY_RADIUS * scale), fill=255)
+    image = Image.new('RGBA', size, (0, 0, 0, 0))
+    image.paste(BODY_COLOR, mask=body_mask)
+
+    # Key shadows (box-shadow: 0 2px 4px rgba(0, 0, 0, 0.3))
+    shadow = Image.new('L', size, 0)
+    shadow_draw = ImageDraw.Draw(shadow)
+    for x, y, key_width, _, _ in keys:
+        shadow_draw.rounded_rectangle(
+            (x * scale, (y + 2) * scale, (x + key_width) * scale - 1, (y + 2 + KEY_HEIGHT) * scale - 1),
+            radius=KEY_RADIUS * scale, fill=round(255 * 0.3)
+        )
+    shadow = shadow.filter(ImageFilter.GaussianBlur(2 * scale))
+    image.paste('black', mask=Image.composite(shadow, Image.new('L', size, 0), body_mask))
+
+    for x, y, key_width, main, shift_legend in keys:
+        image.paste(key_tile(key_width, main, shift_legend, scale), (round(x * scale), round(y * scale)),
+                    mask=rounded_mask(key_width, KEY_HEIGHT, KEY_RADIUS, scale))
+
+    return image
+
+
+def render_layout(layout, output_dir=OUTPUT_DIR, png=True, scale=1):
+    """Render a layout's base and (if present) shift layers. Returns the files written."""
+    layout_file = SITE_DIR / f'keyboard_layout_{layout}.json'
+    with open(layout_file, 'r', encoding='utf-8') as f:
+        compiled = Layout(layout, json.load(f))
+    keyboard_map = compiled.keys
+
+    has_shift_layer = any(position.shift for found in compiled.positions.values() for position in found)
+    layers = ['base'] + (['shift'] if has_shift_layer else [])
+    written = []
+    for layer in layers:
+        shift = layer == 'shift'
+        svg_file = output_dir / f'{layout}_{layer}.svg'
+        write_text(svg_file, render_svg(keyboard_map, shift, output_dir))
+        written.append(svg_file.name)
+        if png:
+            png_file = output_dir / f'{layout}_{layer}.png'
+            buffer = io.BytesIO()
+            render_png(keyboard_map, shift, scale).save(buffer, 'PNG')
+            write_bytes(png_file, buffer.getvalue())
+            written.append(png_file.name)
+    return written
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Render keyboard layout images without a browser')
+    parser.add_argument('layouts', nargs='*', metavar='layout',
+                        help=f"Layouts to render (default: all of {', '.join(LAYOUTS)})")
+    parser.add_argument('-o', '--output-dir', type=Path, default=OUTPUT_DIR,
+                        help='Directory to write images to (default: build/keyboard_images)')
+    parser.add_argument('-s', '--scale', type=float, default=1,
+                        help='PNG pixel scale, e.g. 2 for high-DPI images (default: 1)')
+    parser.add_argument('--svg-only', action='store_true',
+                        help='Only write SVG files')
+    args = parser.parse_args()
+
+    unknown = [layout for layout in args.layouts if layout not in LAYOUTS]
+    if unknown:
+        parser.error(f"unknown layout(s): {', '.join(unknown)}")
+
+    png = not args.svg_only
+    if png:
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            print("ⓘ Pillow is not installed, writing SVG only (pip install Pillow)")
+            png = False
+
+    start = time.perf_counter()
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for layout in args.layouts or LAYOUTS:
+        for filename in render_layout(layout, args.output_dir, png, args.scale):
+            print(f"  ✓ Saved {filename}")
+
+    report()
+    print(f"\n✅ Keyboard images rendered in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
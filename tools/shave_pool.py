@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Pool of long-lived 'shave' co-processes for the translation generators.
+
+Each worker keeps one shave process open per dialect and talks to it through
+framed stdin/stdout: every text in a request is followed by a sentinel line
+that shave passes through untouched, so the reply can be split back into one
+result per text without restarting the process. Requests for different
+dialects, and for several files, run concurrently across the pool.
+
+If shave turns out to buffer its output (the handshake frame never comes
+back), the pool falls back to one process per request, still framed, so
+callers see the same results either way.
+"""
+
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from shavian_corrections import load_corrections, compile_corrections
+
+SCRIPT_DIR = Path(__file__).parent
+CORRECTIONS_FILE = SCRIPT_DIR / "shavian-corrections.txt"
+
+# A line with no letters, so shave passes it through unchanged. The full stop
+# keeps the next frame starting a fresh sentence.
+SENTINEL = '⁂⁂⁂.'
+
+DIALECT_FLAGS = {
+    'british': '--readlex-british',
+    'american': '--readlex-american',
+}
+
+HANDSHAKE_TIMEOUT = 10.0
+REQUEST_TIMEOUT = 120.0
+
+
+def frame_texts(texts):
+    """Join texts into one framed request, each followed by a sentinel line."""
+    parts = []
+    for text in texts:
+        parts.append(text if text.endswith('\n') else text + '\n')
+        parts.append(SENTINEL + '\n')
+    return ''.join(parts)
+
+
+def unframe_lines(lines, texts):
+    """Split shave output lines back into one result per input text."""
+    results = []
+    current = []
+    for line in lines:
+        if line.strip() == SENTINEL:
+            results.append(''.join(current))
+            current = []
+        else:
+            current.append(line)
+
+    if len(results) != len(texts):
+        raise RuntimeError(f"Expected {len(texts)} frames from shave, got {len(results)}")
+
+    # Only keep the trailing newline the input had
+    return [result if text.endswith('\n') else result[:-1] if result.endswith('\n') else result
+            for result, text in zip(results, texts)]
+
+
+class ShaveWorker:
+    """A single long-lived shave process for one dialect."""
+
+    def __init__(self, shave_cmd, dialect, dict_file):
+        self.command = [shave_cmd, DIALECT_FLAGS[dialect], str(dict_file)]
+        self.dialect = dialect
+        self.lines = queue.Queue()
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1
+        )
+        self.reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self.reader.start()
+
+    def _read_stdout(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)  # EOF
+
+    def handshake(self):
+        """Return True if shave echoes a frame back without waiting for EOF."""
+        try:
+            self.request([''], timeout=HANDSHAKE_TIMEOUT)
+            return True
+        except (RuntimeError, BrokenPipeError):
+            return False
+
+    def request(self, texts, timeout=REQUEST_TIMEOUT):
+        """Send texts as one framed request and return the transliterations."""
+        self.proc.stdin.write(frame_texts(texts))
+        self.proc.stdin.flush()
+
+        lines = []
+        frames = 0
+        while frames < len(texts):
+            try:
+                line = self.lines.get(timeout=timeout)
+            except queue.Empty:
+                raise RuntimeError(f"Timed out waiting for shave ({self.dialect})")
+            if line is None:
+                raise RuntimeError(f"shave ({self.dialect}) exited unexpectedly")
+            lines.append(line)
+            if line.strip() == SENTINEL:
+                frames += 1
+
+        return unframe_lines(lines, texts)
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class ShavePool:
+    """
+    Long-lived shave workers, one or more per dialect, plus in-process
+    corrections (the same engine fix-shavian.py uses).
+
+    Usage:
+        with ShavePool(shave_cmd, dict_files) as pool:
+            future = pool.submit(values, 'british')
+            british_values = future.result()
+    """
+
+    def __init__(self, shave_cmd, dict_files, workers_per_dialect=1, corrections_file=CORRECTIONS_FILE):
+        self.shave_cmd = shave_cmd
+        self.dict_files = dict_files
+        self.corrections = compile_corrections(load_corrections(corrections_file))
+        self.streaming = True
+        self.idle = {dialect: queue.Queue() for dialect in dict_files}
+        self.workers = []
+        self.lock = threading.Lock()
+
+        self._start_workers(workers_per_dialect)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers_per_dialect) * len(dict_files))
+
+    def _start_workers(self, workers_per_dialect):
+        for dialect, dict_file in self.dict_files.items():
+            for _ in range(max(1, workers_per_dialect)):
+                worker = ShaveWorker(self.shave_cmd, dialect, dict_file)
+                self.workers.append(worker)
+                if not worker.handshake():
+                    # shave only flushes at EOF: use one process per request instead
+                    self.streaming = False
+                    self._close_workers()
+                    return
+                self.idle[dialect].put(worker)
+
+    def _close_workers(self):
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
+        for dialect in self.idle:
+            self.idle[dialect] = queue.Queue()
+
+    def _replace_worker(self, worker):
+        """Close a worker left in an unknown state and start a fresh one for its dialect."""
+        worker.close()
+        with self.lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+        replacement = ShaveWorker(self.shave_cmd, worker.dialect, self.dict_files[worker.dialect])
+        with self.lock:
+            self.workers.append(replacement)
+        return replacement
+
+    def _run_once(self, texts, dialect):
+        """Fallback: transliterate a framed request with a fresh shave process."""
+        result = subprocess.run(
+            [self.shave_cmd, DIALECT_FLAGS[dialect], str(self.dict_files[dialect])],
+            input=frame_texts(texts),
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            check=True
+        )
+        return unframe_lines(result.stdout.splitlines(keepends=True), texts)
+
+    def transliterate(self, texts, dialect):
+        """Transliterate and correct a list of texts for one dialect."""
+        if not texts:
+            return []
+
+        if self.streaming:
+            worker = self.idle[dialect].get()
+            try:
+                results = worker.request(texts)
+            except Exception:
+                # Late lines of this request may still arrive and would be read
+                # as the next request's reply, so the worker is never reused
+                try:
+                    worker = self._replace_worker(worker)
+                finally:
+                    self.idle[dialect].put(worker)
+                raise
+            self.idle[dialect].put(worker)
+        else:
+            results = self._run_once(texts, dialect)
+
+        return [self.corrections.apply(result) for result in results]
+
+    def submit(self, texts, dialect):
+        """Queue a transliteration request; returns a Future of the results."""
+        return self.executor.submit(self.transliterate, texts, dialect)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self._close_workers()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Word-level correction engine for transliterated Shavian text.
+Shared by fix-shavian.py (stdin/stdout filter) and the translation generators.
+
+Corrections are matched on the same boundaries the original regex used: a
+correction only applies when it is not preceded or followed by a word
+character, where word characters are \\w, the namer dot (·) and the Shavian
+block (𐑐-𐑿). Instead of one lookbehind/lookahead pair per correction, the
+text is scanned once: runs of word characters are resolved with a dict
+lookup, and only the few corrections that contain non-word characters
+(e.g. "[𐑮𐑬 / 𐑮𐑴]") are tried as literal phrases.
+"""
+
+import re
+
+# Characters that count as part of a word for correction boundaries
+WORD_CHARS = r'\w·𐑐-𐑿'
+
+_WORD_RUN = re.compile(f'[{WORD_CHARS}]+')
+
+
+def load_corrections(corrections_file):
+    """Load corrections from a comma-separated file."""
+    corrections = {}
+    if not corrections_file.exists():
+        return corrections
+
+    with open(corrections_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip() or line.strip().startswith('#'):
+                continue
+            parts = line.split(',', 1)  # Split on first comma
+            if len(parts) == 2:
+                wrong, correct = parts[0].strip(), parts[1].strip()
+                corrections[wrong] = correct
+
+    return corrections
+
+
+class CorrectionMatcher:
+    """
+    Corrections compiled for a single linear pass over the text.
+
+    Corrections made only of word characters can only ever match a complete
+    run of word characters, so they are looked up in a dict. The remaining
+    "phrase" corrections are tried longest first at the start of each
+    boundary, which preserves the precedence of the original alternation.
+    """
+
+    def __init__(self, corrections):
+        self.corrections = dict(corrections)
+        self.words = {}
+        phrases = []
+        for wrong, correct in self.corrections.items():
+            if wrong and _WORD_RUN.fullmatch(wrong):
+                self.words[wrong] = correct
+            else:
+                phrases.append(wrong)
+
+        # An empty correction matches zero-width at every boundary; keep the
+        # original regex for that (pathological) case so output is unchanged.
+        self._fallback = '' in self.corrections
+
+        # Phrases are tried before the word run at the same position: a phrase
+        # that matches with a boundary after it is always longer than the run.
+        phrases.sort(key=len, reverse=True)
+        alternatives = [f'{re.escape(p)}(?![{WORD_CHARS}])' for p in phrases]
+        alternatives.append(f'[{WORD_CHARS}]+')
+        self._pattern = re.compile(f'(?<![{WORD_CHARS}])(?:{"|".join(alternatives)})')
+
+    def _replace(self, match):
+        token = match.group(0)
+        return self.corrections.get(token, token)
+
+    def apply(self, text):
+        """Apply the compiled corrections to text."""
+        if not self.corrections:
+            return text
+        if self._fallback:
+            return apply_corrections_regex(text, self.corrections)
+        return self._pattern.sub(self._replace, text)
+
+
+def compile_corrections(corrections):
+    """Compile a corrections dict into a CorrectionMatcher."""
+    return CorrectionMatcher(corrections)
+
+
+def apply_corrections(text, corrections):
+    """
+    Apply word-level corrections to text.
+
+    Args:
+        text: Transliterated Shavian text
+        corrections: Dict from load_corrections() or a compiled CorrectionMatcher
+
+    Returns:
+        The corrected text
+    """
+    if not corrections:
+        return text
+
+    if not isinstance(corrections, CorrectionMatcher):
+        corrections = compile_corrections(corrections)
+
+    return corrections.apply(text)
+
+
+def apply_corrections_regex(text, corrections):
+    """
+    Reference implementation: one regex alternative per correction.
+    Kept for equivalence checks and benchmarks against CorrectionMatcher.
+    """
+    if not corrections:
+        return text
+
+    # Sort by length (longest first) to handle overlapping corrections properly
+    patterns = sorted(corrections.keys(), key=len, reverse=True)
+
+    # Match pattern only when:
+    # - preceded by whitespace, punctuation, or start of string
+    # - followed by whitespace, punctuation, or end of string
+    # This prevents matching partial words like matching 𐑼 inside 𐑐·𐑮𐑨𐑒𐑑𐑦𐑕
+    escaped_patterns = []
+    for p in patterns:
+        escaped_p = re.escape(p)
+        pattern_with_boundaries = f'(?:^|(?<=\\s)|(?<=[^\\w·𐑐-𐑿])){escaped_p}(?:$|(?=\\s)|(?=[^\\w·𐑐-𐑿]))'
+        escaped_patterns.append(pattern_with_boundaries)
+
+    pattern = '|'.join(escaped_patterns)
+
+    def replacer(match):
+        return corrections.get(match.group(0), match.group(0))
+
+    return re.sub(pattern, replacer, text)
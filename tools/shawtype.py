@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+One entry point for the Shaw Type tools.
+
+Each subcommand is an existing tool script, imported only when it runs, so
+`shawtype --help` and light commands don't pay for NumPy, Pillow or
+Playwright. Several subcommands can run in one process by separating them
+with '+'; they then share whatever the earlier ones loaded (parsed
+readlex.json, the decoded corpus, keyboard layouts).
+
+Usage:
+    ./shawtype --help
+    ./shawtype gen-learn --source corpus
+    ./shawtype gen-play --source corpus + gen-drill --source corpus + verify
+    ./shawtype help gen-drill            # the subcommand's own options
+"""
+
+import importlib
+import sys
+import time
+
+# name → (module, description); modules are only imported when the command runs
+COMMANDS = {
+    'build': ('build', 'Regenerate stale outputs and deploy (same as ./build.sh)'),
+    'metrics': ('build_metrics', 'Compare the last build metrics report with the baseline'),
+    'deploy': ('deploy', 'Deploy site/ to build/site/ with version replacement'),
+    'budgets': ('page_budgets', 'Check the deployed site against the page-weight budgets'),
+    'inline': ('inline_resources', 'Show what deploy inlines into each page and preloads'),
+    'layouts': ('extract_keyboard_layouts', 'Split keyboard_layouts.json into per-layout files'),
+    'translate': ('generate_translations', 'Generate Shavian translations of the UI text'),
+    'gen-learn': ('generate_learn_words', 'Generate Learn mode word lists'),
+    'gen-play': ('generate_play_words', 'Generate Play mode word lists'),
+    'gen-drill': ('generate_drill_words', 'Generate transition drill lessons'),
+    'gen-char-index': ('generate_char_index', 'Generate the client-side character index'),
+    'fonts': ('subset_fonts', 'Subset the webfonts into the cache and show their sizes'),
+    'favicons': ('generate_favicon', 'Generate favicons and Apple touch icons'),
+    'images': ('generate_keyboard_images', 'Screenshot keyboard layouts with Playwright'),
+    'render-images': ('render_keyboard_images', 'Render keyboard layout images without a browser'),
+    'optimize-images': ('optimize_images', 'Optimise PNG images'),
+    'effort': ('typing_effort', 'Print the easiest and hardest words per layout by typing effort'),
+    'verify': ('verify_word_data', 'Verify generated lesson and play word lists'),
+    'lessons': ('lesson_server', 'Query or serve Learn mode word lists for any character set'),
+    'bench-corrections': ('benchmark_corrections', 'Benchmark the Shavian correction engine'),
+    'bench-translations': ('benchmark_transliteration', 'Benchmark the transliteration and correction pipeline'),
+    'corpus': ('word_corpus', 'Compile the word-frequency corpus'),
+}
+
+CHAIN_SEPARATOR = '+'
+
+
+def print_help():
+    print("usage: shawtype [--time] COMMAND [ARGS ...] [+ COMMAND [ARGS ...] ...]\n")
+    print("Shaw Type tools. Commands separated by '+' run in one process and share loaded data.\n")
+    print("commands:")
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+    print(f"  {'help':<{width}}  Show a command's own options (shawtype help COMMAND)")
+    print("\noptions:")
+    print("  -h, --help  show this help message and exit")
+    print("  --time      print how long each command took")
+
+
+def split_chain(args):
+    """Split ['a', '-x', '+', 'b'] into [['a', '-x'], ['b']]."""
+    chain = [[]]
+    for arg in args:
+        if arg == CHAIN_SEPARATOR:
+            chain.append([])
+        else:
+            chain[-1].append(arg)
+    return [command for command in chain if command]
+
+
+def unknown_command(name):
+    import difflib  # only needed here, and slow enough to import to matter for --help
+
+    print(f"❌ Unknown command: {name}", file=sys.stderr)
+    suggestions = difflib.get_close_matches(name, COMMANDS, n=3)
+    if suggestions:
+        print(f"   Did you mean: {', '.join(suggestions)}?", file=sys.stderr)
+    print("   Run 'shawtype --help' for the list of commands", file=sys.stderr)
+    return 2
+
+
+def run_command(name, args):
+    """Import the command's module and run its main() with args as its argv."""
+    module_name = COMMANDS[name][0]
+    module = importlib.import_module(module_name)
+
+    # Each command reports its own written/unchanged file counts
+    output_writer = sys.modules.get('output_writer')
+    if output_writer:
+        output_writer.reset_counts()
+
+    saved_argv = sys.argv
+    sys.argv = [f'shawtype {name}', *args]
+    try:
+        code = module.main()
+    except SystemExit as e:
+        code = e.code
+    finally:
+        sys.argv = saved_argv
+
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit('message') prints the message and exits with 1
+    print(code, file=sys.stderr)
+    return 1
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+
+    show_times = '--time' in args[:1]
+    if show_times:
+        args = args[1:]
+
+    if not args or args[0] in ('-h', '--help'):
+        print_help()
+        return 0
+
+    if args[0] == 'help':
+        if len(args) < 2:
+            print_help()
+            return 0
+        args = [args[1], '--help']
+
+    chain = split_chain(args)
+    for name, *_ in chain:
+        if name not in COMMANDS:
+            return unknown_command(name)
+
+    for name, *command_args in chain:
+        if len(chain) > 1:
+            print(f"\n▶ shawtype {' '.join([name, *command_args])}")
+        start = time.perf_counter()
+        code = run_command(name, command_args)
+        if show_times:
+            print(f"ⓘ {name} took {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        if code:
+            if len(chain) > 1:
+                print(f"❌ {name} failed (exit code {code}), stopping", file=sys.stderr)
+            return code
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Subset the site's webfonts to the characters it uses, as WOFF2.
+
+Scans site/ HTML (entities decoded), JavaScript (\\u escapes decoded) and
+JSON (every string, keys included) for the codepoints they contain, adds a
+fixed set that text can contain without appearing in any file (printable
+ASCII, the whole Shavian block and the namer dot, common typographic
+punctuation), and subsets every font referenced by an @font-face rule in
+site/style.css to that set.
+
+deploy.py writes each subset to fonts/<font>.<hash>.woff2 in the output,
+where the hash covers the font and the codepoint set, so browsers fetch a
+new file whenever the subset changes, and rewrites the @font-face rules of
+the deployed style.css to load the WOFF2 subset, with the full OpenType
+font as the fallback. site/ keeps only the OpenType fonts. Subsets are
+cached in .cache/fonts/ under the same hash, so only a new codepoint set
+(or font) runs the subsetter again.
+
+Usage:
+    python subset_fonts.py          # subset into the cache and show the sizes
+    python subset_fonts.py --list   # print the codepoints in use
+"""
+
+import argparse
+import hashlib
+import html
+import io
+import json
+import re
+import time
+from pathlib import Path
+
+from output_writer import write_bytes, write_text
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SITE_DIR = PROJECT_DIR / 'site'
+STYLESHEET = 'style.css'
+CACHE_DIR = PROJECT_DIR / '.cache' / 'fonts'
+
+# Bump when the subsetter options change, to invalidate cached subsets
+SUBSET_VERSION = 1
+
+# Typed text, messages built at runtime and future words draw on these
+ALWAYS_INCLUDED = (
+    set(range(0x20, 0x7F))           # printable ASCII
+    | set(range(0x10450, 0x10480))   # Shavian
+    | {0x00A0, 0x00B7,               # no-break space, namer dot
+       0x2013, 0x2014, 0x2018, 0x2019, 0x201C, 0x201D, 0x2022, 0x2026}
+)
+
+_JS_ESCAPE = re.compile(r'\\u\{([0-9a-fA-F]+)\}|\\u([0-9a-fA-F]{4})')
+_FONT_FACE = re.compile(r'@font-face\s*\{[^}]*\}')
+_SRC = re.compile(r'src\s*:\s*[^;}]*;?')
+_OTF_URL = re.compile(r"url\(\s*['\"]?(fonts/[^'\")]+\.(?:otf|ttf))['\"]?\s*\)")
+
+
+def json_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from json_strings(item)
+
+
+def site_codepoints(site_dir=SITE_DIR):
+    """Every codepoint in the site's HTML, JavaScript and JSON files."""
+    codepoints = set()
+    for path in sorted(site_dir.rglob('*')):
+        if path.suffix not in ('.html', '.js', '.json') or not path.is_file():
+            continue
+        text = path.read_text(encoding='utf-8')
+        if path.suffix == '.html':
+            codepoints.update(map(ord, html.unescape(text)))
+        elif path.suffix == '.js':
+            codepoints.update(map(ord, text))
+            for match in _JS_ESCAPE.finditer(text):
+                codepoints.add(int(match.group(1) or match.group(2), 16))
+        else:
+            for string in json_strings(json.loads(text)):
+                codepoints.update(map(ord, string))
+    # Control characters are never drawn
+    return {cp for cp in codepoints if cp >= 0x20 and not 0x7F <= cp < 0xA0}
+
+
+def subset_key(font_file, codepoints):
+    digest = hashlib.sha256(f'{SUBSET_VERSION}\0'.encode('utf-8'))
+    digest.update(hashlib.sha256(font_file.read_bytes()).digest())
+    digest.update(','.join(f'{cp:x}' for cp in sorted(codepoints)).encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+def subset_font(font_file, codepoints):
+    """Return the WOFF2 bytes of font_file reduced to codepoints."""
+    # Imported here so cached runs work without fontTools
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']   # keep ligatures and alternates the site may rely on
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+
+    font = subset.load_font(str(font_file), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    return buffer.getvalue()
+
+
+def cached_subset(font_file, codepoints, key, cache_dir=CACHE_DIR):
+    """Subset bytes for the key, from the cache when possible. Returns (bytes, cached)."""
+    cache_file = cache_dir / f'{font_file.stem}.{key}.woff2'
+    if cache_file.exists():
+        return cache_file.read_bytes(), True
+    data = subset_font(font_file, codepoints)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_file.write_bytes(data)
+    return data, False
+
+
+def rewrite_font_faces(css, woff2_names):
+    """Point each @font-face at its WOFF2 subset, keeping the full font as the fallback."""
+    def rewrite_rule(rule):
+        rule = rule.group(0)
+        otf = _OTF_URL.search(rule)
+        if not otf or otf.group(1) not in woff2_names:
+            return rule
+        original = otf.group(1)
+        fmt = 'opentype' if original.endswith('.otf') else 'truetype'
+        src = (f"src: url('{woff2_names[original]}') format('woff2'),\n"
+               f"         url('{original}') format('{fmt}');")
+        return _SRC.sub(lambda _: src, rule, count=1)
+
+    return _FONT_FACE.sub(rewrite_rule, css)
+
+
+def site_subsets(site_dir=SITE_DIR, stylesheet=STYLESHEET):
+    """
+    Subset every font the stylesheet's @font-face rules load to the
+    codepoints the site uses.
+
+    Returns:
+        (css, [(font, subset, WOFF2 bytes, cached)]), with font and subset as
+        URLs relative to the site, e.g. 'fonts/Ormin-Regular.otf'
+
+    Raises:
+        ImportError: a subset isn't cached and fontTools or brotli is missing
+    """
+    codepoints = site_codepoints(site_dir) | ALWAYS_INCLUDED
+    css = (site_dir / stylesheet).read_text(encoding='utf-8')
+    subsets = []
+    for font in sorted(dict.fromkeys(match.group(1) for match in _OTF_URL.finditer(css))):
+        font_file = site_dir / font
+        key = subset_key(font_file, codepoints)
+        data, cached = cached_subset(font_file, codepoints, key)
+        subsets.append((font, f'fonts/{font_file.stem}.{key[:8]}.woff2', data, cached))
+    return css, subsets
+
+
+def write_subsets(output_path, site_dir=SITE_DIR, stylesheet=STYLESHEET):
+    """
+    Write the font subsets to the deployed site in output_path, with its
+    stylesheet rewritten to load them, and drop subsets for earlier
+    codepoint sets.
+
+    Returns:
+        (files written, [(font, subset, WOFF2 bytes, cached)])
+    """
+    output_path = Path(output_path)
+    css, subsets = site_subsets(site_dir, stylesheet)
+    files = set()
+    for font, name, data, _ in subsets:
+        write_bytes(output_path / name, data)
+        files.add(output_path / name)
+        for stale in (output_path / name).parent.glob(f'{Path(font).stem}.*.woff2'):
+            if stale not in files:
+                stale.unlink()
+    write_text(output_path / stylesheet, rewrite_font_faces(css, {font: name for font, name, _, _ in subsets}))
+    files.add(output_path / stylesheet)
+    return files, subsets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Subset the webfonts to the characters the site uses')
+    parser.add_argument('-l', '--list', action='store_true', help='Print the codepoints in use and exit')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.list:
+        used = site_codepoints()
+        extra = sorted(used - ALWAYS_INCLUDED)
+        print(f"{len(used)} codepoints in site files, {len(extra)} beyond the always-included set:")
+        print(' '.join(f'U+{cp:04X} {chr(cp)}' for cp in extra))
+        return 0
+
+    try:
+        _, subsets = site_subsets()
+    except ImportError:
+        print("Error: fontTools and brotli are needed to subset fonts (pip install fonttools brotli)")
+        return 1
+    if not subsets:
+        print(f"Error: no @font-face fonts found in {SITE_DIR / STYLESHEET}")
+        return 1
+
+    print(f"Subset {len(subsets)} font(s) into .cache/fonts/ (deploy.py writes them to the output):")
+    for font, name, data, cached in subsets:
+        size = (SITE_DIR / font).stat().st_size
+        print(f"  ✓ {Path(font).name}: {size / 1024:.1f} KB → {Path(name).name} {len(data) / 1024:.1f} KB"
+              f"{' (cached)' if cached else ''}")
+    print(f"\n✅ Font subsetting complete ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
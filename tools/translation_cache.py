@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Persistent row-level cache for Shavian transliterations.
+
+Each cached result is keyed by the source text, the dialect, the
+transliterator version, the dialect's dictionary file and the corrections
+file, so any change to the inputs or tools invalidates exactly the affected
+entries. Only cache misses are sent to the transliterator, and the
+transliterator itself is only started when there is at least one miss.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+CACHE_DIR = PROJECT_DIR / ".cache"
+CACHE_FILE = CACHE_DIR / "translations.json"
+
+CACHE_FORMAT = 1
+
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranslationCache:
+    """
+    Cache in front of a transliteration pool, with the same submit() interface.
+
+    Args:
+        pool_factory: Callable returning a pool with submit(texts, dialect);
+            only called on the first cache miss
+        backend_version: String identifying the transliterator build
+        dict_files: Dict mapping dialect to its dictionary file
+        corrections_file: Path to shavian-corrections.txt
+        cache_file: Path to the JSON cache file
+        refresh: If True, ignore cached results (they are still rewritten)
+    """
+
+    def __init__(self, pool_factory, backend_version, dict_files, corrections_file,
+                 cache_file=CACHE_FILE, refresh=False):
+        self.pool_factory = pool_factory
+        self.pool = None
+        self.cache_file = Path(cache_file)
+        self.refresh = refresh
+        self.lock = threading.Lock()
+
+        corrections_hash = file_hash(corrections_file) if Path(corrections_file).exists() else ''
+        self.prefixes = {
+            dialect: '\0'.join([dialect, backend_version, file_hash(dict_file), corrections_hash])
+            for dialect, dict_file in dict_files.items()
+        }
+
+        self.entries = self._load()
+        self.used = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self.refresh or not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('format') != CACHE_FORMAT:
+            return {}
+        return data.get('entries', {})
+
+    def key(self, text, dialect):
+        """Return the cache key for text in the given dialect."""
+        return hashlib.sha256(f"{self.prefixes[dialect]}\0{text}".encode('utf-8')).hexdigest()
+
+    def _get_pool(self):
+        with self.lock:
+            if self.pool is None:
+                self.pool = self.pool_factory()
+            return self.pool
+
+    def submit(self, texts, dialect):
+        """
+        Transliterate texts for one dialect; returns a Future of the results.
+        Cached texts resolve immediately, the rest go to the pool in one request.
+        """
+        keys = [self.key(text, dialect) for text in texts]
+        result = Future()
+
+        with self.lock:
+            missing = {}
+            for text, key in zip(texts, keys):
+                if key in self.entries:
+                    self.used[key] = self.entries[key]
+                    self.hits += 1
+                elif key not in missing:
+                    missing[key] = text
+
+        if not missing:
+            result.set_result([self.used[key] for key in keys])
+            return result
+
+        missing_keys = list(missing.keys())
+        pool_future = self._get_pool().submit([missing[key] for key in missing_keys], dialect)
+
+        def done(future):
+            try:
+                outputs = future.result()
+            except Exception as e:
+                result.set_exception(e)
+                return
+            with self.lock:
+                for key, output in zip(missing_keys, outputs):
+                    self.entries[key] = output
+                    self.used[key] = output
+                self.misses += len(missing_keys)
+            result.set_result([self.used[key] for key in keys])
+
+        pool_future.add_done_callback(done)
+        return result
+
+    def save(self):
+        """Write the entries used in this run back to the cache file."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.cache_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'format': CACHE_FORMAT, 'entries': self.used}, f, ensure_ascii=False)
+        os.replace(temp_file, self.cache_file)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is None:
+            self.save()
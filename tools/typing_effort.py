@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Typing-effort model for Shavian words on each keyboard layout.
+
+A word's effort is a weighted sum of:
+
+- distance: how far each keystroke's key is from its finger's home key
+- same_finger: consecutive keystrokes on different keys with the same finger
+- shift: keystrokes that need shift
+- ligature: extra keystrokes for letters typed as a ligature of two others
+
+The corpus is encoded once as a flat array of character codes, and each
+layout is scored over the whole corpus in one vectorised pass with NumPy.
+
+Usage:
+    python typing_effort.py [gb|us]   # print the easiest and hardest words per layout
+"""
+
+import sys
+
+import numpy as np
+
+from keyboard_layout_loader import load_layouts
+
+WEIGHTS = {
+    'distance': 1.0,
+    'same_finger': 1.5,
+    'shift': 1.0,
+    'ligature': 0.5,
+}
+
+# Rows above or below the home row, and the x offset of each row's first key
+# relative to the home row (the number row starts with ` left of 1)
+ROW_OFFSET = {'number': 2, 'qwerty': 1, 'home': 0, 'bottom': 1, 'space': 0}
+ROW_X = {'number': -1, 'qwerty': 0, 'home': 0, 'bottom': 0, 'space': 0}
+
+# Home-row column of each finger
+HOME_COLUMN = {
+    ('left', 'pinky'): 0, ('left', 'ring'): 1, ('left', 'middle'): 2, ('left', 'index'): 3,
+    ('right', 'index'): 6, ('right', 'middle'): 7, ('right', 'ring'): 8, ('right', 'pinky'): 9,
+}
+
+FINGER_IDS = {finger: i for i, finger in enumerate(list(HOME_COLUMN) + [('both', 'thumb')])}
+
+
+def key_distance(position):
+    """Distance in key widths from a finger's home key to the key at position."""
+    if position.finger == 'thumb':
+        return 0.0
+    x = position.column + ROW_X[position.row]
+    lateral = x - HOME_COLUMN[(position.hand, position.finger)]
+    return float(np.hypot(ROW_OFFSET[position.row], lateral))
+
+
+class EffortModel:
+    """
+    A word list encoded for scoring.
+
+    Args:
+        words: Iterable of Shavian words (or (word, frequency) tuples)
+    """
+
+    def __init__(self, words):
+        self.words = [word if isinstance(word, str) else word[0] for word in words]
+
+        # Vocabulary of every character in the corpus
+        self.chars = sorted({char for word in self.words for char in word})
+        char_ids = {char: i for i, char in enumerate(self.chars)}
+
+        self.lengths = np.fromiter((len(word) for word in self.words), dtype=np.int64,
+                                   count=len(self.words))
+        self.codes = np.fromiter((char_ids[char] for word in self.words for char in word),
+                                 dtype=np.int32, count=int(self.lengths.sum()))
+        self.word_ids = np.repeat(np.arange(len(self.words)), self.lengths)
+
+    def _keystroke_tables(self, layout):
+        """
+        Map each vocabulary character to its keystrokes on a layout.
+
+        Returns:
+            Tuple (strokes, distance, finger, shift, key): strokes is a
+            (characters, max strokes) array of keystroke ids padded with -1,
+            all -1 for characters the layout can't type; the other arrays
+            describe each keystroke id.
+        """
+        keystrokes = {}  # KeyPosition -> keystroke id
+
+        def stroke(position):
+            return keystrokes.setdefault(position, len(keystrokes))
+
+        sequences = []
+        for char in self.chars:
+            position = layout.lookup(char)
+            if position is not None:
+                sequences.append([stroke(position)])
+                continue
+            sequence = []
+            for components in layout.ligatures.get(char, ()):
+                found = [layout.lookup(component) for component in components]
+                if all(found):
+                    sequence = [stroke(position) for position in found]
+                    break
+            sequences.append(sequence)
+
+        width = max((len(sequence) for sequence in sequences), default=1) or 1
+        strokes = np.full((len(self.chars), width), -1, dtype=np.int32)
+        for i, sequence in enumerate(sequences):
+            strokes[i, :len(sequence)] = sequence
+
+        positions = sorted(keystrokes, key=keystrokes.get)
+        distance = np.array([key_distance(p) for p in positions], dtype=np.float64)
+        finger = np.array([FINGER_IDS[(p.hand, p.finger)] for p in positions], dtype=np.int32)
+        shift = np.array([p.shift for p in positions], dtype=np.float64)
+        key = np.array([ord(p.key) for p in positions], dtype=np.int32)
+        return strokes, distance, finger, shift, key
+
+    def components(self, layout):
+        """
+        Score every word on a layout.
+
+        Returns:
+            Dict of per-word arrays 'distance', 'same_finger', 'shift',
+            'ligature' and 'typeable' (bool)
+        """
+        count = len(self.words)
+        strokes, distance, finger, shift, key = self._keystroke_tables(layout)
+
+        # Words containing a character the layout can't type
+        untypeable_chars = strokes[:, 0] < 0
+        typeable = np.bincount(self.word_ids, weights=untypeable_chars[self.codes],
+                               minlength=count) == 0
+
+        # Flat keystroke stream with the word each keystroke belongs to
+        per_char = strokes[self.codes]
+        valid = per_char >= 0
+        stream = per_char[valid]
+        stream_words = np.repeat(self.word_ids, strokes.shape[1]).reshape(per_char.shape)[valid]
+
+        ligature_chars = (strokes >= 0).sum(axis=1) - 1
+        ligature = np.bincount(self.word_ids, weights=np.maximum(ligature_chars, 0)[self.codes],
+                               minlength=count)
+
+        if stream.size:
+            stroke_distance = np.bincount(stream_words, weights=distance[stream], minlength=count)
+            stroke_shift = np.bincount(stream_words, weights=shift[stream], minlength=count)
+            same_finger = ((finger[stream[1:]] == finger[stream[:-1]])
+                           & (key[stream[1:]] != key[stream[:-1]])
+                           & (stream_words[1:] == stream_words[:-1]))
+            same_finger = np.bincount(stream_words[1:], weights=same_finger, minlength=count)
+        else:
+            stroke_distance = stroke_shift = same_finger = np.zeros(count)
+
+        return {
+            'distance': stroke_distance,
+            'same_finger': same_finger,
+            'shift': stroke_shift,
+            'ligature': ligature,
+            'typeable': typeable,
+        }
+
+    def score(self, layout, weights=WEIGHTS):
+        """Return each word's weighted effort on a layout (inf if it can't be typed)."""
+        components = self.components(layout)
+        effort = sum(weight * components[name] for name, weight in weights.items())
+        return np.where(components['typeable'], effort, np.inf)
+
+
+def main():
+    from word_corpus import load_corpus_words
+
+    dialect = sys.argv[1] if len(sys.argv) > 1 else 'gb'
+    words = load_corpus_words(dialect)[:20000]
+    model = EffortModel(words)
+
+    for name, layout in load_layouts().items():
+        effort = model.score(layout)
+        typeable = np.flatnonzero(np.isfinite(effort) & (model.lengths == 5))
+        order = typeable[np.argsort(effort[typeable], kind='stable')]
+        easy = ' '.join(model.words[i] for i in order[:8])
+        hard = ' '.join(model.words[i] for i in order[-8:])
+        print(f"{name}: {np.isfinite(effort).sum()} typeable words")
+        print(f"  easiest 5-letter: {easy}")
+        print(f"  hardest 5-letter: {hard}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Verify the generated lesson and play word lists in site/.
+
+Checks, for every layout and dialect:
+
+- learn_words_*.json: every word of a level can be typed with that level's
+  chars, with ligatures expanded to their two letters when the file was
+  generated that way (see generate_learn_words.py)
+- drill_words_*.json: every word can be typed with the lesson's chars and
+  contains one of its n-grams
+- words_*.json, play_words_*.json, drill and learn words: only Shavian
+  letters and the namer dot, and play words sit in the right length bucket
+
+All words from all files are collected first. Each distinct word is encoded
+once as a character bitmask (keyboard_layout_loader.char_mask), and the
+typeability check runs over every (file, level, word) entry in one NumPy
+pass.
+
+Usage:
+    python verify_word_data.py             # exit code 1 on any violation
+    python verify_word_data.py -n 50       # report up to 50 violations
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from generate_learn_words import expand_ligatures
+from keyboard_layout_loader import char_mask, mask_chars
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SITE_DIR = PROJECT_DIR / 'site'
+
+# Layouts whose default learn_words files are generated with ligature expansion
+LIGATURE_LAYOUTS = {'imperial', 'igc', 'jafl'}
+
+# The compound letters lesson always expands ligatures
+COMPOUND_LESSON = 'lessonCompoundLetters'
+
+LEARN_FILE = re.compile(r'learn_words_(?P<layout>[a-z0-9]+)(?:_(?P<dialect>gb|us))?(?P<no_lig>_no_lig)?\.json')
+
+INVALID = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+class Violation:
+    def __init__(self, file, level, word, problem):
+        self.file = file
+        self.level = level
+        self.word = word
+        self.problem = problem
+
+    def __str__(self):
+        level = f' level {self.level}' if self.level is not None else ''
+        return f"{self.file}{level}: {self.word} ({self.problem})"
+
+
+class WordEntries:
+    """(file, level, word) entries with the mask each word must stay within."""
+
+    def __init__(self):
+        self.files = []
+        self.levels = []
+        self.words = []
+        self.allowed = []
+        self.expand = []
+
+    def add(self, file, level, words, allowed=None, expand=False):
+        for word in words:
+            self.files.append(file)
+            self.levels.append(level)
+            self.words.append(word)
+            self.allowed.append(allowed)
+            self.expand.append(expand)
+
+    def __len__(self):
+        return len(self.words)
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def collect_entries(site_dir):
+    """Read every generated word file. Returns (entries, violations found while reading)."""
+    entries = WordEntries()
+    violations = []
+
+    for path in sorted(site_dir.glob('learn_words_*.json')):
+        match = LEARN_FILE.fullmatch(path.name)
+        if not match:
+            continue
+        use_ligatures = match['layout'] in LIGATURE_LAYOUTS and not match['no_lig']
+        for level, lesson in load_json(path).items():
+            chars = lesson['chars']
+            expand = use_ligatures or lesson.get('nameKey') == COMPOUND_LESSON
+            if expand:
+                chars = expand_ligatures(chars)
+            allowed = char_mask(''.join(c for c in chars if char_mask(c) is not None))
+            entries.add(path.name, level, lesson['words'], allowed, expand)
+
+    for path in sorted(site_dir.glob('drill_words_*.json')):
+        for level, lesson in load_json(path).items():
+            entries.add(path.name, level, lesson['words'], char_mask(lesson['chars']))
+            for word in lesson['words']:
+                if not any(ngram in word for ngram in lesson['ngrams']):
+                    violations.append(Violation(path.name, level, word, 'contains none of the drilled n-grams'))
+
+    play_files = [site_dir / 'words.json'] + sorted(site_dir.glob('words_*.json'))
+    for path in play_files + sorted(site_dir.glob('play_words_*.json')):
+        if not path.exists():
+            continue
+        for length, bucket in load_json(path).items():
+            words = bucket if isinstance(bucket, list) else [w for tier in bucket.values() for w in tier]
+            entries.add(path.name, None, words)
+            # words.json is the legacy character list, not bucketed by length
+            if path.name == 'words.json':
+                continue
+            for word in words:
+                if len(word) != int(length):
+                    violations.append(Violation(path.name, None, word, f'in the length {length} list'))
+
+    return entries, violations
+
+
+def verify(site_dir=SITE_DIR):
+    """Return (number of words checked, violations)."""
+    entries, violations = collect_entries(site_dir)
+    if not len(entries):
+        return 0, violations
+
+    # Encode each distinct (word, expansion) once
+    codes = {}
+    masks = []
+    index = np.empty(len(entries), dtype=np.int64)
+    for i, (word, expand) in enumerate(zip(entries.words, entries.expand)):
+        key = (word, expand)
+        if key not in codes:
+            codes[key] = len(masks)
+            mask = char_mask(expand_ligatures(word) if expand else word) if word else None
+            masks.append(INVALID if mask is None else np.uint64(mask))
+        index[i] = codes[key]
+
+    word_masks = np.array(masks, dtype=np.uint64)[index]
+    has_level_chars = np.array([allowed is not None for allowed in entries.allowed])
+    allowed = np.array([allowed or 0 for allowed in entries.allowed], dtype=np.uint64)
+
+    invalid = word_masks == INVALID
+    untypeable = ~invalid & has_level_chars & ((word_masks & ~allowed) != 0)
+
+    for i in np.flatnonzero(invalid):
+        problem = 'empty word' if not entries.words[i] else 'not Shavian letters and namer dot only'
+        violations.append(Violation(entries.files[i], entries.levels[i], entries.words[i], problem))
+    for i in np.flatnonzero(untypeable):
+        missing = mask_chars(int(word_masks[i] & ~allowed[i]))
+        violations.append(Violation(entries.files[i], entries.levels[i], entries.words[i],
+                                    f"{missing} not in the level's chars"))
+
+    return len(entries), violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify generated lesson and play word lists')
+    parser.add_argument('-n', '--max-report', type=int, default=20,
+                        help='Violations to print (default: 20)')
+    parser.add_argument('-d', '--site-dir', type=Path, default=SITE_DIR,
+                        help='Directory with the generated files (default: site)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count, violations = verify(args.site_dir)
+    elapsed = time.perf_counter() - start
+
+    if violations:
+        for violation in violations[:args.max_report]:
+            print(f"  ❌ {violation}")
+        if len(violations) > args.max_report:
+            print(f"  ... and {len(violations) - args.max_report} more")
+        print(f"\n❌ {len(violations)} violation(s) in {count} words ({elapsed:.2f}s)")
+        return 1
+
+    print(f"✅ {count} words verified in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the build: rebuild what changed and reload open pages.
+
+Polls the site sources and every build target's inputs. When something
+changes, it reruns only the targets that read the changed files. Then it
+redeploys only the site files that changed (no wipe and recopy of
+build/site). It serves the output directory with a small script injected
+into every HTML page, and that script reloads the page when the server
+sends an event over Server-Sent Events.
+
+Used through build.py:
+    python build.py --watch            # http://localhost:8000
+    ./build.sh --watch --port 8080
+"""
+
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from build import PROJECT_DIR, expand, patterns_overlap, print_summary, run_build, select_targets
+from deploy import deploy_file, deploy_fonts, deploy_pages, inline_pages
+from subset_fonts import STYLESHEET
+
+SITE_DIR = PROJECT_DIR / 'site'
+
+POLL_INTERVAL = 0.1
+# Wait for a burst of saves (editors often write several files) to settle
+SETTLE_TIME = 0.05
+HEARTBEAT_INTERVAL = 15
+
+RELOAD_PATH = '/__reload'
+RELOAD_SCRIPT = (
+    "<script>new EventSource('" + RELOAD_PATH + "')"
+    ".addEventListener('reload', () => location.reload());</script>"
+)
+
+
+def snapshot(watched):
+    """Map each watched file (relative path) to its modification time and size."""
+    state = {}
+    for root in watched['dirs']:
+        stack = [root]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    # Editors' temp and swap files can vanish between scandir and stat
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            state[Path(entry.path).relative_to(PROJECT_DIR).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+                    except FileNotFoundError:
+                        continue
+    for path in watched['files']:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        state[path.relative_to(PROJECT_DIR).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(before, after):
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+class Reloader:
+    """Hands reload events to every connected page."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """Static files with live reload: no caching, reload script in HTML pages."""
+
+    reloader = None
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self.stream_reloads()
+            return
+
+        path = Path(self.translate_path(self.path))
+        if path.is_dir():
+            path = path / 'index.html'
+        if path.suffix != '.html' or not path.is_file():
+            super().do_GET()
+            return
+
+        content = path.read_text(encoding='utf-8')
+        if '</body>' in content:
+            content = content.replace('</body>', RELOAD_SCRIPT + '</body>', 1)
+        else:
+            content += RELOAD_SCRIPT
+        data = content.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def stream_reloads(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        generation = self.reloader.generation
+        try:
+            while True:
+                latest = self.reloader.wait(generation, HEARTBEAT_INTERVAL)
+                if latest != generation:
+                    generation = latest
+                    self.wfile.write(b'event: reload\ndata: reload\n\n')
+                else:
+                    self.wfile.write(b': heartbeat\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(output_path, port, reloader):
+    handler = type('Handler', (DevRequestHandler,), {'reloader': reloader})
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(handler, directory=str(output_path)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def redeploy(changed, output_path, version, build_number, subset_fonts=True):
+    """
+    Copy changed site files to the output and drop deleted ones. Pages with
+    inlined startup fetches and the font subsets are redeployed whenever
+    anything changed, since one of those files may be what did.
+    """
+    pages = inline_pages()
+    count = 0
+    for rel_path in changed:
+        if not rel_path.startswith('site/'):
+            continue
+        source_file = PROJECT_DIR / rel_path
+        dest_file = output_path / Path(rel_path).relative_to('site')
+        count += 1
+        if dest_file.relative_to(output_path).as_posix() in [*pages, STYLESHEET]:
+            continue   # redeployed below
+        if source_file.is_file():
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            deploy_file(source_file, dest_file, version, build_number)
+        elif dest_file.exists():
+            dest_file.unlink()
+    if count:
+        if not (subset_fonts and deploy_fonts(SITE_DIR, output_path)):
+            deploy_file(SITE_DIR / STYLESHEET, output_path / STYLESHEET, version, build_number)
+        deploy_pages(pages, SITE_DIR, output_path, version, build_number)
+    return count
+
+
+def watch(targets, version, build_number, output_dir='build/site', port=8000, jobs=None, subset_fonts=True):
+    """Build everything once, then rebuild on every change until interrupted."""
+    output_path = PROJECT_DIR / output_dir
+    generators = [target for target in targets if target.name != 'deploy']
+
+    # Every directory and file a target reads, plus the whole site
+    watched = {'dirs': [SITE_DIR], 'files': set()}
+    for target in targets:
+        for pattern in target.inputs:
+            if not pattern.startswith('site/'):
+                watched['files'].update(expand(pattern))
+
+    print("Initial build:\n")
+    start = time.perf_counter()
+    results = run_build(targets, jobs)
+    print_summary(targets, results, time.perf_counter() - start)
+
+    reloader = Reloader()
+    server = start_server(output_path, port, reloader)
+    print(f"\nServing {output_dir} at http://localhost:{port} with live reload")
+    print("Watching for changes (Ctrl+C to stop)\n")
+
+    state = snapshot(watched)
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot(watched)
+            if current == state:
+                continue
+            time.sleep(SETTLE_TIME)
+            current = snapshot(watched)
+            changed = changed_paths(state, current)
+            start = time.perf_counter()
+            print(f"Changed: {', '.join(changed)}")
+
+            # Rerun the generators that read a changed file (they check staleness themselves)
+            affected = [target.name for target in generators
+                        if any(patterns_overlap(path, pattern) for path in changed for pattern in target.inputs)]
+            if affected:
+                run_build(select_targets(generators, affected), jobs)
+                regenerated = snapshot(watched)
+                changed = sorted(set(changed) | set(changed_paths(current, regenerated)))
+                current = regenerated
+
+            count = redeploy(changed, output_path, version, build_number, subset_fonts)
+            state = current
+            reloader.notify()
+            print(f"  ✓ Redeployed {count} file(s) and reloaded in "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms\n")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        server.shutdown()
+    return 0
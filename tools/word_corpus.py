@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Frequency-ranked Shavian word corpus backed by a memory-mapped binary file.
+
+Compiles tools/shavian-{gb,us}-word-frequencies.txt into a compact format
+that can be used without parsing:
+
+    header   'SHWC' magic, format version, word count N, blob size   (4 x uint32)
+    offsets  N + 1 x uint32, byte offset of each word in the blob
+    freqs    N x uint32, frequency of each word
+    blob     UTF-8 words back to back, sorted by frequency (descending)
+
+The compiled files live in .cache/corpus/ and are rebuilt automatically when
+the frequency table changes, so the generators can run in CI without the
+readlex submodule.
+
+Usage:
+    python word_corpus.py            # compile both dialects and print stats
+"""
+
+import mmap
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+CORPUS_DIR = PROJECT_DIR / '.cache' / 'corpus'
+
+FREQUENCY_FILES = {
+    'gb': SCRIPT_DIR / 'shavian-gb-word-frequencies.txt',
+    'us': SCRIPT_DIR / 'shavian-us-word-frequencies.txt',
+}
+
+MAGIC = b'SHWC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIII')
+
+
+def compile_corpus(frequency_file, output_file):
+    """
+    Compile a 'word frequency' text table into the binary corpus format.
+    Returns the number of words written.
+    """
+    entries = []
+    with open(frequency_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            # Some entries are multi-word phrases, so split on the last space
+            word, freq = line.rsplit(' ', 1)
+            entries.append((word, int(freq)))
+
+    # Stable sort keeps the table's order among equal frequencies
+    entries.sort(key=lambda x: x[1], reverse=True)
+
+    blob = bytearray()
+    offsets = [0]
+    for word, _ in entries:
+        blob += word.encode('utf-8')
+        offsets.append(len(blob))
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_suffix('.tmp')
+    with open(temp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), len(blob)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(struct.pack(f'<{len(entries)}I', *(freq for _, freq in entries)))
+        f.write(blob)
+    temp_file.replace(output_file)
+
+    return len(entries)
+
+
+class Corpus:
+    """
+    Read-only view of a compiled corpus. Words are decoded on access, so
+    opening a corpus costs a single mmap regardless of its size.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, blob_size = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a compiled corpus (format {FORMAT_VERSION}): {self.path}")
+
+        view = memoryview(self.mmap)
+        start = HEADER.size
+        self.count = count
+        self.offsets = view[start:start + 4 * (count + 1)].cast('I')
+        start += 4 * (count + 1)
+        self.freqs = view[start:start + 4 * count].cast('I')
+        start += 4 * count
+        self.blob = view[start:start + blob_size]
+
+    def __len__(self):
+        return self.count
+
+    def word(self, index):
+        """Return the word at a frequency rank (0 = most frequent)."""
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    def freq(self, index):
+        return self.freqs[index]
+
+    def __iter__(self):
+        """Yield (word, frequency) pairs, most frequent first."""
+        blob = bytes(self.blob)
+        offsets = self.offsets
+        for i in range(self.count):
+            yield blob[offsets[i]:offsets[i + 1]].decode('utf-8'), self.freqs[i]
+
+
+def corpus_path(dialect, corpus_dir=CORPUS_DIR):
+    return Path(corpus_dir) / f'shavian-{dialect}.bin'
+
+
+def open_corpus(dialect, corpus_dir=CORPUS_DIR):
+    """Open the compiled corpus for a dialect, (re)compiling it if it is stale."""
+    source = FREQUENCY_FILES[dialect]
+    path = corpus_path(dialect, corpus_dir)
+    if not path.exists() or path.stat().st_mtime_ns < source.stat().st_mtime_ns:
+        compile_corpus(source, path)
+    return Corpus(path)
+
+
+def is_shavian_only_with_namer_dot(word):
+    """
+    Check if a word contains only Shavian characters and optionally a namer dot (·).
+    Returns True if the word is purely Shavian (with optional namer dot), False otherwise.
+    """
+    for char in word:
+        code_point = ord(char)
+        if not ((0x10450 <= code_point <= 0x1047F) or code_point == 0x00B7):
+            return False
+    return True
+
+
+def load_corpus_words(dialect='gb', corpus_dir=CORPUS_DIR):
+    """
+    Load words from the compiled frequency corpus.
+    Drop-in replacement for load_readlex_words() in the generators.
+    Results are cached per compiled file version, so generators run in one
+    process (see shawtype.py) decode the corpus once.
+
+    Args:
+        dialect: 'gb' or 'us'
+
+    Returns:
+        List of (shavian_word, frequency) tuples
+    """
+    corpus = open_corpus(dialect, corpus_dir)
+    return list(_corpus_words(corpus.path, corpus.path.stat().st_mtime_ns))
+
+
+@lru_cache(maxsize=None)
+def _corpus_words(path, mtime_ns):
+    return tuple((word, freq) for word, freq in Corpus(path) if is_shavian_only_with_namer_dot(word))
+
+
+def main():
+    for dialect, source in FREQUENCY_FILES.items():
+        path = corpus_path(dialect)
+        count = compile_corpus(source, path)
+        words = load_corpus_words(dialect)
+        print(f"{dialect.upper()}: {count} entries → {path} ({path.stat().st_size:,} bytes), "
+              f"{len(words)} usable words")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())